@@ -0,0 +1,142 @@
+"""Throughput of the single-pass email scanner on 1M addresses.
+
+LegacyEmail keeps a copy of the parsing core that parse_email used before the
+scanner, so both can be measured side by side on the same input.
+
+Run with: python benchmarks/bench_email_scan.py
+"""
+
+# Standard library utilities
+import random
+import time
+
+# internal dependencies
+from pyrolysate import Email
+from pyrolysate.records import ParsedEmail
+
+ADDRESSES = 1_000_000
+
+TEMPLATES = [
+    "user{}@example.com",
+    "first.last{}+news@mail.example.org",
+    "admin{}@bahamas.gov.bs",
+    "john.doe{}(work)@example.com",
+    " padded{}@example.net",
+    "invalid..{}@example.com",
+    "no-at-sign{}.example.com",
+]
+
+
+def get_comments_check_dots(text: str) -> list[str] | None:
+    results = []
+    stack = 0
+    start_index = None
+    prev_dot = False
+
+    for i, char in enumerate(text):
+        if char == ".":
+            if prev_dot is True:
+                return None
+            prev_dot = True
+        else:
+            prev_dot = False
+
+        if char == "(":
+            if stack == 0:
+                start_index = i
+            stack += 1
+        elif char == ")":
+            stack -= 1
+            if stack == 0:
+                content = text[start_index : i + 1]
+                results.append(content)
+        if stack < 0:
+            return None
+    if stack != 0:
+        return None
+
+    return results
+
+
+class LegacyEmail(Email):
+    """Email with the parsing core that predates the single-pass scanner"""
+
+    def _parse_email_record(self, e_mail_string):
+        new_email_string = e_mail_string
+        temp = new_email_string.split("@")
+        if len(temp) != 2:
+            return None
+        comments = get_comments_check_dots(new_email_string)
+        if comments is None:
+            return None
+
+        if comments:
+            for comment in comments:
+                new_email_string = new_email_string.replace(comment, "")
+                temp[0] = temp[0].replace(comment, "")
+                temp[1] = temp[1].replace(comment, "")
+
+        if len(temp) != 2 or any(
+            [
+                part == ""
+                or part.startswith(".")
+                or part.endswith(".")
+                or " " in part.strip()
+                for part in temp
+            ]
+        ):
+            return None
+
+        local = temp[0]
+        plus_address = ""
+        local_and_plus = local.split("+")
+        if len(local_and_plus) == 2:
+            local, plus_address = local_and_plus
+        server_and_domain = temp[1].split(".")
+        if len(server_and_domain) > 3:
+            return None
+        return ParsedEmail(
+            new_email_string,
+            local,
+            plus_address,
+            server_and_domain[0],
+            ".".join(server_and_domain[1:]),
+        )
+
+
+def make_addresses() -> list[str]:
+    rng = random.Random(0)
+    return [rng.choice(TEMPLATES).format(n) for n in range(ADDRESSES)]
+
+
+def timed(parse, addresses: list[str]) -> tuple[float, list]:
+    start = time.perf_counter()
+    records = parse(addresses)
+    return time.perf_counter() - start, records
+
+
+def core(parser: Email):
+    return lambda addresses: [parser._parse_email_record(a) for a in addresses]
+
+
+def full(parser: Email):
+    return lambda addresses: list(parser.iter_parse(addresses))
+
+
+def main():
+    addresses = make_addresses()
+    for name, path in [("core", core), ("iter_parse", full)]:
+        legacy_seconds, legacy = timed(path(LegacyEmail()), addresses)
+        seconds, records = timed(path(Email()), addresses)
+        assert records == legacy, "scanner output differs from the legacy core"
+        print(f"{name}:")
+        for parser, elapsed in [("legacy", legacy_seconds), ("scanner", seconds)]:
+            print(
+                f"  {parser:<8} {elapsed:>7.3f} s"
+                f"  {ADDRESSES / elapsed / 1e6:>5.2f} M emails/s"
+            )
+        print(f"  speedup  {legacy_seconds / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
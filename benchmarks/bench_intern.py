@@ -0,0 +1,84 @@
+"""Memory held by 1M parse results with and without interning.
+
+Parses 1M distinct urls and 1M distinct emails with parse_url_array and
+parse_email_array, once with the default intern table and once with
+intern_size=None, and reports the tracemalloc peak and the time of each run.
+The input lists are built before tracing starts, so only the results and the
+parsing itself are counted. Tracing slows both runs alike, so the times only
+compare with each other.
+
+Run with: python benchmarks/bench_intern.py
+"""
+
+# Standard library utilities
+import random
+import time
+import tracemalloc
+
+# internal dependencies
+from pyrolysate import Email, Url
+
+RECORDS = 1_000_000
+
+SCHEMES = ["https://", "http://", ""]
+PORTS = ["", ":8080", ":8443"]
+TLDS = ["com", "org", "net", "io", "gov.bs", "co.uk", "de", "fr"]
+MAIL_SERVERS = ["gmail", "outlook", "yahoo", "mail", "proton", "icloud"]
+
+
+def make_urls() -> list[str]:
+    rng = random.Random(0)
+    return [
+        f"{rng.choice(SCHEMES)}www.site{n}.{rng.choice(TLDS)}"
+        f"{rng.choice(PORTS)}/page/{n % 97}"
+        for n in range(RECORDS)
+    ]
+
+
+def make_emails() -> list[str]:
+    rng = random.Random(0)
+    return [
+        f"user{n}@{rng.choice(MAIL_SERVERS)}.{rng.choice(TLDS)}" for n in range(RECORDS)
+    ]
+
+
+def measure(parse, entries: list[str]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = parse(entries)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert len(results) == len(entries)
+    return elapsed, peak / 2**20
+
+
+def run(name: str, interned, plain, entries: list[str]) -> None:
+    print(f"{name}: {len(entries)} records")
+    for label, parse in [("intern_size=None", plain), ("interned", interned)]:
+        elapsed, peak = measure(parse, entries)
+        print(f"  {label:<18} peak {peak:>8.1f} MiB  {elapsed:>6.2f} s")
+
+
+def main():
+    # Host caching is off so every record's top level domain is sliced anew,
+    # as it is for batches with more distinct hosts than the cache holds
+    urls = make_urls()
+    run(
+        "parse_url_array",
+        Url(host_cache_size=None).parse_url_array,
+        Url(host_cache_size=None, intern_size=None).parse_url_array,
+        urls,
+    )
+    del urls
+    emails = make_emails()
+    run(
+        "parse_email_array",
+        Email().parse_email_array,
+        Email(intern_size=None).parse_email_array,
+        emails,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""file_to_list against the memory-mapped reader on a large plain file.
+
+Writes a file of SIZE_MB megabytes of urls, then for each reader times a full
+pass over its lines and measures the Python heap it allocates on the way
+(tracemalloc peak, in a second, traced pass). file_to_list holds the whole
+file as one str, then as a list of lines; iter_mapped_file leaves the file in
+the OS page cache and holds one block (str lines) or one line (views) at a time.
+
+Raise SIZE_MB for a multi-GB run. file_to_list needs several times the file
+size in RAM, so keep it well under the memory of the machine.
+
+Run with: python benchmarks/bench_mmap.py
+"""
+
+# Standard library utilities
+import os
+import tempfile
+import time
+import tracemalloc
+
+# internal dependencies
+from pyrolysate import file_to_list, iter_mapped_file
+
+SIZE_MB = 1024
+
+
+def make_file(path: str) -> int:
+    line = "https://www.example{:06d}.com/path/to/page?q=search#top\n"
+    block = "".join(line.format(n) for n in range(10_000))
+    blocks = SIZE_MB * 2**20 // len(block)
+    with open(path, "w") as file:
+        for _ in range(blocks):
+            file.write(block)
+    return blocks * 10_000
+
+
+def read_list(path: str) -> int:
+    return len(file_to_list(path))
+
+
+def read_mapped(path: str) -> int:
+    return sum(1 for _ in iter_mapped_file(path))
+
+
+def read_views(path: str) -> int:
+    return sum(1 for _ in iter_mapped_file(path, decode=False))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "urls.txt")
+        lines = make_file(path)
+        print(f"{os.path.getsize(path) / 2**20:.0f} MiB, {lines} lines")
+        for name, read in [
+            ("file_to_list", read_list),
+            ("mapped, str lines", read_mapped),
+            ("mapped, views", read_views),
+        ]:
+            start = time.perf_counter()
+            assert read(path) == lines
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            read(path)
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            print(
+                f"{name:<18} {elapsed:>7.2f} s  {lines / elapsed / 1e6:>5.2f} M lines/s"
+                f"  heap peak {peak:>8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Reject throughput of the prefilter against the full parse.
+
+Builds a log where most lines are not urls or emails, then times:
+- how many garbage lines per second the prefilter rejects,
+- how many per second the full parse gets through to the same empty result,
+- the whole mixed batch with and without the prefilter.
+
+Run with: python benchmarks/bench_prefilter.py
+"""
+
+# Standard library utilities
+import random
+import timeit
+
+# internal dependencies
+from pyrolysate import Email, Prefilter, Url
+
+LINES = 100_000
+GARBAGE_SHARE = 0.7
+NUMBER = 3
+
+GARBAGE = [
+    "2024-05-01 12:00:{:02d} GET /index.html 200 {}",
+    "WARN worker-{} queue depth {}",
+    "{}",
+    "user agent Mozilla/5.0 (X11; Linux x86_64) build {} rev {}",
+    "ftp://mirror{}.example.com/pub/{}",
+    "localhost:{}/{}",
+]
+URLS = [
+    "https://www.example{}.com/path/{}?q=search#top",
+    "http://data.gov.uk/dataset/{}/{}",
+    "example{}.org/{}",
+]
+EMAILS = ["user{}+tag@example{}.com", "first.last{}@mail{}.gov.bs"]
+
+
+def make_lines(good: list[str]) -> list[str]:
+    rng = random.Random(0)
+    lines = []
+    for n in range(LINES):
+        templates = GARBAGE if rng.random() < GARBAGE_SHARE else good
+        lines.append(rng.choice(templates).format(n % 60, n))
+    return lines
+
+
+def rate(seconds: float, count: int) -> str:
+    return f"{count / seconds / 1e6:>8.2f} M lines/s"
+
+
+def run(name: str, plain, filtered, lines: list[str], batch) -> None:
+    prefilter = filtered.prefilter
+    garbage = [line for line in lines if not prefilter.accepts(line)]
+    # Load the TLD index before timing
+    batch(plain, lines[:10])
+
+    reject = timeit.timeit(lambda: list(prefilter.screen(garbage)), number=NUMBER)
+    parse = timeit.timeit(lambda: batch(plain, garbage), number=NUMBER)
+    without = timeit.timeit(lambda: batch(plain, lines), number=NUMBER)
+    prefilter.reset()
+    with_filter = timeit.timeit(lambda: batch(filtered, lines), number=NUMBER)
+
+    print(f"{name}: {len(garbage)} of {len(lines)} lines rejected")
+    print(f"  {'prefilter reject':<22} {rate(reject / NUMBER, len(garbage))}")
+    print(f"  {'full parse of rejects':<22} {rate(parse / NUMBER, len(garbage))}")
+    print(f"  {'batch without filter':<22} {without / NUMBER:>8.3f} s")
+    print(f"  {'batch with filter':<22} {with_filter / NUMBER:>8.3f} s")
+    print(f"  {'rejected per run':<22} {prefilter.rejected // NUMBER:>8}")
+
+
+def main():
+    run(
+        "urls",
+        Url(),
+        Url(prefilter=Prefilter.for_urls()),
+        make_lines(URLS),
+        lambda parser, lines: list(parser.iter_parse(lines)),
+    )
+    run(
+        "emails",
+        Email(),
+        Email(prefilter=Prefilter.for_emails()),
+        make_lines(EMAILS),
+        lambda parser, lines: list(parser.iter_parse(lines)),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Serial, chunked and byte-range CSV output for a large plain file.
+
+Writes a file of SIZE_MB megabytes of urls and times three ways of turning it
+into a CSV file: a serial to_csv_file over iter_file, to_csv_file with workers
+(the parent reads every line and ships chunks to the workers) and
+file_to_csv_file with workers (each worker maps and reads its own byte ranges,
+the parent only copies finished part files into the output).
+
+The ranged run only beats the chunked one on a machine with several cores;
+with a single CPU all three runs are bound by the same parser.
+
+Run with: python benchmarks/bench_ranges.py
+"""
+
+# Standard library utilities
+import filecmp
+import os
+import tempfile
+import time
+
+# internal dependencies
+from pyrolysate import iter_file, url
+
+SIZE_MB = 256
+WORKERS = os.cpu_count() or 1
+
+
+def make_file(path: str) -> int:
+    line = "https://www.example{:06d}.co.uk:8080/path/to/page?q=search#top\n"
+    block = "".join(line.format(n) for n in range(10_000))
+    blocks = SIZE_MB * 2**20 // len(block)
+    with open(path, "w") as file:
+        for _ in range(blocks):
+            file.write(block)
+    return blocks * 10_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "urls.txt")
+        lines = make_file(path)
+        print(
+            f"{os.path.getsize(path) / 2**20:.0f} MiB, {lines} lines, {WORKERS} workers"
+        )
+        runs = [
+            ("serial", lambda out: url.to_csv_file(out, iter_file(path))),
+            (
+                "chunked",
+                lambda out: url.to_csv_file(out, iter_file(path), workers=WORKERS),
+            ),
+            ("ranged", lambda out: url.file_to_csv_file(out, path, workers=WORKERS)),
+        ]
+        for name, run in runs:
+            start = time.perf_counter()
+            run(os.path.join(directory, name))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<8} {elapsed:>7.2f} s  {lines / elapsed / 1e6:>5.2f} M lines/s"
+            )
+        for name, _ in runs[1:]:
+            assert filecmp.cmp(
+                os.path.join(directory, "serial.csv"),
+                os.path.join(directory, f"{name}.csv"),
+                shallow=False,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Memory retained by a batch of parse results and time to serialise it.
+
+Compares the nested {url: {field: value}} dictionaries returned by parse_url with
+the ParsedUrl records returned by parse_url_record, and times to_csv/to_json on
+the same batch.
+
+Run with: python benchmarks/bench_records.py
+"""
+
+# Standard library utilities
+import timeit
+import tracemalloc
+
+# internal dependencies
+from pyrolysate import Url
+
+URLS = [
+    f"https://www{n % 7}.example{n}.com:8080/path/{n}?q={n}#section{n % 3}"
+    for n in range(100_000)
+]
+NUMBER = 3
+
+
+def retained_bytes(parse) -> float:
+    """Average memory held per URL once the whole batch has been parsed"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    results = [parse(u) for u in URLS]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return (after - before) / len(URLS)
+
+
+def main():
+    parser = Url()
+    # Load the TLD index before measuring
+    parser.parse_url("example.com")
+
+    print(f"{'result':>12} {'retained per url':>18}")
+    for name, parse in (
+        ("dict", parser.parse_url),
+        ("record", parser.parse_url_record),
+    ):
+        print(f"{name:>12} {retained_bytes(parse):>16.0f} B")
+
+    print()
+    print(f"{'output':>12} {'seconds':>10}")
+    for name, output in (
+        ("to_csv", lambda: parser.to_csv(URLS)),
+        ("to_json", lambda: parser.to_json(URLS)),
+    ):
+        seconds = timeit.timeit(output, number=NUMBER) / NUMBER
+        print(f"{name:>12} {seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-URL cost of the TLD pre-check as the TLD list grows.
+
+Compares the old substring scan over every TLD with the host-suffix
+lookup in TldIndex, and times a full parse_url call with the index.
+
+Run with: python benchmarks/bench_tld_suffix.py
+"""
+
+# Standard library utilities
+import timeit
+
+# internal dependencies
+from pyrolysate import Url, TldIndex
+from pyrolysate.update_tlds import get_tlds_from_local
+
+URLS = [
+    "https://www.example.com/path/to/page.html?q=search#section",
+    "example.org/directory",
+    "https://data.gov.uk/dataset",
+    "http://192.168.1.1:8080/admin",
+    "www.example.invalidtld/path",
+]
+SIZES = [1_500, 5_000, 20_000, 100_000]
+NUMBER = 500
+
+
+def build_tlds(size: int) -> list[str]:
+    """Bundled TLDs preceded by synthetic ones that never match, up to size"""
+    _, tlds = get_tlds_from_local()
+    padding = [f"zz{i:06d}" for i in range(max(0, size - len(tlds)))]
+    return padding + tlds
+
+
+def per_url_us(func) -> float:
+    seconds = timeit.timeit(func, number=NUMBER)
+    return seconds / (NUMBER * len(URLS)) * 1_000_000
+
+
+def main():
+    parser = Url()
+    print(f"{'tlds':>8} {'substring scan':>16} {'suffix trie':>13} {'parse_url':>11}")
+    for size in SIZES:
+        tlds = build_tlds(size)
+        index = TldIndex(tlds)
+        hosts = [
+            u.split("://")[-1].split("/")[0].split(":")[0].split(".") for u in URLS
+        ]
+
+        def substring_scan():
+            for u in URLS:
+                any(tld in u for tld in tlds)
+
+        def suffix_trie():
+            for labels in hosts:
+                index.longest_suffix(labels)
+
+        def full_parse():
+            for u in URLS:
+                parser.parse_url(u, index)
+
+        print(
+            f"{size:>8} {per_url_us(substring_scan):>13.2f} us"
+            f" {per_url_us(suffix_trie):>10.2f} us"
+            f" {per_url_us(full_parse):>8.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
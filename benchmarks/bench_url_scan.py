@@ -0,0 +1,210 @@
+"""Time and transient allocations of the single-pass URL scanner.
+
+LegacyUrl keeps a copy of the split/join parsing core that parse_url used
+before the scanner, so both can be measured side by side on the same input.
+
+Run with: python benchmarks/bench_url_scan.py
+"""
+
+# Standard library utilities
+import timeit
+import tracemalloc
+
+# internal dependencies
+from pyrolysate import Url
+from pyrolysate.converter_async import async_support
+
+URLS = [
+    "example.com",
+    "https://www.example.com/path/to/page.html?q=search&lang=en#section2",
+    "https://data.gov.uk/dataset",
+    "example.com:8080/search?q=test&page=1",
+    "http://192.168.1.1:8080/admin",
+    "www.bahamas.gov.bs/directory",
+    "example.com/page#section1",
+    "www.example.invalidtld/path",
+]
+NUMBER = 20_000
+
+
+class LegacyUrl(Url):
+    """Url with the parsing core that predates the single-pass scanner"""
+
+    @async_support
+    def parse_url(self, url_string, tlds=None):
+        if not isinstance(url_string, str) or len(url_string) == 0:
+            return None
+        ip_present = False
+        url_string = url_string.lower()
+        temp_url_string = url_string
+
+        url_dict = {url_string: self.empty_dict.copy()}
+        tlds = self._get_tld_index(tlds)
+        if tlds is None:
+            return None
+        scheme = url_string.split("://")[0]
+        if "://" in url_string and scheme not in self.schemes_and_ports.keys():
+            return None
+        if scheme in self.schemes_and_ports.keys():
+            url_dict[url_string]["scheme"], temp_url_string = url_string.split("://")
+            url_dict[url_string]["port"] = self.schemes_and_ports[
+                url_dict[url_string]["scheme"]
+            ]
+
+        if ":" in temp_url_string:
+            domain_port_etc = temp_url_string.split(":")
+            port_etc = domain_port_etc[1].split("/")
+            url_dict[url_string]["port"] = port_etc[0]
+            port_etc.append("")
+            temp_url_string = domain_port_etc[0] + "/" + "/".join(port_etc[1:])
+
+        parts = temp_url_string.split("/")
+        parts = parts[0].split(".")
+        if all(part.isdigit() and 0 <= int(part) <= 255 for part in parts[:4]):
+            ip_present = True
+            url_dict[url_string]["top_level_domain"] = ".".join(parts[:4])
+
+        # Only the labels of the host are checked against the TLD trie
+        if ip_present is False and tlds.longest_suffix(parts) == 0:
+            url_dict[url_string]["scheme"] = ""
+            url_dict[url_string]["port"] = ""
+            return url_dict
+
+        temp = temp_url_string.split(".")
+        match len(temp):
+            case 2:
+                # example.org or example.org/directory
+                tld_and_dir = temp[1].split("/")
+                if tld_and_dir[0] in tlds:
+                    url_dict[url_string]["second_level_domain"] = temp[0]
+                    url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
+            case 3:
+                tld_and_dir = temp[2].split("/")
+                if tld_and_dir[0] in tlds:
+                    if temp[1] in self.two_part_tlds_lhs:
+                        # example.gov.bs or example.gov.bs/directory
+                        url_dict[url_string]["second_level_domain"] = temp[0]
+                        url_dict[url_string]["top_level_domain"] = ".".join(
+                            [temp[1], tld_and_dir[0]]
+                        )
+                    else:
+                        # www.example.com or www.example.com/directory
+                        url_dict[url_string]["subdomain"] = temp[0]
+                        url_dict[url_string]["second_level_domain"] = temp[1]
+                        url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
+                else:
+                    # example.org/directory.txt
+                    if temp[1].split("/")[0] in tlds:
+                        url_dict[url_string]["second_level_domain"] = temp[0]
+                        temp = ".".join(temp[1:]).split("/")
+                        url_dict[url_string]["top_level_domain"] = temp[0]
+                        tld_and_dir = temp[:]
+            case 4:
+                tld_and_dir = ".".join(temp[2:]).split("/")
+                if tld_and_dir[0] in tlds and temp[1] in self.two_part_tlds_lhs:
+                    # example.gov.bs/directory.xhtml
+                    url_dict[url_string]["second_level_domain"] = temp[0]
+                    url_dict[url_string][
+                        "top_level_domain"
+                    ] = f"{temp[1]}.{tld_and_dir[0]}"
+                elif tld_and_dir[0] in tlds:
+                    # www.example.org/directory.xhtml
+                    url_dict[url_string]["subdomain"] = temp[0]
+                    url_dict[url_string]["second_level_domain"] = temp[1]
+                    url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
+                else:
+                    # www.bahamas.gov.bs/directory
+                    temp_tld = tld_and_dir[0].split(".")
+                    if temp_tld[0] in self.two_part_tlds_lhs and temp_tld[1] in tlds:
+                        url_dict[url_string]["subdomain"] = temp[0]
+                        url_dict[url_string]["second_level_domain"] = temp[1]
+                        url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
+            case 5:
+                tld_and_dir = ".".join(temp[3:]).split("/")
+                if all(tld in tlds for tld in [temp[2], tld_and_dir[0]]):
+                    # www.example.gov.bs/directory.xhtml
+                    url_dict[url_string]["subdomain"] = temp[0]
+                    url_dict[url_string]["second_level_domain"] = temp[1]
+                    url_dict[url_string]["top_level_domain"] = ".".join(
+                        [temp[2], tld_and_dir[0]]
+                    )
+            case _:
+                url_dict[url_string]["scheme"] = ""
+                url_dict[url_string]["port"] = ""
+                return url_dict
+
+        if url_dict[url_string]["top_level_domain"] == "":
+            url_dict[url_string]["scheme"] = ""
+            url_dict[url_string]["port"] = ""
+            return url_dict
+
+        self._split_path_query_fragment(url_dict[url_string], "/".join(tld_and_dir[1:]))
+        return url_dict
+
+    def _split_path_query_fragment(
+        self, fields: dict[str, str], path_query_fragment: str
+    ) -> None:
+        """Fills path, query and fragment from everything after the host
+        :param fields: parsed fields of a single url, updated in place
+        :type fields: dict[str, str]
+        :param path_query_fragment: url text after the first "/" following the host
+        :type path_query_fragment: str
+        """
+        if "?" not in path_query_fragment and "#" not in path_query_fragment:
+            path = path_query_fragment.strip("/")
+            fields["path"] = path
+
+        elif "?" in path_query_fragment:
+            path_query = [value.strip("/") for value in path_query_fragment.split("?")]
+            fields["path"] = path_query[0]
+            if "#" in path_query[1]:
+                fragment = path_query[1].split("#")
+                fields["query"] = fragment[0]
+                if len(fragment) >= 2:
+                    fields["fragment"] = "".join(fragment[1:])
+            elif len(path_query) >= 2:
+                fields["query"] = "".join(path_query[1:])
+        elif "#" in path_query_fragment:
+            fragment = [value.strip("/") for value in path_query_fragment.split("#")]
+            fields["path"] = fragment[0]
+            if len(fragment) >= 2:
+                fields["fragment"] = "".join(fragment[1:])
+
+
+def transient_bytes(parse) -> float:
+    """Average peak of memory allocated while parsing one URL"""
+    tracemalloc.start()
+    total = 0
+    for u in URLS:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = parse(u)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+        del result
+    tracemalloc.stop()
+    return total / len(URLS)
+
+
+def main():
+    parsers = {"split/join": LegacyUrl(), "single pass": Url()}
+    for parser in parsers.values():
+        # Load the TLD index before timing
+        parser.parse_url("example.com")
+    for u in URLS:
+        legacy = parsers["split/join"].parse_url(u)
+        assert legacy == parsers["single pass"].parse_url(u), u
+
+    print(f"{'core':>12} {'per url':>10} {'transient':>12}")
+    for name, parser in parsers.items():
+        seconds = timeit.timeit(
+            lambda: [parser.parse_url(u) for u in URLS], number=NUMBER
+        )
+        per_url = seconds / (NUMBER * len(URLS)) * 1_000_000
+        print(
+            f"{name:>12} {per_url:>7.2f} us {transient_bytes(parser.parse_url):>8.0f} B"
+        )
+
+
+if __name__ == "__main__":
+    main()
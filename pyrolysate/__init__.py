@@ -1,12 +1,22 @@
 # Class imports
 from pyrolysate.email_parser import Email
 from pyrolysate.url_parser import Url
+from pyrolysate.tld_index import TldIndex
+from pyrolysate.public_suffix import PublicSuffixList
+from pyrolysate.tld_registry import TldRegistry
+from pyrolysate.prefilter import Prefilter
+from pyrolysate.records import ParsedEmail, ParsedUrl, RecordBatch
 
 # Class instantiation imports
 from pyrolysate.email_parser import email
 from pyrolysate.url_parser import url
+from pyrolysate.tld_registry import tld_registry
 
 # Function imports
 from pyrolysate.common import file_to_list
+from pyrolysate.common import iter_file
+from pyrolysate.common import iter_buffer_lines
+from pyrolysate.common import iter_mapped_file
 from pyrolysate.update_tlds import get_tlds_from_iana
 from pyrolysate.update_tlds import get_tlds_from_local
+from pyrolysate.update_tlds import get_public_suffix_list
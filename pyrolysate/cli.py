@@ -1,7 +1,9 @@
 import argparse
+from itertools import chain
 from pathlib import Path
-from pyrolysate import url, email, file_to_list
-from pyrolysate.update_tlds import update
+from pyrolysate import url, email, file_to_list, iter_file
+from pyrolysate import ParsedEmail, ParsedUrl
+from pyrolysate.update_tlds import update_details
 
 
 def main():
@@ -39,6 +41,13 @@ def main():
     output_group.add_argument(
         "-np", "--no-prettify", action="store_true", help="Minify JSON output"
     )
+    output_group.add_argument(
+        "-f",
+        "--fields",
+        type=str,
+        default=None,
+        help="Comma separated fields to output in JSON or CSV format, e.g. top_level_domain,second_level_domain",
+    )
 
     file_group = parser.add_argument_group("File Handling")
     file_group.add_argument(
@@ -62,6 +71,13 @@ def main():
         default="\n",
         help="The delimiter to use. Only valid when --input is provided",
     )
+    file_group.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes to parse with. Only valid for JSON or CSV file output",
+    )
 
     args = parser.parse_args()
     if not args.update and not args.input_file and len(args.target) == 0:
@@ -71,10 +87,13 @@ def main():
     if args.update:
         print("Updating TLD list...")
         if args.output_file:
-            message, status = update(args.output_file)
+            result = update_details(args.output_file)
         else:
-            message, status = update()
-        print(f"{message} (Exit code: {status})")
+            result = update_details()
+        if result.added or result.removed:
+            print(f"Added: {', '.join(result.added) or 'none'}")
+            print(f"Removed: {', '.join(result.removed) or 'none'}")
+        print(f"{result.message} (Exit code: {result.status})")
         return
 
     # Early return if parse type not specified
@@ -83,12 +102,31 @@ def main():
 
     # Initialize the handler based on input type
     handler = url if args.url else email
+    fields = None
+    if args.fields:
+        if not (args.json or args.csv):
+            parser.error("--fields only applies to JSON or CSV output")
+        # Names may be written with spaces around the commas
+        fields = [field.strip() for field in args.fields.split(",") if field.strip()]
+        record_fields = (ParsedUrl if args.url else ParsedEmail)._fields
+        unknown = [field for field in fields if field not in record_fields]
+        if unknown:
+            parser.error(
+                f"Unknown field(s): {', '.join(unknown)}. "
+                f"Expected one of {', '.join(record_fields[1:])}"
+            )
 
     # Get input data
     if args.input_file:
         if not Path(args.input_file).is_file():
             raise FileNotFoundError(f"Input file not found: {args.input_file}")
-        data = file_to_list(args.input_file, delimiter=args.delimiter)
+        if args.output_file is not None and (args.json or args.csv):
+            # File writers take any iterable, so the input is streamed block by block
+            data = iter_file(args.input_file, delimiter=args.delimiter)
+            first = next(data, None)
+            data = None if first is None else chain([first], data)
+        else:
+            data = file_to_list(args.input_file, delimiter=args.delimiter)
     else:
         data = args.target
 
@@ -111,14 +149,37 @@ def main():
             raise FileExistsError(f"Output file already exists: {output_path}")
 
         # Process and save output
-        if args.json:
-            (
-                handler.to_json_file(args.output_file, data)
-                if args.no_prettify is False
-                else handler.to_json_file(args.output_file, data, prettify=False)
+        if args.input_file and args.workers is not None and (args.json or args.csv):
+            # Workers read byte ranges of the input file themselves
+            if args.json:
+                handler.file_to_json_file(
+                    args.output_file,
+                    args.input_file,
+                    prettify=args.no_prettify is False,
+                    workers=args.workers,
+                    delimiter=args.delimiter,
+                    fields=fields,
+                )
+            else:
+                handler.file_to_csv_file(
+                    args.output_file,
+                    args.input_file,
+                    workers=args.workers,
+                    delimiter=args.delimiter,
+                    fields=fields,
+                )
+        elif args.json:
+            handler.to_json_file(
+                args.output_file,
+                data,
+                prettify=args.no_prettify is False,
+                workers=args.workers,
+                fields=fields,
             )
         elif args.csv:
-            handler.to_csv_file(args.output_file, data)
+            handler.to_csv_file(
+                args.output_file, data, workers=args.workers, fields=fields
+            )
         else:
             # Default to txt file
             with open(f"{args.output_file}.txt", "w") as file:
@@ -134,13 +195,11 @@ def main():
     # Output to console
     elif args.output_file is None:
         if args.json:
-            output = (
-                handler.to_json(data)
-                if args.no_prettify is False
-                else handler.to_json(args.output_file, data, prettify=False)
+            output = handler.to_json(
+                data, prettify=args.no_prettify is False, fields=fields
             )
         elif args.csv:
-            output = handler.to_csv(data)
+            output = handler.to_csv(data, fields=fields)
         else:
             output = (
                 handler.parse_url_array(data)
@@ -2,86 +2,300 @@
 import bz2
 import gzip
 import lzma
+import tarfile
 import zipfile
 import csv
 import json
+from json.encoder import encode_basestring_ascii as _encode
 
 # Typing, type hints, and errors
-from typing import Generator
+from typing import Generator, Iterable
 import collections.abc
 import zlib
 
 # Standard library utilities
-from io import StringIO
+import locale
+import mmap
+from collections import Counter
+from io import BufferedReader, RawIOBase, StringIO, TextIOWrapper
+
+# internal dependencies
+from pyrolysate.prefilter import Prefilter
+from pyrolysate.records import ParsedEmail, ParsedUrl
+
+# Archive members read as text, anything else in an archive is skipped
+_TEXT_EXTENSIONS = (".txt", ".csv", ".log")
+# Tar archives, plain or compressed as a whole
+_TAR_EXTENSIONS = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
 
 
 class _ZIP:
     @staticmethod
-    def _read_zip_member(
-        zip_file: zipfile.ZipFile, member_name: str, delimiter: str
-    ) -> list[str]:
-        """Read and parse a single member of a ZIP file.
+    def _text_members(zip_file: zipfile.ZipFile) -> list[str]:
+        """Names of the members read as text, in archive order"""
+        return [f for f in zip_file.namelist() if f.endswith(_TEXT_EXTENSIONS)]
+
+    @staticmethod
+    def _process_zip_file(file_path: str, delimiter: str) -> list[str] | None:
+        """Process a ZIP file and extract content from all text files.
+
+        Members are streamed into the list, so no member is held in memory as a
+        whole on top of its lines.
+
+        Args:
+            file_path: Path to the ZIP file
+            delimiter: String delimiter for splitting content
+
+        Returns:
+            Combined list of strings from all text files, or None if processing fails
+        """
+        temp = []
+        for _, lines in _ZIP._iter_zip_members(file_path, delimiter, 1 << 20):
+            temp.extend(lines)
+        return temp if temp != [] else None
+
+    @staticmethod
+    def _iter_zip_member(
+        zip_file: zipfile.ZipFile, member_name: str, delimiter: str, block_size: int
+    ) -> Generator[str, None, None]:
+        """Stream a single member of a ZIP file, one block at a time.
 
         Args:
             zip_file: Open ZIP file object
             member_name: Name of the member file to read
             delimiter: String of delimiter for splitting content
+            block_size: Characters decompressed and split at a time
 
-        Returns:
-            List of non-empty strings from the file
+        Yields:
+            Non-empty stripped strings from the file
         """
         try:
-            with zip_file.open(member_name) as file:
-                content = file.read().decode("utf-8")
-                return [x.strip() for x in content.split(delimiter) if x.strip()]
+            with zip_file.open(member_name) as raw:
+                # newline="" splits the text as it is stored, as file_to_list
+                # always has for ZIP members, so "\r\n" works as a delimiter
+                with TextIOWrapper(raw, encoding="utf-8", newline="") as file:
+                    yield from _iter_blocks(file, delimiter, block_size)
         except UnicodeDecodeError as err:
             print(f"Warning: Could not decode file {member_name}: {err}")
-            return []
         except zipfile.BadZipFile as err:
             print(f"Warning: Corrupted file in archive {member_name}: {err}")
-            return []
         except Exception as err:
             print(f"Warning: Error reading file {member_name}: {err}")
-            return []
 
     @staticmethod
-    def _process_zip_file(file_path: str, delimiter: str) -> list[str] | None:
-        """Process a ZIP file and extract content from all text files.
+    def _iter_zip_members(
+        file_path: str, delimiter: str, block_size: int
+    ) -> Generator[tuple[str, Generator[str, None, None]], None, None]:
+        """Stream all text files in a ZIP file, one member at a time.
+
+        Each member's lines must be read before moving on to the next member,
+        which closes them.
 
         Args:
             file_path: Path to the ZIP file
             delimiter: String delimiter for splitting content
+            block_size: Characters decompressed and split at a time
 
-        Returns:
-            Combined list of strings from all text files, or None if processing fails
+        Yields:
+            Member name and a generator of its non-empty stripped strings, in
+            archive order
         """
         try:
             with zipfile.ZipFile(file_path, "r") as zip_file:
-                # Get all text files from the ZIP
-                text_files = [
-                    f
-                    for f in zip_file.namelist()
-                    if f.endswith((".txt", ".csv", ".log"))
-                ]
-
+                text_files = _ZIP._text_members(zip_file)
                 if not text_files:
                     print("No supported text files found in ZIP archive")
-                    return None
-
-                # Process all text files
-                temp = []
+                    return
                 for text_file in text_files:
-                    lines = _ZIP._read_zip_member(zip_file, text_file, delimiter)
-                    temp.extend(lines)
-
-                return temp if temp != [] else None
-
+                    lines = _ZIP._iter_zip_member(
+                        zip_file, text_file, delimiter, block_size
+                    )
+                    try:
+                        yield text_file, lines
+                    finally:
+                        lines.close()
         except zipfile.BadZipFile as err:
             print(f"Invalid ZIP file: {err}")
-            return None
         except Exception as err:
             print(f"Error processing ZIP file: {err}")
-            return None
+
+    @staticmethod
+    def _iter_zip_file(
+        file_path: str, delimiter: str, block_size: int
+    ) -> Generator[str, None, None]:
+        """Stream the content of all text files in a ZIP file.
+
+        Args:
+            file_path: Path to the ZIP file
+            delimiter: String delimiter for splitting content
+            block_size: Characters decompressed and split at a time
+
+        Yields:
+            Non-empty stripped strings from each text file, in archive order
+        """
+        for _, lines in _ZIP._iter_zip_members(file_path, delimiter, block_size):
+            yield from lines
+
+
+class _Unseekable(RawIOBase):
+    """Forward-only view of a streamed tar member, so TextIOWrapper can read it
+    A member of a tar opened as a stream asks the stream whether it can seek,
+    which the stream can't answer.
+    """
+
+    def __init__(self, file):
+        self._file = file
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._file.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class _TAR:
+    @staticmethod
+    def _process_tar_file(file_path: str, delimiter: str) -> list[str] | None:
+        """Process a tar archive and extract content from all text files.
+
+        Args:
+            file_path: Path to the tar archive, plain or compressed
+            delimiter: String delimiter for splitting content
+
+        Returns:
+            Combined list of strings from all text files, or None if processing fails
+        """
+        temp = []
+        for _, lines in _TAR._iter_tar_members(file_path, delimiter, 1 << 20):
+            temp.extend(lines)
+        return temp if temp != [] else None
+
+    @staticmethod
+    def _iter_tar_member(
+        tar_file: tarfile.TarFile,
+        member: tarfile.TarInfo,
+        delimiter: str,
+        block_size: int,
+    ) -> Generator[str, None, None]:
+        """Stream a single member of a tar archive, one block at a time.
+
+        Args:
+            tar_file: Tar archive opened as a stream
+            member: Member to read, the one the stream is positioned at
+            delimiter: String of delimiter for splitting content
+            block_size: Characters decompressed and split at a time
+
+        Yields:
+            Non-empty stripped strings from the file
+        """
+        try:
+            raw = _Unseekable(tar_file.extractfile(member))
+            # Line endings are kept as stored, as for ZIP members
+            with TextIOWrapper(
+                BufferedReader(raw), encoding="utf-8", newline=""
+            ) as file:
+                yield from _iter_blocks(file, delimiter, block_size)
+        except UnicodeDecodeError as err:
+            print(f"Warning: Could not decode file {member.name}: {err}")
+        except Exception as err:
+            print(f"Warning: Error reading file {member.name}: {err}")
+
+    @staticmethod
+    def _iter_tar_members(
+        file_path: str, delimiter: str, block_size: int
+    ) -> Generator[tuple[str, Generator[str, None, None]], None, None]:
+        """Stream all text files in a tar archive, one member at a time.
+
+        The archive is read front to back as a stream ("r|*"), so it is never
+        seeked, nothing is extracted to disk, and any compression tarfile knows
+        is detected from the data. Each member's lines must be read before moving
+        on to the next member, which closes them.
+
+        Args:
+            file_path: Path to the tar archive, plain or compressed
+            delimiter: String delimiter for splitting content
+            block_size: Characters decompressed and split at a time
+
+        Yields:
+            Member name and a generator of its non-empty stripped strings, in
+            archive order
+        """
+        found = False
+        try:
+            with tarfile.open(file_path, "r|*") as tar_file:
+                for member in tar_file:
+                    if not member.isfile() or not member.name.endswith(
+                        _TEXT_EXTENSIONS
+                    ):
+                        continue
+                    found = True
+                    lines = _TAR._iter_tar_member(
+                        tar_file, member, delimiter, block_size
+                    )
+                    try:
+                        yield member.name, lines
+                    finally:
+                        lines.close()
+            if not found:
+                print("No supported text files found in tar archive")
+        except tarfile.TarError as err:
+            print(f"Invalid tar file: {err}")
+        except (OSError, EOFError, lzma.LZMAError, zlib.error) as err:
+            print(f"Error processing tar file: {err}")
+
+    @staticmethod
+    def _iter_tar_file(
+        file_path: str, delimiter: str, block_size: int
+    ) -> Generator[str, None, None]:
+        """Stream the content of all text files in a tar archive.
+
+        Args:
+            file_path: Path to the tar archive, plain or compressed
+            delimiter: String delimiter for splitting content
+            block_size: Characters decompressed and split at a time
+
+        Yields:
+            Non-empty stripped strings from each text file, in archive order
+        """
+        for _, lines in _TAR._iter_tar_members(file_path, delimiter, block_size):
+            yield from lines
+
+
+def _iter_blocks(file, delimiter: str, block_size: int) -> Generator[str, None, None]:
+    """Splits a text stream on delimiter, reading one block at a time
+    The text after the last delimiter of a block is carried into the next one, so
+    items and multi-character delimiters that straddle a block boundary come out
+    whole. Only one block and one partial item are held at a time.
+    :param file: text stream with a read method
+    :type file: TextIO
+    :param delimiter: item separator
+    :type delimiter: str
+    :param block_size: characters read at a time
+    :type block_size: int
+    :return: non-empty stripped items
+    :rtype: Generator[str, None, None]
+    """
+    tail = ""
+    while block := file.read(block_size):
+        items = (tail + block).split(delimiter)
+        tail = items.pop()
+        for item in items:
+            item = item.strip()
+            if item:
+                yield item
+    tail = tail.strip()
+    if tail:
+        yield tail
 
 
 def file_to_list(input_file_name: str, delimiter: str = "\n") -> list[str] | None:
@@ -101,6 +315,9 @@ def file_to_list(input_file_name: str, delimiter: str = "\n") -> list[str] | Non
     if input_file_name.endswith(".zip"):
         return _ZIP._process_zip_file(input_file_name, delimiter)
 
+    if input_file_name.endswith(_TAR_EXTENSIONS):
+        return _TAR._process_tar_file(input_file_name, delimiter)
+
     if extension in supp_compression:
         comp_module, comp_error = supp_compression[extension]
         try:
@@ -143,12 +360,323 @@ def file_to_list(input_file_name: str, delimiter: str = "\n") -> list[str] | Non
     return temp
 
 
+def iter_file(
+    input_file_name: str,
+    delimiter: str = "\n",
+    block_size: int = 1 << 20,
+    encoding: str | None = None,
+) -> Generator[str, None, None]:
+    """Lazily reads the items of a plain, compressed, ZIP or tar file
+    Uses the same extension-to-codec dispatch as file_to_list, but reads block_size
+    characters at a time instead of the whole file, so peak memory is bounded by
+    the block size rather than the file size. Errors are reported as file_to_list
+    reports them and end the iteration. Plain and compressed files are read in
+    text mode, so "\r\n" and a lone "\r" both end a line.
+    :param input_file_name: path to a plain, .bz2, .gz, .lzma, .xz or .zip file, or
+        a tar archive (.tar, .tar.gz, .tgz, .tar.bz2, .tbz2, .tar.xz, .txz)
+    :type input_file_name: str
+    :param delimiter: item separator, may be several characters long
+    :type delimiter: str
+    :param block_size: characters read at a time
+    :type block_size: int
+    :param encoding: encoding of a plain or compressed file, the locale's encoding
+        when None as for open(). ZIP and tar members are read as UTF-8
+    :type encoding: str | None
+    :return: non-empty stripped items, in file order
+    :rtype: Generator[str, None, None]
+    """
+    if not isinstance(input_file_name, str):
+        return
+
+    supp_compression = {
+        "bz2": (bz2, OSError),
+        "gz": (gzip, OSError),
+        "lzma": (lzma, lzma.LZMAError),
+        "xz": (lzma, lzma.LZMAError),
+    }
+
+    extension = input_file_name.split(".")[-1]
+
+    if input_file_name.endswith(".zip"):
+        yield from _ZIP._iter_zip_file(input_file_name, delimiter, block_size)
+        return
+
+    if input_file_name.endswith(_TAR_EXTENSIONS):
+        yield from _TAR._iter_tar_file(input_file_name, delimiter, block_size)
+        return
+
+    if extension in supp_compression:
+        comp_module, comp_error = supp_compression[extension]
+        try:
+            with comp_module.open(input_file_name, "rt", encoding=encoding) as file:
+                yield from _iter_blocks(file, delimiter, block_size)
+        except comp_error as err:
+            print(f"Compression error: {err}")
+        except zlib.error as err:
+            print(f"Decompression failed: {err}")
+        except FileNotFoundError:
+            print("The file does not exist.")
+        except OSError as err:
+            print(f"OS error with compressed file: {err}")
+        except EOFError:
+            print("Reached unexpected end of file. The file might be truncated.")
+        return
+    try:
+        with open(input_file_name, "r", encoding=encoding) as file:
+            yield from _iter_blocks(file, delimiter, block_size)
+    except OSError as err:
+        print("OS error:", err)
+
+
+class ParseResults(dict):
+    """Batch results, keyed by input string or by field for columnar output,
+    stamped with the TLD version used"""
+
+    def __init__(self, results=(), tld_version: str | None = None):
+        super().__init__(results)
+        self.tld_version = tld_version
+
+
+def _record_to_json(
+    record: ParsedUrl | ParsedEmail, indent: int | None, columns: list[int] | None
+) -> str:
+    """Serialises the fields of a parse record as a JSON object
+    Produces the same text as json.dumps on the record's field dictionary, without
+    building that dictionary first.
+    """
+    names = record._fields
+    indices = range(1, len(record)) if columns is None else columns[1:]
+    if indent is None:
+        return (
+            "{"
+            + ", ".join(
+                f"{_encode(names[index])}: {_encode(record[index])}"
+                for index in indices
+            )
+            + "}"
+        )
+    padding = " " * indent
+    return (
+        "{\n"
+        + ",\n".join(
+            f"{padding}{_encode(names[index])}: {_encode(record[index])}"
+            for index in indices
+        )
+        + "\n}"
+    )
+
+
+# Byte values of ASCII whitespace, trimmed from lines read by iter_buffer_lines
+_WHITESPACE = frozenset(b" \t\r\n\x0b\x0c")
+
+
+def _project(row, columns: list[int] | None):
+    """Values of row at the given positions, the whole row when columns is None"""
+    if columns is None:
+        return row
+    return [row[index] for index in columns]
+
+
+def iter_lines(entries: Iterable) -> Generator:
+    """Lazily strips surrounding whitespace from each string of an iterable
+    Lines read from a file object lose their line endings, as with file_to_list.
+    :param entries: strings or bytes, e.g. an open text or binary file or a generator
+    :type entries: Iterable
+    :return: stripped entries, other entries unchanged
+    :rtype: Generator
+    """
+    for entry in entries:
+        yield entry.strip() if isinstance(entry, (str, bytes, bytearray)) else entry
+
+
+def iter_buffer_lines(
+    buffer, delimiter: bytes = b"\n"
+) -> Generator[memoryview, None, None]:
+    """Yields the lines of a bytes buffer as memoryview slices
+    Nothing is copied or decoded: each line is a view into the buffer that the
+    parsers decode on their own, one line at a time. Surrounding whitespace is
+    trimmed and blank lines are skipped.
+    :param buffer: bytes, bytearray, mmap or any buffer with a find method
+    :type buffer: bytes | bytearray | mmap.mmap
+    :param delimiter: line separator
+    :type delimiter: bytes
+    :return: one view per non-blank line
+    :rtype: Generator[memoryview, None, None]
+    """
+    view = memoryview(buffer)
+    find = buffer.find
+    size = len(view)
+    step = len(delimiter)
+    start = 0
+    while start < size:
+        end = find(delimiter, start)
+        if end == -1:
+            end = size
+        next_start = end + step
+        while start < end and view[start] in _WHITESPACE:
+            start += 1
+        while end > start and view[end - 1] in _WHITESPACE:
+            end -= 1
+        if start < end:
+            yield view[start:end]
+        start = next_start
+
+
+_BYTES_LIKE = (bytes, bytearray, memoryview)
+
+
+def decode_line(entry) -> str | None:
+    """Decodes a bytes-like line for parsing
+    The parsers work on str, so every bytes-like line is decoded before it is
+    parsed. ASCII is tried first, then UTF-8 with undecodable bytes replaced.
+    :param entry: bytes, bytearray or memoryview
+    :type entry: bytes | bytearray | memoryview
+    :return: decoded line, None if entry isn't bytes-like
+    :rtype: str | None
+    """
+    try:
+        return str(entry, "ascii")
+    except UnicodeDecodeError:
+        return str(entry, "utf-8", "replace")
+    except TypeError:
+        return None
+
+
+def _text_encoding(encoding: str | None) -> str:
+    """The encoding open() reads a text file with, the locale's when None"""
+    return locale.getpreferredencoding(False) if encoding is None else encoding
+
+
+def _iter_mapped_blocks(
+    mapped: mmap.mmap,
+    delimiter: bytes,
+    block_size: int,
+    start: int = 0,
+    stop: int | None = None,
+    encoding: str | None = None,
+) -> Generator[str, None, None]:
+    """Decodes and splits a memory map, or the range start:stop of it, a block at a time
+    Each block ends on a delimiter, so no line or character is cut in two, and
+    one C level decode and split replaces a Python step per line. Blocks are
+    decoded and their line endings translated as a file opened in text mode
+    with the same encoding reads them, so "\r\n" and a lone "\r" end a line.
+    """
+    encoding = _text_encoding(encoding)
+    text_delimiter = str(delimiter, encoding)
+    stop = len(mapped) if stop is None else stop
+    while start < stop:
+        end = mapped.find(delimiter, min(start + block_size, stop), stop)
+        if end == -1:
+            end = stop
+        text = str(mapped[start:end], encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        for item in text.split(text_delimiter):
+            item = item.strip()
+            if item:
+                yield item
+        start = end + len(delimiter)
+
+
+def iter_mapped_file(
+    input_file_name: str,
+    delimiter: str | bytes = "\n",
+    decode: bool = True,
+    block_size: int = 1 << 20,
+    encoding: str | None = None,
+) -> Generator[str | memoryview, None, None]:
+    """Lazily reads the lines of an uncompressed file through a read-only memory map
+    Delimiters are found directly in the mapped pages, so the OS page cache holds
+    the file. Lines are decoded a block of about block_size bytes at a time, with
+    the same encoding and line endings as iter_file, or handed out undecoded as
+    views into the map, split on the delimiter bytes only, which the parsers
+    accept as is.
+    :param input_file_name: path to an uncompressed file, e.g. .txt or .log
+    :type input_file_name: str
+    :param delimiter: line separator, str delimiters are encoded with encoding
+    :type delimiter: str | bytes
+    :param decode: yield str lines. When False, yield memoryview slices of the map
+    :type decode: bool
+    :param block_size: bytes decoded at a time when decode is set
+    :type block_size: int
+    :param encoding: encoding of the file, the locale's encoding when None as for
+        iter_file. It must encode ASCII as ASCII bytes, e.g. UTF-8 or Latin-1
+    :type encoding: str | None
+    :return: non-blank, stripped lines in file order
+    :rtype: Generator[str | memoryview, None, None]
+    """
+    if not isinstance(input_file_name, str):
+        return
+    if isinstance(delimiter, str):
+        delimiter = delimiter.encode(_text_encoding(encoding))
+    try:
+        file = open(input_file_name, "rb")
+    except OSError as err:
+        print("OS error:", err)
+        return
+    with file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file can't be mapped and has no lines
+            return
+        if decode:
+            lines = _iter_mapped_blocks(
+                mapped, delimiter, block_size, encoding=encoding
+            )
+        else:
+            lines = iter_buffer_lines(mapped, delimiter)
+        try:
+            yield from lines
+        finally:
+            lines.close()
+            try:
+                mapped.close()
+            except BufferError:
+                # Views still held by the caller keep the map open until released
+                pass
+
+
 class Shared:
+    @staticmethod
+    def _is_stream(data) -> bool:
+        """True for iterables other than str and list, e.g. generators and files"""
+        return isinstance(data, collections.abc.Iterable) and not isinstance(
+            data, (str, bytes, list)
+        )
+
+    @staticmethod
+    def _columns(headers: list[str], fields: list[str] | None) -> list[int] | None:
+        """Positions of the requested fields in a record, after the input itself
+        :return: record positions to output, None for every field
+        :raises ValueError: for a field that isn't in headers
+        """
+        if fields is None:
+            return None
+        columns = [0]
+        for field in fields:
+            if field not in headers:
+                raise ValueError(
+                    f"Unknown field: {field}. Expected one of {', '.join(headers[1:])}"
+                )
+            if headers.index(field) not in columns:
+                columns.append(headers.index(field))
+        return columns
+
+    @staticmethod
+    def _record_dict(record, columns: list[int] | None) -> dict[str, dict[str, str]]:
+        if columns is None:
+            return record.to_dict()
+        return {
+            record[0]: {record._fields[index]: record[index] for index in columns[1:]}
+        }
+
     def _validate_data(
         self, string_parse, array_parse, data
     ) -> (
-        Generator[dict[str, dict[str, str]], None, None]
-        | dict[str, dict[str, str]]
+        Generator[ParsedUrl | ParsedEmail | None, None, None]
+        | ParsedUrl
+        | ParsedEmail
         | None
     ):
         if not isinstance(data, str) and not isinstance(data, list):
@@ -159,25 +687,74 @@ class Shared:
             return results
         return None
 
-    def _to_json(self, string_parse, array_parse, data, pretty) -> str | None:
+    def _to_batch(
+        self, string_parse, data, prefilter: Prefilter | None = None
+    ) -> tuple[list, Counter]:
+        """Parses each distinct entry once and fans the results back out
+        Entries rejected by the prefilter aren't parsed and give None.
+        :return: result for every position of data and the occurrences of each entry
+        """
+        # Views into a writable buffer can't be hashed, count the decoded lines
+        data = [
+            decode_line(entry) if isinstance(entry, _BYTES_LIKE) else entry
+            for entry in data
+        ]
+        counts = Counter(data)
+        if prefilter is None:
+            parsed = {entry: string_parse(entry) for entry in counts}
+        else:
+            parsed = {
+                entry: string_parse(entry) if prefilter.check(entry, times) else None
+                for entry, times in counts.items()
+            }
+        return [parsed[entry] for entry in data], counts
+
+    def _to_columnar(
+        self, headers, data, records, result=None, columns=None
+    ) -> dict[str, list[str | None]]:
+        """Fills one list per header field from records lined up with data
+        Rejected entries keep their input in the first column and None in the rest,
+        so every column has one value per input position.
+        """
+        if result is None:
+            result = {}
+        if columns is None:
+            columns = range(len(headers))
+        for index in columns:
+            result[headers[index]] = []
+        appends = [(index, result[headers[index]].append) for index in columns]
+        rejected = (None,) * (len(headers) - 1)
+        for entry, record in zip(data, records):
+            if record is None:
+                if isinstance(entry, _BYTES_LIKE):
+                    entry = decode_line(entry)
+                record = (entry,) + rejected
+            for index, append in appends:
+                append(record[index])
+        return result
+
+    def _to_json(
+        self, string_parse, array_parse, data, pretty, columns=None
+    ) -> str | None:
         result = self._validate_data(string_parse, array_parse, data)
-        if isinstance(data, list) and len(data) >= 2:
+        if (isinstance(data, list) and len(data) >= 2) or self._is_stream(data):
             result = array_parse(data)
         if isinstance(result, collections.abc.Generator):
             solution = "{\n    " if pretty is True else "{"
             first = True
-            for item in result:
-                key = list(item)[0]
+            written = set()
+            for record in result:
+                # Repeated inputs would otherwise repeat their JSON key
+                if record is None or record[0] in written:
+                    continue
+                written.add(record[0])
                 if first is not True:
                     solution += ",\n    " if pretty is True else ", "
-                if pretty is True:
-                    solution += json.dumps(key, indent=8)
-                    solution += ": "
-                    solution += json.dumps(item[key], indent=8)
-                if pretty is False:
-                    solution += json.dumps(key)
-                    solution += ": "
-                    solution += json.dumps(item[key])
+                solution += _encode(record[0])
+                solution += ": "
+                solution += _record_to_json(
+                    record, 8 if pretty is True else None, columns
+                )
                 first = False
             solution += "\n}" if pretty is True else "}"
             return solution
@@ -185,31 +762,32 @@ class Shared:
         if result is None:
             return None
         if not pretty:
-            return json.dumps(result)
-        return json.dumps(result, indent=4)
+            return json.dumps(self._record_dict(result, columns))
+        return json.dumps(self._record_dict(result, columns), indent=4)
 
     def _to_json_file(
-        self, string_parse, array_parse, file_name, data, pretty
+        self, string_parse, array_parse, file_name, data, pretty, columns=None
     ) -> tuple[str, int]:
         result = self._validate_data(string_parse, array_parse, data)
-        if isinstance(data, list) and len(data) >= 2:
+        if (isinstance(data, list) and len(data) >= 2) or self._is_stream(data):
             result = array_parse(data)
         if isinstance(result, collections.abc.Generator):
             with open(f"{file_name}.json", "w") as file:
                 file.write("{\n    " if pretty is True else "{")
                 first = True
-                for item in result:
-                    key = list(item)[0]
+                written = set()
+                for record in result:
+                    # Repeated inputs would otherwise repeat their JSON key
+                    if record is None or record[0] in written:
+                        continue
+                    written.add(record[0])
                     if first is not True:
                         file.write(",\n    " if pretty is True else ", ")
-                    if pretty is True:
-                        json.dump(key, file, indent=8)
-                        file.write(": ")
-                        json.dump(item[key], file, indent=8)
-                    if pretty is False:
-                        json.dump(key, file)
-                        file.write(": ")
-                        json.dump(item[key], file)
+                    file.write(_encode(record[0]))
+                    file.write(": ")
+                    file.write(
+                        _record_to_json(record, 8 if pretty is True else None, columns)
+                    )
                     first = False
                 file.write("\n}" if pretty is True else "}")
                 return "File successfully written", 0
@@ -218,52 +796,50 @@ class Shared:
             return "Failed to write file", 1
         if not pretty:
             with open(f"{file_name}.json", "w") as file:
-                json.dump(result, file)
+                json.dump(self._record_dict(result, columns), file)
         if pretty:
             with open(f"{file_name}.json", "w") as file:
-                json.dump(result, file, indent=4)
+                json.dump(self._record_dict(result, columns), file, indent=4)
         return "File successfully written", 0
 
     def _to_csv(
-        self, headers, data_fields, string_parse, array_parse, data
+        self, headers, string_parse, array_parse, data, columns=None
     ) -> str | None:
         buffer = StringIO()  # Open StringIO object
         csv_writer = csv.writer(buffer)
-        csv_writer.writerow(headers)
+        csv_writer.writerow(_project(headers, columns))
         result = self._validate_data(string_parse, array_parse, data)
-        if isinstance(data, list) and len(data) >= 2:
+        if (isinstance(data, list) and len(data) >= 2) or self._is_stream(data):
             result = array_parse(data)
         if isinstance(result, collections.abc.Generator):
-            for full_dict in result:
-                raw_input = list(full_dict)[0]
-                parsed_fields = full_dict[raw_input]
-                csv_writer.writerow(data_fields(raw_input, parsed_fields))
+            # Records are tuples already in header order
+            csv_writer.writerows(
+                _project(record, columns) for record in result if record is not None
+            )
         else:
             if result is None:
                 return None
-            for raw_input, parsed_fields in result.items():
-                csv_writer.writerow(data_fields(raw_input, parsed_fields))
+            csv_writer.writerow(_project(result, columns))
         csv_data = buffer.getvalue()
         buffer.close()  # Close the StringIO object
         return csv_data
 
     def _to_csv_file(
-        self, headers, data_fields, string_parse, array_parse, file_name, data
+        self, headers, string_parse, array_parse, file_name, data, columns=None
     ) -> tuple[str, int]:
         with open(f"{file_name}.csv", "w") as file:
             csv_writer = csv.writer(file)
-            csv_writer.writerow(headers)
+            csv_writer.writerow(_project(headers, columns))
             result = self._validate_data(string_parse, array_parse, data)
-            if isinstance(data, list) and len(data) >= 2:
+            if (isinstance(data, list) and len(data) >= 2) or self._is_stream(data):
                 result = array_parse(data)
             if isinstance(result, collections.abc.Generator):
-                for full_dict in result:
-                    raw_input = list(full_dict)[0]
-                    parsed_fields = full_dict[raw_input]
-                    csv_writer.writerow(data_fields(raw_input, parsed_fields))
+                # Records are tuples already in header order
+                csv_writer.writerows(
+                    _project(record, columns) for record in result if record is not None
+                )
             else:
                 if result is None:
                     return "Failed to write file", 1
-                for raw_input, parsed_fields in result.items():
-                    csv_writer.writerow(data_fields(raw_input, parsed_fields))
+                csv_writer.writerow(_project(result, columns))
         return "File successfully written", 0
@@ -1,20 +1,103 @@
 # Typing, type hints, and errors
-from typing import Generator
+from typing import Generator, Iterable
+
+# Standard library utilities
+import os
+import re
 
 # internal dependencies
-from pyrolysate.common import Shared
+from pyrolysate.common import _ZIP, Shared, decode_line, iter_file, iter_lines
 from pyrolysate.converter_async import async_support
+from pyrolysate.parallel import (
+    can_split_file,
+    parse_parallel,
+    parse_zip_parallel,
+    ranges_to_csv_file,
+    ranges_to_json_file,
+)
+from pyrolysate.prefilter import Prefilter
+from pyrolysate.parse_cache import MISSING, CacheInfo, InternTable, ParseCache
+from pyrolysate.records import ParsedEmail, RecordBatch
+from pyrolysate.tld_index import TldIndex
+from pyrolysate.tld_registry import TldRegistry, tld_registry
+
+# The common shape, matched in one pass: local "@" mail server and up to two more
+# domain labels, with no comments, spaces, stray "@" or empty labels. Anything
+# else takes the general path below, which gives the same result for these.
+_SIMPLE_EMAIL = re.compile(
+    r"([^@(). ]+(?:\.[^@(). ]+)*)@([^@(). ]+)((?:\.[^@(). ]+){0,2})"
+)
+_PARENTHESES = re.compile(r"[()]")
 
 
 class Email:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: int | None = None,
+        prefilter: Prefilter | None = None,
+        validate_tld: bool = False,
+        registry: TldRegistry | None = None,
+        intern_size: int | None = 1024,
+    ):
+        """
+        :param cache_size: number of parse results to keep in an LRU cache keyed by
+            email. No caching when None
+        :type cache_size: int | None
+        :param prefilter: cheap checks that batch and streaming parses run first, so
+            lines that can't be emails are counted and skipped instead of parsed
+        :type prefilter: Prefilter | None
+        :param validate_tld: reject emails whose domain doesn't end in a known top
+            level domain, split the way Url splits hosts
+        :type validate_tld: bool
+        :param registry: source of the TLD index checked when validate_tld is set.
+            Defaults to the shared registry that Url reads as well
+        :type registry: TldRegistry | None
+        :param intern_size: number of distinct mail servers and domains shared
+            between records, so large batches hold one copy of each. No interning
+            when None
+        :type intern_size: int | None
+        """
         self.shared = Shared()
+        self.prefilter = prefilter
+        self.validate_tld = validate_tld
+        self.registry = registry if registry is not None else tld_registry
+        self._cache = ParseCache(cache_size) if cache_size is not None else None
+        self._intern = InternTable(intern_size) if intern_size is not None else None
         self.header = ["email", "local", "plus_address", "mail_server", "domain"]
         self.empty_dict = {field: "" for field in self.header[1:]}
         self.field_generator = lambda entry, details: [entry] + [
             details[field] for field in self.header[1:]
         ]
 
+    def _screen(self, emails: Iterable) -> Iterable:
+        """Replaces lines rejected by the prefilter with None"""
+        if self.prefilter is None:
+            return emails
+        return self.prefilter.screen(emails)
+
+    def _get_tld_index(self, tlds: TldIndex | list[str] | None) -> TldIndex | None:
+        """Compiles custom tlds into an index or takes the registry's current index
+        :param tlds: custom list or index of top level domains
+        :type tlds: TldIndex | list[str] | None
+        :return: index of top level domains, None if the local TLD file can't be read
+        :rtype: TldIndex | None
+        """
+        if tlds is not None:
+            return TldIndex.from_tlds(tlds)
+        return self.registry.index
+
+    def _has_known_tld(self, record: ParsedEmail, tlds: TldIndex | None) -> bool:
+        """True if the email's mail server and domain end in a known top level domain
+        Lookups are O(1) per label and gov.bs-style domains follow the same two
+        part rule as Url, so both parsers accept the same domains.
+        """
+        if tlds is None:
+            return False
+        labels = f"{record.mail_server}.{record.domain}".strip().lower().split(".")
+        suffix_length = tlds.suffix_length(labels)
+        # A mail server must be left over in front of the TLD
+        return 0 < suffix_length < len(labels)
+
     @async_support
     def parse_email(self, e_mail_string: str) -> dict[str, dict[str, str]] | None:
         """Parses email addresses into component parts
@@ -23,58 +106,137 @@ class Email:
         :return: Dictionary containing email parsed into sub-parts
         :rtype: dict[str, dict[str, str]] | None
         """
+        record = self.parse_email_record(e_mail_string)
+        if record is None:
+            return None
+        return record.to_dict()
+
+    @async_support
+    def parse_email_record(
+        self,
+        e_mail_string: str | bytes | memoryview,
+        tlds: TldIndex | list[str] | None = None,
+    ) -> ParsedEmail | None:
+        """Parses email addresses into a compact record of component parts
+        :param e_mail_string: A string containing an email address, or a bytes-like
+            line holding one, which is decoded to str before parsing
+        :type e_mail_string: str | bytes | memoryview
+        :param tlds: custom list or index of top level domains checked when
+            validate_tld is set. Defaults to the registry's current index
+        :type tlds: TldIndex | list[str] | None
+        :return: record of the email's sub-parts
+        :rtype: ParsedEmail | None
+        """
+        if not isinstance(e_mail_string, str):
+            e_mail_string = decode_line(e_mail_string)
+            if e_mail_string is None:
+                return None
+        if len(e_mail_string) == 0 or len(e_mail_string) >= 998:
+            return None
+        if self._cache is None:
+            record = self._parse_email_record(e_mail_string)
+        else:
+            record = self._cache.get(e_mail_string)
+            if record is MISSING:
+                record = self._parse_email_record(e_mail_string)
+                self._cache.put(e_mail_string, record)
+        # The cache holds unchecked records, so a TLD reload applies straight away
         if (
-            not isinstance(e_mail_string, str)
-            or len(e_mail_string) == 0
-            or len(e_mail_string) >= 998
+            self.validate_tld
+            and record is not None
+            and not self._has_known_tld(record, self._get_tld_index(tlds))
         ):
             return None
+        return record
 
-        new_email_string = e_mail_string
-        temp = new_email_string.split("@")
-        comments = get_comments_check_dots(new_email_string)
-        if comments is None:
+    def _parse_email_record(self, e_mail_string: str) -> ParsedEmail | None:
+        """Parses an email address without consulting the cache
+        :param e_mail_string: A string containing an email address
+        :type e_mail_string: str
+        :return: record of the email's sub-parts
+        :rtype: ParsedEmail | None
+        """
+        if "@" not in e_mail_string:
+            # lack of @ symbol, checked first as the pattern backtracks to find it
             return None
+        match = _SIMPLE_EMAIL.fullmatch(e_mail_string)
+        if match is not None:
+            local, mail_server, domain = match.groups()
+            plus_address = ""
+            if local.count("+") == 1:
+                local, _, plus_address = local.partition("+")
+            return self._record(
+                e_mail_string, local, plus_address, mail_server, domain[1:]
+            )
 
-        if comments:
-            for comment in comments:
-                new_email_string = new_email_string.replace(comment, "")
-                temp[0] = temp[0].replace(comment, "")
-                temp[1] = temp[1].replace(comment, "")
-
-        if len(temp) != 2 or any(
-            [
-                part == ""
-                or part.startswith(".")
-                or part.endswith(".")
-                or " " in part.strip()
-                for part in temp
-            ]
+        if ".." in e_mail_string:
+            # consecutive periods anywhere, comments included
+            return None
+        if "(" in e_mail_string or ")" in e_mail_string:
+            e_mail_string = strip_comments(e_mail_string)
+            if e_mail_string is None:
+                return None
+        local, at, server_and_domain = e_mail_string.partition("@")
+        if not at or any(
+            part == ""
+            or part.startswith(".")
+            or part.endswith(".")
+            or " " in part.strip()
+            or "@" in part
+            for part in (local, server_and_domain)
         ):
             # None returned for invalid emails
             # trailing or leading periods
             # spaces between words
-            # consecutive periods anywhere
             # multiple @ symbols or lack of @ symbol
             # parentheses present in domain or mail server
             return None
 
-        email_dict = {new_email_string: self.empty_dict.copy()}
-
-        local_temp = temp[0]
-        plus_address = local_temp.split("+")
-        if len(plus_address) == 2:
-            email_dict[new_email_string]["local"] = plus_address[0]
-            email_dict[new_email_string]["plus_address"] = plus_address[1]
-        else:
-            email_dict[new_email_string]["local"] = local_temp
-        server_and_domain = temp[1].split(".")
+        plus_address = ""
+        local_and_plus = local.split("+")
+        if len(local_and_plus) == 2:
+            local, plus_address = local_and_plus
+        server_and_domain = server_and_domain.split(".")
         if len(server_and_domain) > 3:
             return None  # invalid email with too many periods
-        email_dict[new_email_string]["mail_server"] = server_and_domain[0]
         # handles emails ending in standard tld or government emails (.gov.bs)
-        email_dict[new_email_string]["domain"] = ".".join(server_and_domain[1:])
-        return email_dict
+        return self._record(
+            e_mail_string,
+            local,
+            plus_address,
+            server_and_domain[0],
+            ".".join(server_and_domain[1:]),
+        )
+
+    def _record(
+        self,
+        e_mail_string: str,
+        local: str,
+        plus_address: str,
+        mail_server: str,
+        domain: str,
+    ) -> ParsedEmail:
+        """Builds a record, sharing repeated mail servers and domains between records"""
+        if self._intern is not None:
+            mail_server = self._intern(mail_server)
+            domain = self._intern(domain)
+        return ParsedEmail(e_mail_string, local, plus_address, mail_server, domain)
+
+    def cache_info(self) -> CacheInfo | None:
+        """Statistics of the parse cache
+        :return: hits, misses, evictions and sizes, None if caching is off
+        :rtype: CacheInfo | None
+        """
+        return None if self._cache is None else self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Empties the parse cache and resets its statistics
+        The intern table is emptied too, so it can fill with a new vocabulary.
+        """
+        if self._cache is not None:
+            self._cache.clear()
+        if self._intern is not None:
+            self._intern.clear()
 
     def parse_email_array(self, emails: list[str]) -> dict[str, dict[str, str]] | None:
         """Parses each email in an array
@@ -83,49 +245,233 @@ class Email:
         :return: parsed list of emails as a dictionary
         :rtype: dict[str, dict[str, str]] | None
         """
-        results = self._parse_email_array(emails)
-        if results is None:
+        if not isinstance(emails, list) or len(emails) < 1:
             return None
+        results = self._parse_email_array(emails)
 
         email_array = {}
         for result in results:
             if result is None:
                 continue
-            email_array.update(result)
+            email_array.update(result.to_dict())
 
         if email_array == {}:
             return None
         return email_array
 
-    def _parse_email_array(
-        self, emails: list[str]
-    ) -> Generator[dict[str, dict[str, str]], None, None] | None:
-        """Parses each email in an array
+    def parse_email_batch(
+        self, emails: Iterable[str], fields: list[str] | None = None
+    ) -> RecordBatch:
+        """Parses a batch of emails, keeping every input position including duplicates
+        Each distinct email is parsed once and its record shared by all its positions.
+        :param emails: emails to parse
+        :type emails: Iterable[str]
+        :param fields: fields the caller needs, checked against Email.header. Every
+            field of an email comes out of the same split, so records are whole
+        :type fields: list[str] | None
+        :return: record for each email in input order, None for invalid emails, with
+            the occurrences of each email
+        :rtype: RecordBatch
+        """
+        self.shared._columns(self.header, fields)
+        records, counts = self.shared._to_batch(
+            self.parse_email_record, emails, self.prefilter
+        )
+        return RecordBatch(records, counts)
+
+    def parse_email_columnar(
+        self, emails: list[str], fields: list[str] | None = None
+    ) -> dict[str, list[str | None]] | None:
+        """Parses each email in an array into one list per field of Email.header
         :param emails: list of emails
         :type emails: list[str]
-        :return: parsed list of emails in a dictionary
-        :rtype: dict[str, dict[str, str]] | None
+        :param fields: fields to return besides "email". Every field when None
+        :type fields: list[str] | None
+        :return: columns keyed by field, each with one value per email. Invalid
+            emails keep their input in the "email" column and None in the rest
+        :rtype: dict[str, list[str | None]] | None
         """
-        if not isinstance(emails, list) or len(emails) < 1:
+        columns = self.shared._columns(self.header, fields)
+        if not isinstance(emails, list) or not emails:
             return None
-        for email in emails:
-            yield self.parse_email(email)
+        return self.shared._to_columnar(
+            self.header,
+            emails,
+            (self.parse_email_record(email) for email in self._screen(emails)),
+            columns=columns,
+        )
 
-    def to_json(self, emails: list[str] | str, prettify=True) -> str | None:
+    def _parse_email_array(
+        self, emails: Iterable[str]
+    ) -> Generator[ParsedEmail | None, None, None]:
+        """Parses each email in an array
+        :param emails: list of emails
+        :type emails: Iterable[str]
+        :return: record for each email, None for invalid emails
+        :rtype: Generator[ParsedEmail | None, None, None]
+        """
+        for email in self._screen(emails):
+            # None is what the parse would return, without the call
+            yield None if email is None else self.parse_email_record(email)
+
+    def iter_parse(
+        self, emails: Iterable[str], fields: list[str] | None = None
+    ) -> Generator[ParsedEmail | None, None, None]:
+        """Lazily parses emails from any iterable, holding one email at a time
+        Surrounding whitespace is stripped, so an open file can be passed as is.
+        :param emails: emails, e.g. a generator, iterator or file object
+        :type emails: Iterable[str]
+        :param fields: fields the caller needs, checked against Email.header. Every
+            field of an email comes out of the same split, so records are whole
+        :type fields: list[str] | None
+        :return: record for each email, None for invalid emails
+        :rtype: Generator[ParsedEmail | None, None, None]
+        """
+        self.shared._columns(self.header, fields)
+        yield from self._parse_email_array(iter_lines(emails))
+
+    def parse_email_parallel(
+        self,
+        emails: Iterable[str],
+        workers: int | None = None,
+        chunk_size: int = 10_000,
+        fields: list[str] | None = None,
+    ) -> Generator[ParsedEmail | None, None, None]:
+        """Parses emails in chunks across worker processes
+        Results come back in input order with a bounded number of chunks in flight.
+        :param emails: emails to parse
+        :type emails: Iterable[str]
+        :param workers: number of worker processes. Defaults to the number of CPUs
+        :type workers: int | None
+        :param chunk_size: emails sent to a worker per task
+        :type chunk_size: int
+        :param fields: fields the caller needs, checked against Email.header. Every
+            field of an email comes out of the same split, so records are whole
+        :type fields: list[str] | None
+        :return: record for each email, None for invalid emails
+        :rtype: Generator[ParsedEmail | None, None, None]
+        """
+        self.shared._columns(self.header, fields)
+        tlds = None
+        if self.validate_tld:
+            # Loaded once here and shipped to the workers with the pool set up
+            tlds = self._get_tld_index(None)
+            if tlds is None:
+                return
+        # Rejected lines are screened here and sent on as None, which workers skip
+        yield from parse_parallel(
+            Email,
+            self._worker_options(),
+            "parse_email_record",
+            (tlds,),
+            self._screen(emails),
+            workers,
+            chunk_size,
+        )
+
+    def parse_email_zip(
+        self,
+        input_file_name: str,
+        workers: int | None = None,
+        ordered: bool = False,
+        delimiter: str = "\n",
+        chunk_size: int = 10_000,
+        fields: list[str] | None = None,
+    ) -> Generator[tuple[str, ParsedEmail | None], None, None]:
+        """Parses the .txt, .csv and .log members of a ZIP file, streaming each one
+        Members are decompressed block by block, so no member is held in memory as
+        a whole. With workers, each worker process opens the archive itself and
+        parses whole members, several at a time. A prefilter with an on_reject
+        callback keeps the parse in this process, so the callback sees every line.
+        :param input_file_name: path of the ZIP file
+        :type input_file_name: str
+        :param workers: number of worker processes. Parsed in this process when None
+        :type workers: int | None
+        :param ordered: keep archive order when parsing in workers. Otherwise
+            records are yielded as soon as a worker has parsed them
+        :type ordered: bool
+        :param delimiter: item separator
+        :type delimiter: str
+        :param chunk_size: emails a worker parses before sending them back
+        :type chunk_size: int
+        :param fields: fields the caller needs, checked against Email.header. Every
+            field of an email comes out of the same split, so records are whole
+        :type fields: list[str] | None
+        :return: member name and record for each email, None for invalid emails
+        :rtype: Generator[tuple[str, ParsedEmail | None], None, None]
+        """
+        self.shared._columns(self.header, fields)
+        if workers is None or (
+            self.prefilter is not None and self.prefilter.on_reject is not None
+        ):
+            for member_name, lines in _ZIP._iter_zip_members(
+                input_file_name, delimiter, 1 << 20
+            ):
+                for record in self._parse_email_array(lines):
+                    yield member_name, record
+            return
+        tlds = self._get_tld_index(None) if self.validate_tld else None
+        if self.validate_tld and tlds is None:
+            return
+        yield from parse_zip_parallel(
+            Email,
+            self._worker_options(),
+            "parse_email_record",
+            (tlds,),
+            self.prefilter,
+            input_file_name,
+            delimiter,
+            workers,
+            ordered,
+            chunk_size,
+        )
+
+    def _worker_options(self) -> dict:
+        """Keyword arguments that rebuild this parser in a worker process"""
+        return {
+            "cache_size": None if self._cache is None else self._cache.maxsize,
+            "validate_tld": self.validate_tld,
+            "intern_size": None if self._intern is None else self._intern.maxsize,
+        }
+
+    def _array_parser(self, workers: int | None):
+        def parse(emails):
+            if not isinstance(emails, list):
+                emails = iter_lines(emails)
+            if workers is None:
+                return self._parse_email_array(emails)
+            return self.parse_email_parallel(emails, workers=workers)
+
+        return parse
+
+    def to_json(
+        self, emails: list[str] | str, prettify=True, fields: list[str] | None = None
+    ) -> str | None:
         """Creates a JSON string representation of emails.
         :param emails: A list of emails or a single email string.
         :type emails: list[str] | str
         :param prettify: Whether to format the JSON output with indentation for readability.
         :type prettify: bool, optional (default is True)
+        :param fields: Fields to output for each email. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A JSON string of the parsed emails or None if the input is invalid or empty.
         :rtype: str | None
         """
         return self.shared._to_json(
-            self.parse_email, self._parse_email_array, emails, prettify
+            self.parse_email_record,
+            self._array_parser(None),
+            emails,
+            prettify,
+            self.shared._columns(self.header, fields),
         )
 
     def to_json_file(
-        self, file_name: str, emails: list[str], prettify: bool = True
+        self,
+        file_name: str,
+        emails: list[str],
+        prettify: bool = True,
+        workers: int | None = None,
+        fields: list[str] | None = None,
     ) -> tuple[str, int]:
         """Writes parsed emails to a JSON file.
         :param file_name: The name of the file (without extension) to write the JSON data.
@@ -134,78 +480,221 @@ class Email:
         :type emails: list[str]
         :param prettify: Whether to format the JSON output with indentation for readability.
         :type prettify: bool, optional (default is True)
+        :param workers: Number of processes to parse with. Parses serially when None.
+        :type workers: int | None, optional (default is None)
+        :param fields: Fields to output for each email. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A tuple containing the file name with extension and an int. 0 for a pass, 1 for a fail.
         :rtype: tuple[str, int]
         """
         return self.shared._to_json_file(
-            self.parse_email, self._parse_email_array, file_name, emails, prettify
+            self.parse_email_record,
+            self._array_parser(workers),
+            file_name,
+            emails,
+            prettify,
+            self.shared._columns(self.header, fields),
         )
 
-    def to_csv(self, emails: list[str] | str) -> str | None:
+    def to_csv(
+        self, emails: list[str] | str, fields: list[str] | None = None
+    ) -> str | None:
         """Creates a CSV string representation of URLs.
         :param urls: A list of URLs or a single URL string.
         :type urls: list[str] | str
+        :param fields: Fields to output for each email. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A CSV string of the parsed URLs or None if the input is invalid or empty.
         :rtype: str | None
         """
         return self.shared._to_csv(
             self.header,
-            self.field_generator,
-            self.parse_email,
-            self._parse_email_array,
+            self.parse_email_record,
+            self._array_parser(None),
             emails,
+            self.shared._columns(self.header, fields),
         )
 
-    def to_csv_file(self, file_name, urls: list[str] | str) -> tuple[str, int]:
+    def to_csv_file(
+        self,
+        file_name,
+        urls: list[str] | str,
+        workers: int | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[str, int]:
         """Writes parsed emails to a CSV file.
         :param file_name: The name of the file (without extension) to write the CSV data.
         :type file_name: str
         :param emails: A list of emails or a single email string to parse and write to the file.
         :type emails: list[str] | str
+        :param workers: Number of processes to parse with. Parses serially when None.
+        :type workers: int | None, optional (default is None)
+        :param fields: Fields to output for each email. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A tuple containing the file name with extension and an int. 0 for a pass, 1 for a fail.
         :rtype: tuple[str, int]
         """
         return self.shared._to_csv_file(
             self.header,
-            self.field_generator,
-            self.parse_email,
-            self._parse_email_array,
+            self.parse_email_record,
+            self._array_parser(workers),
             file_name,
             urls,
+            self.shared._columns(self.header, fields),
         )
 
+    def file_to_json_file(
+        self,
+        file_name: str,
+        input_file_name: str,
+        prettify: bool = True,
+        workers: int | None = None,
+        delimiter: str = "\n",
+        fields: list[str] | None = None,
+        encoding: str | None = None,
+    ) -> tuple[str, int]:
+        """Parses a file of emails and writes them to a JSON file.
+        Plain files are split into byte ranges that worker processes read, parse
+        and serialize on their own; the parts are merged in order into the file
+        to_json_file writes for the same emails. Compressed files, a single worker
+        and prefilters with an on_reject callback stream through to_json_file.
+        :param file_name: The name of the file (without extension) to write the JSON data.
+        :type file_name: str
+        :param input_file_name: Plain or compressed file of emails, as for iter_file.
+        :type input_file_name: str
+        :param prettify: Whether to format the JSON output with indentation for readability.
+        :type prettify: bool, optional (default is True)
+        :param workers: Number of processes to parse with. Defaults to the number of CPUs.
+        :type workers: int | None, optional (default is None)
+        :param delimiter: Separator between emails in the input file.
+        :type delimiter: str, optional (default is "\\n")
+        :param fields: Fields to output for each email. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
+        :param encoding: Encoding of the input file, as for iter_file.
+        :type encoding: str | None, optional (default is None)
+        :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+        :rtype: tuple[str, int]
+        """
+        columns = self.shared._columns(self.header, fields)
+        if not isinstance(input_file_name, str) or not os.path.isfile(input_file_name):
+            return "Failed to write file", 1
+        if not can_split_file(
+            input_file_name, delimiter, workers, self.prefilter, encoding
+        ):
+            return self.to_json_file(
+                file_name,
+                iter_file(input_file_name, delimiter, encoding=encoding),
+                prettify,
+                workers,
+                fields,
+            )
+        tlds = self._get_tld_index(None) if self.validate_tld else None
+        if self.validate_tld and tlds is None:
+            return "Failed to write file", 1
+        return ranges_to_json_file(
+            Email,
+            self._worker_options(),
+            "parse_email_record",
+            (tlds,),
+            self.prefilter,
+            file_name,
+            input_file_name,
+            delimiter,
+            workers,
+            prettify,
+            columns,
+            encoding,
+        )
 
-def get_comments_check_dots(text: str) -> list[str] | None:
-    results = []
-    stack = 0
-    start_index = None
-    prev_dot = False
+    def file_to_csv_file(
+        self,
+        file_name: str,
+        input_file_name: str,
+        workers: int | None = None,
+        delimiter: str = "\n",
+        fields: list[str] | None = None,
+        encoding: str | None = None,
+    ) -> tuple[str, int]:
+        """Parses a file of emails and writes them to a CSV file.
+        Plain files are split into byte ranges that worker processes read, parse
+        and serialize on their own; the parts are joined in order into the file
+        to_csv_file writes for the same emails. Compressed files, a single worker
+        and prefilters with an on_reject callback stream through to_csv_file.
+        :param file_name: The name of the file (without extension) to write the CSV data.
+        :type file_name: str
+        :param input_file_name: Plain or compressed file of emails, as for iter_file.
+        :type input_file_name: str
+        :param workers: Number of processes to parse with. Defaults to the number of CPUs.
+        :type workers: int | None, optional (default is None)
+        :param delimiter: Separator between emails in the input file.
+        :type delimiter: str, optional (default is "\\n")
+        :param fields: Fields to output for each email. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
+        :param encoding: Encoding of the input file, as for iter_file.
+        :type encoding: str | None, optional (default is None)
+        :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+        :rtype: tuple[str, int]
+        """
+        columns = self.shared._columns(self.header, fields)
+        if not isinstance(input_file_name, str) or not os.path.isfile(input_file_name):
+            return "Failed to write file", 1
+        if not can_split_file(
+            input_file_name, delimiter, workers, self.prefilter, encoding
+        ):
+            return self.to_csv_file(
+                file_name,
+                iter_file(input_file_name, delimiter, encoding=encoding),
+                workers,
+                fields,
+            )
+        tlds = self._get_tld_index(None) if self.validate_tld else None
+        if self.validate_tld and tlds is None:
+            return "Failed to write file", 1
+        return ranges_to_csv_file(
+            Email,
+            self._worker_options(),
+            "parse_email_record",
+            (tlds,),
+            self.prefilter,
+            self.header,
+            file_name,
+            input_file_name,
+            delimiter,
+            workers,
+            columns,
+            encoding,
+        )
 
-    for i, char in enumerate(text):
-        if char == ".":
-            if prev_dot is True:
-                return None
-            prev_dot = True
+
+def strip_comments(text: str) -> str | None:
+    """Removes parenthesised comments, nested ones included, from an address
+    Only the parentheses are visited, the text between them is copied in slices.
+    :param text: email address that may hold comments
+    :type text: str
+    :return: address without its comments, None if the parentheses don't balance
+    :rtype: str | None
+    """
+    kept = []
+    depth = 0
+    start = 0
+    for match in _PARENTHESES.finditer(text):
+        index = match.start()
+        if match.group() == "(":
+            if depth == 0:
+                kept.append(text[start:index])
+            depth += 1
         else:
-            prev_dot = False
-
-        if char == "(":
-            if stack == 0:
-                start_index = i
-            stack += 1
-        elif char == ")":
-            stack -= 1
-            if stack == 0:
-                content = text[start_index : i + 1]
-                results.append(content)
-        # Return None if seen '(' != ')' ie. a string like ))()
-        if stack < 0:
-            return None
-    # Return None if there are unclosed parentheses
-    if stack != 0:
+            depth -= 1
+            if depth < 0:
+                # a ")" with no "(" before it, ie. a string like ))()
+                return None
+            if depth == 0:
+                start = index + 1
+    if depth != 0:
+        # unclosed parentheses
         return None
-
-    return results
+    kept.append(text[start:])
+    return "".join(kept)
 
 
 email = Email()
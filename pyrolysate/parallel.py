@@ -0,0 +1,618 @@
+# Standard library
+import codecs
+import csv
+import mmap
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice, repeat
+from queue import Empty
+
+# Typing, type hints, and errors
+from typing import Any, Callable, Generator, Iterable
+
+# internal dependencies
+from pyrolysate.common import (
+    _BYTES_LIKE,
+    _ZIP,
+    _encode,
+    _iter_blocks,
+    _iter_mapped_blocks,
+    _project,
+    _record_to_json,
+    _text_encoding,
+    decode_line,
+)
+from pyrolysate.prefilter import Prefilter
+
+# Extensions read through a codec or archive, their byte offsets don't line up
+# with the text
+_CODEC_EXTENSIONS = ("bz2", "gz", "lzma", "xz", "zip", "tar", "tgz", "tbz2", "txz")
+# Ranges smaller than this aren't worth a task of their own
+_MIN_RANGE_SIZE = 1 << 20
+# JSON parts hold "key<_KEY_END>value<_ENTRY_END>" entries. Control characters
+# are always escaped inside JSON text, so neither can appear in a key or value.
+_KEY_END = "\x1f"
+_ENTRY_END = "\x1e"
+
+# Parser method and extra arguments set up once in each worker process
+_worker_parse = None
+_worker_args = ()
+# Where ZIP member workers put their parsed chunks, and the event that stops them
+_worker_queue = None
+_worker_stop = None
+
+
+def _init_worker(parser_type: type, options: dict, method: str, args: tuple) -> None:
+    """Builds the worker's parser once, so its TLD index outlives every task"""
+    global _worker_parse, _worker_args
+    _worker_parse = getattr(parser_type(**options), method)
+    _worker_args = args
+
+
+def _parse_chunk(chunk: list) -> list:
+    # None marks a line the prefilter rejected, which would parse to None anyway
+    return [
+        None if entry is None else _worker_parse(entry, *_worker_args)
+        for entry in chunk
+    ]
+
+
+def _chunks(entries: Iterable, chunk_size: int) -> Generator[list, None, None]:
+    entries = iter(entries)
+    while chunk := list(islice(entries, chunk_size)):
+        yield chunk
+
+
+def parse_parallel(
+    parser_type: type,
+    options: dict,
+    method: str,
+    args: tuple,
+    entries: Iterable,
+    workers: int | None = None,
+    chunk_size: int = 10_000,
+    max_in_flight: int | None = None,
+) -> Generator[Any, None, None]:
+    """Parses entries in chunks across a process pool, yielding results in input order
+    :param parser_type: parser class built in each worker, e.g. Url
+    :type parser_type: type
+    :param options: keyword arguments for the parser class
+    :type options: dict
+    :param method: name of the parser method applied to each entry
+    :type method: str
+    :param args: extra arguments passed to the method after each entry
+    :type args: tuple
+    :param entries: strings or bytes-like lines to parse, None for rejected lines
+    :type entries: Iterable
+    :param workers: number of worker processes. Defaults to the number of CPUs
+    :type workers: int | None
+    :param chunk_size: entries sent to a worker per task
+    :type chunk_size: int
+    :param max_in_flight: most chunks submitted but not yet yielded. Defaults to
+        twice the number of workers
+    :type max_in_flight: int | None
+    :return: result of the method for each entry, in input order
+    :rtype: Generator[Any, None, None]
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    max_in_flight = max_in_flight if max_in_flight is not None else 2 * workers
+    # Memoryviews can't be pickled, so bytes-like lines are decoded before sending
+    entries = (
+        decode_line(entry) if isinstance(entry, _BYTES_LIKE) else entry
+        for entry in entries
+    )
+    chunks = _chunks(entries, chunk_size)
+    pool = ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(parser_type, options, method, args),
+    )
+    try:
+        pending = deque(
+            pool.submit(_parse_chunk, chunk) for chunk in islice(chunks, max_in_flight)
+        )
+        while pending:
+            results = pending.popleft().result()
+            # Refill before yielding so workers stay busy while results are consumed
+            for chunk in islice(chunks, 1):
+                pending.append(pool.submit(_parse_chunk, chunk))
+            yield from results
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _init_member_worker(
+    parser_type: type, options: dict, method: str, args: tuple, queue, stop
+) -> None:
+    """Builds the worker's parser and keeps the queue shared with the parent"""
+    global _worker_queue, _worker_stop
+    _init_worker(parser_type, options, method, args)
+    _worker_queue = queue
+    _worker_stop = stop
+
+
+def _parse_member(task: tuple) -> tuple[int, int]:
+    """Streams one ZIP member, putting (index, records) chunks on the queue
+    An (index, None) entry always follows the last chunk, even if the member
+    can't be read, so the parent knows the member is finished.
+    :return: lines checked and rejected by the prefilter
+    """
+    index, input_file_name, member_name, delimiter, prefilter, chunk_size = task
+    try:
+        with zipfile.ZipFile(input_file_name, "r") as zip_file:
+            lines = _ZIP._iter_zip_member(zip_file, member_name, delimiter, 1 << 20)
+            if prefilter is not None:
+                prefilter.reset()
+                lines = prefilter.screen(lines)
+            for chunk in _chunks(lines, chunk_size):
+                if _worker_stop.is_set():
+                    break
+                records = [
+                    None if line is None else _worker_parse(line, *_worker_args)
+                    for line in chunk
+                ]
+                _worker_queue.put((index, records))
+    finally:
+        _worker_queue.put((index, None))
+    if prefilter is None:
+        return 0, 0
+    return prefilter.checked, prefilter.rejected
+
+
+def parse_zip_parallel(
+    parser_type: type,
+    options: dict,
+    method: str,
+    args: tuple,
+    prefilter: Prefilter | None,
+    input_file_name: str,
+    delimiter: str = "\n",
+    workers: int | None = None,
+    ordered: bool = False,
+    chunk_size: int = 10_000,
+) -> Generator[tuple[str, Any], None, None]:
+    """Parses the text members of a ZIP file across a process pool
+    Every worker opens the archive itself and streams whole members, so several
+    members are decompressed and parsed at once and only parsed chunks travel
+    back. Chunks go through a bounded queue, so workers wait while the caller is
+    busy instead of piling results up in memory.
+    :param parser_type: parser class built in each worker, e.g. Url
+    :type parser_type: type
+    :param options: keyword arguments for the parser class
+    :type options: dict
+    :param method: name of the parser method applied to each line
+    :type method: str
+    :param args: extra arguments passed to the method after each line
+    :type args: tuple
+    :param prefilter: screen run in each worker, its counts are added up here
+    :type prefilter: Prefilter | None
+    :param input_file_name: path of the ZIP file
+    :type input_file_name: str
+    :param delimiter: item separator
+    :type delimiter: str
+    :param workers: number of worker processes. Defaults to the number of CPUs
+    :type workers: int | None
+    :param ordered: yield in archive order. Chunks of members that finish early
+        are held until every earlier member is yielded
+    :type ordered: bool
+    :param chunk_size: lines parsed per chunk put on the queue
+    :type chunk_size: int
+    :return: member name and the result of the method for each line, as chunks
+        arrive or in archive order
+    :rtype: Generator[tuple[str, Any], None, None]
+    """
+    try:
+        with zipfile.ZipFile(input_file_name, "r") as zip_file:
+            members = _ZIP._text_members(zip_file)
+    except zipfile.BadZipFile as err:
+        print(f"Invalid ZIP file: {err}")
+        return
+    except Exception as err:
+        print(f"Error processing ZIP file: {err}")
+        return
+    if not members:
+        print("No supported text files found in ZIP archive")
+        return
+
+    workers = workers if workers is not None else os.cpu_count() or 1
+    queue = multiprocessing.Queue(2 * workers)
+    stop = multiprocessing.Event()
+    pool = ProcessPoolExecutor(
+        workers,
+        initializer=_init_member_worker,
+        initargs=(parser_type, options, method, args, queue, stop),
+    )
+    futures = [
+        pool.submit(
+            _parse_member,
+            (index, input_file_name, member, delimiter, prefilter, chunk_size),
+        )
+        for index, member in enumerate(members)
+    ]
+    try:
+        # Chunks of members past the one being yielded, only used when ordered
+        waiting = {}
+        finished = set()
+        current = 0
+        while len(finished) < len(members):
+            try:
+                index, records = queue.get(timeout=1)
+            except Empty:
+                # A worker that died never finishes its member, surface its error
+                for future in futures:
+                    if future.done():
+                        future.result()
+                continue
+            if records is None:
+                finished.add(index)
+                while ordered and current in finished:
+                    current += 1
+                    for records in waiting.pop(current, ()):
+                        yield from zip(repeat(members[current]), records)
+            elif not ordered or index == current:
+                yield from zip(repeat(members[index]), records)
+            else:
+                waiting.setdefault(index, []).append(records)
+        for future in futures:
+            checked, rejected = future.result()
+            if prefilter is not None:
+                prefilter.checked += checked
+                prefilter.rejected += rejected
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        # Workers blocked on a full queue only finish once it is drained
+        while not all(future.done() for future in futures):
+            try:
+                queue.get(timeout=0.1)
+            except Empty:
+                pass
+        pool.shutdown()
+
+
+def _overlaps_itself(delimiter: bytes) -> bool:
+    """True for delimiters like "--" whose start can be the end of an earlier match
+    A range could then start in the middle of a delimiter the serial split sees.
+    """
+    return any(
+        delimiter[:size] == delimiter[-size:] for size in range(1, len(delimiter))
+    )
+
+
+def _ascii_safe(encoding: str) -> bool:
+    """Whether every byte below 0x80 stands for its ASCII character in encoding
+    Ranges and blocks are cut where the encoded delimiter is found in the raw
+    bytes, which is only safe when no multibyte character can hold those bytes.
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    return name in ("utf-8", "ascii") or name.startswith(("iso8859-", "cp125"))
+
+
+def can_split_file(
+    input_file_name: str,
+    delimiter: str,
+    workers: int | None,
+    prefilter: Prefilter | None,
+    encoding: str | None = None,
+) -> bool:
+    """Whether a file can be parsed in byte ranges with the same result as serially
+    :param input_file_name: path of the input file
+    :type input_file_name: str
+    :param delimiter: item separator
+    :type delimiter: str
+    :param workers: number of worker processes. Defaults to the number of CPUs
+    :type workers: int | None
+    :param prefilter: prefilter of the parser, run in each worker
+    :type prefilter: Prefilter | None
+    :param encoding: encoding the file is read with, as for iter_file
+    :type encoding: str | None
+    :return: False for compressed inputs, self overlapping delimiters, delimiters
+        other than "\\n" holding a line ending that text mode would have
+        translated, encodings whose bytes can't be searched as ASCII, a single
+        worker or a prefilter whose rejects go to a callback in this process
+    :rtype: bool
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    encoding = _text_encoding(encoding)
+    if not _ascii_safe(encoding):
+        return False
+    try:
+        encoded = delimiter.encode(encoding)
+    except UnicodeEncodeError:
+        # Can't be found in the bytes, a serial run reads the file as one item
+        return False
+    return (
+        workers > 1
+        and input_file_name.split(".")[-1] not in _CODEC_EXTENSIONS
+        and (delimiter == "\n" or ("\r" not in delimiter and "\n" not in delimiter))
+        and not _overlaps_itself(encoded)
+        and (prefilter is None or prefilter.on_reject is None)
+    )
+
+
+def split_ranges(
+    input_file_name: str, parts: int, delimiter: bytes
+) -> list[tuple[int, int]]:
+    """Splits a file into byte ranges that each start right after a delimiter
+    Every item falls wholly inside one range, so parsing the ranges one after
+    another gives the items of the whole file in order.
+    :param input_file_name: path of an uncompressed file
+    :type input_file_name: str
+    :param parts: number of ranges wanted. Fewer come back if the file has fewer
+        delimiters
+    :type parts: int
+    :param delimiter: item separator
+    :type delimiter: bytes
+    :return: start and stop offset of each range, none for an empty file
+    :rtype: list[tuple[int, int]]
+    """
+    size = os.path.getsize(input_file_name)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(input_file_name, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for part in range(1, parts):
+                target = size * part // parts
+                # A delimiter straddling the target still ends the range before it
+                start = max(target - len(delimiter) + 1, bounds[-1])
+                found = mapped.find(delimiter, start)
+                if found == -1:
+                    break
+                bound = found + len(delimiter)
+                if bounds[-1] < bound < size:
+                    bounds.append(bound)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _write_range(task: tuple) -> tuple[int, int]:
+    """Parses one byte range of a file and writes its serialized records to a part
+    :return: lines checked and rejected by the prefilter
+    """
+    (
+        parser_type,
+        options,
+        method,
+        args,
+        prefilter,
+        input_file_name,
+        delimiter,
+        start,
+        stop,
+        part_name,
+        write_part,
+        encoding,
+    ) = task
+    parse = getattr(parser_type(**options), method)
+    with open(input_file_name, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            lines = _iter_mapped_blocks(
+                mapped, delimiter, 1 << 20, start, stop, encoding
+            )
+            if prefilter is not None:
+                prefilter.reset()
+                lines = prefilter.screen(lines)
+            records = (None if line is None else parse(line, *args) for line in lines)
+            with open(part_name, "w") as part:
+                write_part(records, part)
+    if prefilter is None:
+        return 0, 0
+    return prefilter.checked, prefilter.rejected
+
+
+def write_ranges(
+    parser_type: type,
+    options: dict,
+    method: str,
+    args: tuple,
+    prefilter: Prefilter | None,
+    input_file_name: str,
+    delimiter: str,
+    workers: int | None,
+    write_part: Callable,
+    directory: str,
+    encoding: str | None = None,
+) -> Generator[str, None, None]:
+    """Parses byte ranges of a file across a process pool, one part file per range
+    Each worker reads its own range straight from the file, parses it and writes
+    the serialized records, so only part names travel between processes. Parts
+    are yielded in file order as soon as they and every earlier part are written,
+    so they can be merged while later ranges are still being parsed.
+    :param parser_type: parser class built in each worker, e.g. Url
+    :type parser_type: type
+    :param options: keyword arguments for the parser class
+    :type options: dict
+    :param method: name of the parser method applied to each line
+    :type method: str
+    :param args: extra arguments passed to the method after each line
+    :type args: tuple
+    :param prefilter: screen run in each worker, its counts are added up here
+    :type prefilter: Prefilter | None
+    :param input_file_name: path of an uncompressed file
+    :type input_file_name: str
+    :param delimiter: item separator
+    :type delimiter: str
+    :param workers: number of worker processes. Defaults to the number of CPUs
+    :type workers: int | None
+    :param write_part: writes an iterable of records to an open text file
+    :type write_part: Callable
+    :param directory: where the part files are written
+    :type directory: str
+    :param encoding: encoding the file is read with, as for iter_file
+    :type encoding: str | None
+    :return: part file names, in file order
+    :rtype: Generator[str, None, None]
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    encoded = delimiter.encode(_text_encoding(encoding))
+    size = os.path.getsize(input_file_name)
+    # A few ranges per worker, so a slow range doesn't hold up the merge for long
+    parts = max(1, min(4 * workers, size // _MIN_RANGE_SIZE))
+    tasks = [
+        (
+            parser_type,
+            options,
+            method,
+            args,
+            prefilter,
+            input_file_name,
+            encoded,
+            start,
+            stop,
+            os.path.join(directory, f"part-{index:05d}"),
+            write_part,
+            encoding,
+        )
+        for index, (start, stop) in enumerate(
+            split_ranges(input_file_name, parts, encoded)
+        )
+    ]
+    pool = ProcessPoolExecutor(workers)
+    try:
+        futures = [pool.submit(_write_range, task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            checked, rejected = future.result()
+            if prefilter is not None:
+                prefilter.checked += checked
+                prefilter.rejected += rejected
+            yield task[9]
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _write_csv_part(records: Iterable, part, columns: list[int] | None) -> None:
+    csv.writer(part).writerows(
+        _project(record, columns) for record in records if record is not None
+    )
+
+
+def _write_json_part(
+    records: Iterable, part, pretty: bool, columns: list[int] | None
+) -> None:
+    # Keys repeated within the range are dropped here, across ranges in the merge
+    written = set()
+    indent = 8 if pretty is True else None
+    for record in records:
+        if record is None or record[0] in written:
+            continue
+        written.add(record[0])
+        part.write(_encode(record[0]))
+        part.write(_KEY_END)
+        part.write(_record_to_json(record, indent, columns))
+        part.write(_ENTRY_END)
+
+
+def _part_directory(file_name: str) -> tempfile.TemporaryDirectory:
+    """Scratch directory for part files, next to the output on the same disk"""
+    return tempfile.TemporaryDirectory(
+        prefix=".pyrolysate-", dir=os.path.dirname(os.path.abspath(file_name))
+    )
+
+
+def ranges_to_csv_file(
+    parser_type: type,
+    options: dict,
+    method: str,
+    args: tuple,
+    prefilter: Prefilter | None,
+    headers: list[str],
+    file_name: str,
+    input_file_name: str,
+    delimiter: str,
+    workers: int | None,
+    columns: list[int] | None = None,
+    encoding: str | None = None,
+) -> tuple[str, int]:
+    """Writes the CSV that Shared._to_csv_file writes, parsing byte ranges in parallel
+    Part files are copied into the output byte for byte, in file order.
+    :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+    :rtype: tuple[str, int]
+    """
+    with open(f"{file_name}.csv", "w") as file:
+        csv.writer(file).writerow(_project(headers, columns))
+    with _part_directory(file_name) as directory:
+        with open(f"{file_name}.csv", "ab") as file:
+            for part_name in write_ranges(
+                parser_type,
+                options,
+                method,
+                args,
+                prefilter,
+                input_file_name,
+                delimiter,
+                workers,
+                partial(_write_csv_part, columns=columns),
+                directory,
+                encoding,
+            ):
+                with open(part_name, "rb") as part:
+                    shutil.copyfileobj(part, file)
+                os.remove(part_name)
+    return "File successfully written", 0
+
+
+def ranges_to_json_file(
+    parser_type: type,
+    options: dict,
+    method: str,
+    args: tuple,
+    prefilter: Prefilter | None,
+    file_name: str,
+    input_file_name: str,
+    delimiter: str,
+    workers: int | None,
+    pretty: bool,
+    columns: list[int] | None = None,
+    encoding: str | None = None,
+) -> tuple[str, int]:
+    """Writes the JSON that Shared._to_json_file writes, parsing byte ranges in parallel
+    Workers serialize their records, the merge only joins the entries in file order
+    and drops keys an earlier range already wrote, as the serial writer does.
+    :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+    :rtype: tuple[str, int]
+    """
+    with _part_directory(file_name) as directory:
+        with open(f"{file_name}.json", "w") as file:
+            file.write("{\n    " if pretty is True else "{")
+            separator = ",\n    " if pretty is True else ", "
+            first = True
+            written = set()
+            for part_name in write_ranges(
+                parser_type,
+                options,
+                method,
+                args,
+                prefilter,
+                input_file_name,
+                delimiter,
+                workers,
+                partial(_write_json_part, pretty=pretty, columns=columns),
+                directory,
+                encoding,
+            ):
+                with open(part_name) as part:
+                    for entry in _iter_blocks(part, _ENTRY_END, 1 << 20):
+                        key, _, value = entry.partition(_KEY_END)
+                        if key in written:
+                            continue
+                        written.add(key)
+                        if first is not True:
+                            file.write(separator)
+                        file.write(key)
+                        file.write(": ")
+                        file.write(value)
+                        first = False
+                os.remove(part_name)
+            file.write("\n}" if pretty is True else "}")
+    return "File successfully written", 0
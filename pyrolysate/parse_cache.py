@@ -0,0 +1,134 @@
+# Standard library
+import threading
+from collections import OrderedDict
+
+# Typing, type hints, and errors
+from typing import Hashable, NamedTuple
+
+# Returned by ParseCache.get for keys that aren't cached, since None is a valid
+# cached result for input that can't be parsed
+MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """Size bounded least recently used cache of parse results
+
+    Entries are immutable records (or None for rejected input), so the same
+    object can be handed to every caller that asks for it.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        :param maxsize: most entries held before the least recently used is evicted
+        :type maxsize: int
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> object:
+        """Looks up a cached result and marks it as recently used
+        :param key: cache key
+        :type key: Hashable
+        :return: cached result, MISSING if the key isn't cached
+        :rtype: object
+        """
+        with self._lock:
+            value = self._entries.get(key, MISSING)
+            if value is MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        """Caches a result, evicting the least recently used entry when full
+        :param key: cache key
+        :type key: Hashable
+        :param value: immutable parse result
+        :type value: object
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def info(self) -> CacheInfo:
+        """
+        :return: hit, miss and eviction counts with the current and maximum size
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._entries),
+            )
+
+    def clear(self) -> None:
+        """Drops every entry and resets the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+class InternTable:
+    """Size bounded table that hands out one shared copy of each repeated string
+
+    Meant for fields drawn from a small vocabulary, such as schemes, ports and top
+    level domains, so a large batch of records holds each distinct value once
+    instead of one freshly sliced copy per record. Values seen once the table is
+    full are returned unchanged rather than evicting anything, so a field that
+    turns out not to repeat costs one lookup per value and no memory.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        :param maxsize: most distinct strings held
+        :type maxsize: int
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        # Plain dict operations are atomic, so threads can share the table unlocked.
+        # Two threads adding the same value at once only costs a duplicate copy.
+        self._table = {}
+
+    def __call__(self, value: str) -> str:
+        """
+        :param value: freshly parsed string
+        :type value: str
+        :return: the shared copy of value, value itself if it isn't held
+        :rtype: str
+        """
+        shared = self._table.get(value)
+        if shared is not None:
+            return shared
+        if len(self._table) < self.maxsize:
+            self._table[value] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def clear(self) -> None:
+        """Drops every held string"""
+        self._table.clear()
@@ -0,0 +1,175 @@
+# Standard library utilities
+import re
+
+# Typing, type hints, and errors
+from typing import Callable, Generator, Iterable
+
+# Characters that never appear in a url outside percent-encoding: ASCII control
+# characters, space and "<>\^`{|}. Compiled into the regex engine's character
+# table, so one search scans a line without a Python level loop.
+_URL_INVALID = re.compile(r"[\x00-\x20\x7f\"<>\\^`{|}]")
+# Optional http(s) scheme, then a host with at least one "." before the port,
+# path, query or fragment. Parsing fails for anything else.
+_URL_SHAPE = re.compile(r"(?:https?://)?[^:/?#]*\.[^:/?#]*(?:[:/?#]|$)", re.IGNORECASE)
+# parse_email accepts any character, and comments may hold whitespace and "@",
+# so the email rules only reject what parse_email always rejects: without a "("
+# exactly one "@" with something on both sides and no ")", otherwise an "@"
+# somewhere with neither the first nor the last character an "@"
+_EMAIL_SHAPE = re.compile(
+    r"(?:[^@()]+@[^@()]+|(?=.*\()(?=.*@)[^@].*(?<!@))\Z", re.DOTALL
+)
+
+
+def _bytes_pattern(pattern: re.Pattern) -> re.Pattern:
+    """Compiles an ASCII-only str pattern again for matching bytes"""
+    return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+
+
+class Prefilter:
+    """Cheap checks that reject lines which can't be parsed before the full parse
+
+    A line is rejected if its length is out of range, it contains a character from
+    the invalid table, or it doesn't have the rough shape of the input. Rejected
+    lines are counted and can be passed to a callback, e.g. to write them to a
+    reject file. The url checks are deliberately stricter than the parser: a url
+    containing whitespace, for example, is rejected even though parse_url would
+    split it. The email checks only reject lines parse_email would reject.
+    """
+
+    def __init__(
+        self,
+        invalid: re.Pattern | None,
+        shape: re.Pattern,
+        min_length: int,
+        max_length: int,
+        on_reject: Callable[[object], None] | None = None,
+    ):
+        """
+        :param invalid: pattern matching any character that rejects a line, None
+            if no character does
+        :type invalid: re.Pattern | None
+        :param shape: pattern a line must match from its start
+        :type shape: re.Pattern
+        :param min_length: shortest line accepted
+        :type min_length: int
+        :param max_length: longest line accepted
+        :type max_length: int
+        :param on_reject: called with each rejected line
+        :type on_reject: Callable[[object], None] | None
+        """
+        self._invalid = None if invalid is None else invalid.search
+        self._shape = shape.match
+        # Byte lines are checked before they are decoded
+        self._invalid_bytes = (
+            None if invalid is None else _bytes_pattern(invalid).search
+        )
+        self._shape_bytes = _bytes_pattern(shape).match
+        self.min_length = min_length
+        self.max_length = max_length
+        self.on_reject = on_reject
+        self.checked = 0
+        self.rejected = 0
+
+    @classmethod
+    def for_urls(
+        cls, max_length: int = 2048, on_reject: Callable[[object], None] | None = None
+    ) -> "Prefilter":
+        """Prefilter for Url(prefilter=...)
+        :param max_length: longest url accepted
+        :type max_length: int
+        :param on_reject: called with each rejected line
+        :type on_reject: Callable[[object], None] | None
+        :return: url prefilter
+        :rtype: Prefilter
+        """
+        # "a.io" is the shortest host with a top level domain
+        return cls(_URL_INVALID, _URL_SHAPE, 4, max_length, on_reject)
+
+    @classmethod
+    def for_emails(
+        cls, max_length: int = 997, on_reject: Callable[[object], None] | None = None
+    ) -> "Prefilter":
+        """Prefilter for Email(prefilter=...)
+        :param max_length: longest email accepted
+        :type max_length: int
+        :param on_reject: called with each rejected line
+        :type on_reject: Callable[[object], None] | None
+        :return: email prefilter
+        :rtype: Prefilter
+        """
+        return cls(None, _EMAIL_SHAPE, 3, max_length, on_reject)
+
+    def accepts(self, entry: object) -> bool:
+        """Whether entry passes the checks, without counting it
+        :param entry: line to check
+        :type entry: object
+        :return: True if entry should be parsed
+        :rtype: bool
+        """
+        if isinstance(entry, str):
+            invalid, shape = self._invalid, self._shape
+        elif isinstance(entry, (bytes, bytearray, memoryview)):
+            invalid, shape = self._invalid_bytes, self._shape_bytes
+        else:
+            return False
+        length = len(entry)
+        if length > self.max_length and not isinstance(entry, str):
+            # Multibyte characters make a line shorter once it is decoded
+            length = len(str(entry, "utf-8", "replace"))
+        return (
+            self.min_length <= length <= self.max_length
+            and (invalid is None or invalid(entry) is None)
+            and shape(entry) is not None
+        )
+
+    def check(self, entry: object, times: int = 1) -> bool:
+        """Checks entry, counting it and routing it to on_reject if rejected
+        :param entry: line to check
+        :type entry: object
+        :param times: number of occurrences of the line
+        :type times: int
+        :return: True if entry should be parsed
+        :rtype: bool
+        """
+        self.checked += times
+        if self.accepts(entry):
+            return True
+        self.rejected += times
+        if self.on_reject is not None:
+            for _ in range(times):
+                self.on_reject(entry)
+        return False
+
+    def screen(self, entries: Iterable) -> Generator:
+        """Passes accepted entries through and replaces rejected ones with None
+        Parsers return None for None, so positions are kept without parsing.
+        :param entries: lines to check
+        :type entries: Iterable
+        :return: each entry, or None if it was rejected
+        :rtype: Generator
+        """
+        # accepts() inlined for str, this loop runs once per line of input
+        invalid, shape = self._invalid, self._shape
+        min_length, max_length = self.min_length, self.max_length
+        for entry in entries:
+            self.checked += 1
+            if (
+                (
+                    min_length <= len(entry) <= max_length
+                    and (invalid is None or invalid(entry) is None)
+                    and shape(entry) is not None
+                )
+                if isinstance(entry, str)
+                else self.accepts(entry)
+            ):
+                yield entry
+            else:
+                self.rejected += 1
+                if self.on_reject is not None:
+                    self.on_reject(entry)
+                yield None
+
+    def reset(self) -> None:
+        """Sets the checked and rejected counts back to zero"""
+        self.checked = 0
+        self.rejected = 0
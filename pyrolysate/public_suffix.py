@@ -0,0 +1,88 @@
+# Typing, type hints, and errors
+from typing import Iterable
+
+# Rule markers stored under the None key of a trie node.
+# Host labels are always strings, so None can never collide with one.
+_RULE = None
+_NORMAL = 1
+_EXCEPTION = 2
+_WILDCARD = "*"
+
+
+class PublicSuffixList:
+    """Public Suffix List rules compiled into a trie of reversed labels
+
+    Supports the three kinds of rules in the list: normal ("co.uk"), wildcard
+    ("*.ck") and exception ("!www.ck"). Rules are matched against a host from its
+    rightmost label, so the registrable domain and subdomain of a host of any
+    depth are found in a single walk.
+    """
+
+    def __init__(self, rules: Iterable[str], version: str | None = None):
+        """
+        :param rules: lines of a public suffix list, comments and blanks are skipped
+        :type rules: Iterable[str]
+        :param version: version string of the list the rules were read from
+        :type version: str | None
+        """
+        self.version = version
+        self._trie = {}
+        for line in rules:
+            rule = line.strip().split(" ")[0].lower()
+            if not rule or rule.startswith("//"):
+                continue
+            kind = _NORMAL
+            if rule.startswith("!"):
+                kind = _EXCEPTION
+                rule = rule[1:]
+            node = self._trie
+            for label in reversed(rule.split(".")):
+                node = node.setdefault(label, {})
+            node[_RULE] = kind
+
+    def suffix_length(self, labels: list[str]) -> int:
+        """Finds how many trailing labels make up the public suffix of a host
+        Hosts not covered by any rule fall back to the implicit "*" rule, so the
+        rightmost label alone is the public suffix.
+        :param labels: host split on "." e.g. ["www", "example", "co", "uk"]
+        :type labels: list[str]
+        :return: number of trailing labels that form the public suffix
+        :rtype: int
+        """
+        node = self._trie
+        matched = 1
+        for depth, label in enumerate(reversed(labels), start=1):
+            child = node.get(label)
+            if child is not None and child.get(_RULE) == _EXCEPTION:
+                # Exception rules prevail, the suffix is the rule minus one label
+                return depth - 1
+            wildcard = node.get(_WILDCARD)
+            if (child is not None and child.get(_RULE) == _NORMAL) or (
+                wildcard is not None and wildcard.get(_RULE) == _NORMAL
+            ):
+                matched = depth
+            if child is None:
+                break
+            node = child
+        return matched
+
+    def split_host(self, host: str) -> tuple[str, str, str] | None:
+        """Splits a host into subdomain, second level domain and public suffix
+        :param host: lowercase host name without scheme, port or path
+        :type host: str
+        :return: subdomain, second level domain and suffix, None if the host has no
+            registrable domain (the host is empty, malformed or itself a suffix)
+        :rtype: tuple[str, str, str] | None
+        """
+        labels = host.split(".")
+        if "" in labels:
+            return None
+        suffix_length = self.suffix_length(labels)
+        if suffix_length >= len(labels):
+            return None
+        split = len(labels) - suffix_length
+        return (
+            ".".join(labels[: split - 1]),
+            labels[split - 1],
+            ".".join(labels[split:]),
+        )
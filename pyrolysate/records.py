@@ -0,0 +1,65 @@
+# Typing, type hints, and errors
+from typing import NamedTuple
+
+
+class ParsedUrl(NamedTuple):
+    """Components of a single url, in the column order of Url.header"""
+
+    url: str
+    scheme: str = ""
+    subdomain: str = ""
+    second_level_domain: str = ""
+    top_level_domain: str = ""
+    port: str = ""
+    path: str = ""
+    query: str = ""
+    fragment: str = ""
+
+    def to_dict(self) -> dict[str, dict[str, str]]:
+        """Returns the record in the {url: {field: value}} shape of parse_url"""
+        return {
+            self.url: {
+                "scheme": self.scheme,
+                "subdomain": self.subdomain,
+                "second_level_domain": self.second_level_domain,
+                "top_level_domain": self.top_level_domain,
+                "port": self.port,
+                "path": self.path,
+                "query": self.query,
+                "fragment": self.fragment,
+            }
+        }
+
+
+class ParsedEmail(NamedTuple):
+    """Components of a single email address, in the column order of Email.header"""
+
+    email: str
+    local: str = ""
+    plus_address: str = ""
+    mail_server: str = ""
+    domain: str = ""
+
+    def to_dict(self) -> dict[str, dict[str, str]]:
+        """Returns the record in the {email: {field: value}} shape of parse_email"""
+        return {
+            self.email: {
+                "local": self.local,
+                "plus_address": self.plus_address,
+                "mail_server": self.mail_server,
+                "domain": self.domain,
+            }
+        }
+
+
+class RecordBatch(NamedTuple):
+    """Parse results for every input position of a batch, duplicates included"""
+
+    records: list[ParsedUrl | ParsedEmail | None]
+    counts: dict[str, int]
+    tld_version: str | None = None
+
+    @property
+    def duplicates(self) -> int:
+        """Number of inputs that repeat an earlier input"""
+        return len(self.records) - len(self.counts)
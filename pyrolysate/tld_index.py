@@ -0,0 +1,166 @@
+# Binary snapshots
+import marshal
+
+# Typing, type hints, and errors
+from typing import Iterable, Iterator
+
+# Bumped whenever the layout of the marshalled snapshot tuple changes
+SNAPSHOT_FORMAT = 2
+
+# Second labels that make a two part TLD out of a single label one, as in gov.bs
+TWO_PART_TLDS_LHS = ("gov", "co", "com", "org", "net", "ac", "edu", "or", "ne", "go")
+
+# Indexes compiled by from_tlds from plain lists and tuples, keyed by their
+# contents, so a list edited in place compiles again on its next use
+_LIST_INDEXES_SIZE = 8
+_list_indexes = {}
+
+
+class TldIndex:
+    """Compiled set of top level domains
+
+    Membership checks go through a frozenset, so looking up a TLD is O(1)
+    regardless of how many TLDs the index holds. The TLDs also form a trie keyed
+    by their labels in reverse order ("gov.bs" -> "bs", "gov"), which lets callers
+    walk a host name from the right one label at a time. The trie is stored flat:
+    each inner node is keyed by the suffix it spells ("bs" for "gov.bs"), so it
+    is a second frozenset and can be marshalled as is. When it is empty every TLD
+    is a single label and lookups skip the walk entirely.
+    """
+
+    __slots__ = ("version", "_tlds", "_partial")
+
+    def __init__(self, tlds: Iterable[str], version: str | None = None):
+        """
+        :param tlds: top level domains, with or without multiple labels
+        :type tlds: Iterable[str]
+        :param version: version string of the source the TLDs were read from
+        :type version: str | None
+        """
+        self.version = version
+        self._tlds = frozenset(
+            tld.strip().lower() for tld in tlds if isinstance(tld, str) and tld.strip()
+        )
+        partial = set()
+        for tld in self._tlds:
+            labels = tld.split(".")
+            for start in range(1, len(labels)):
+                partial.add(".".join(labels[start:]))
+        self._partial = frozenset(partial)
+
+    @classmethod
+    def from_tlds(
+        cls, tlds: "TldIndex | Iterable[str]", version: str | None = None
+    ) -> "TldIndex":
+        """Returns tlds unchanged if it is already an index, otherwise compiles it
+        Indexes compiled from a list or tuple are reused while a list or tuple with
+        the same contents is passed again, so per-call parses with a custom list
+        don't recompile it. Batch and iterator calls compile once and pass the index on.
+        :param tlds: an existing index or an iterable of top level domains
+        :type tlds: TldIndex | Iterable[str]
+        :param version: version string used when a new index is compiled
+        :type version: str | None
+        :return: compiled TLD index
+        :rtype: TldIndex
+        """
+        if isinstance(tlds, cls):
+            return tlds
+        if not isinstance(tlds, (list, tuple)) or version is not None:
+            return cls(tlds, version)
+        key = tuple(tlds)
+        index = _list_indexes.get(key)
+        if index is not None:
+            return index
+        index = cls(key)
+        if len(_list_indexes) >= _LIST_INDEXES_SIZE:
+            # Oldest first, dicts keep insertion order
+            _list_indexes.pop(next(iter(_list_indexes)), None)
+        _list_indexes[key] = index
+        return index
+
+    def __contains__(self, tld: object) -> bool:
+        return tld in self._tlds
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tlds)
+
+    def __len__(self) -> int:
+        return len(self._tlds)
+
+    def __repr__(self) -> str:
+        return f"TldIndex({len(self._tlds)} tlds, version={self.version!r})"
+
+    def longest_suffix(self, labels: list[str]) -> int:
+        """Finds the longest top level domain at the end of a list of host labels
+        :param labels: host split on "." e.g. ["www", "example", "gov", "bs"]
+        :type labels: list[str]
+        :return: number of trailing labels that form the longest known TLD, 0 if none
+        :rtype: int
+        """
+        if not self._partial:
+            # Every TLD is a single label, as in the IANA list
+            return 1 if labels and labels[-1] in self._tlds else 0
+        matched = 0
+        suffix = ""
+        for depth, label in enumerate(reversed(labels), start=1):
+            suffix = f"{label}.{suffix}" if suffix else label
+            if suffix in self._tlds:
+                matched = depth
+            if suffix not in self._partial:
+                break
+        return matched
+
+    def suffix_length(
+        self, labels: list[str], two_part_tlds_lhs: Iterable[str] = TWO_PART_TLDS_LHS
+    ) -> int:
+        """Finds the longest known TLD at the end of a host, as Url and Email split it
+        A single label TLD preceded by one of two_part_tlds_lhs counts as two labels
+        when there is a label left over for the domain ("example.gov.bs").
+        :param labels: host split on "." e.g. ["www", "example", "gov", "bs"]
+        :type labels: list[str]
+        :param two_part_tlds_lhs: second labels that extend a TLD to two labels
+        :type two_part_tlds_lhs: Iterable[str]
+        :return: number of trailing labels that form the TLD, 0 if none
+        :rtype: int
+        """
+        suffix_length = self.longest_suffix(labels)
+        if suffix_length == 1 and len(labels) >= 3 and labels[-2] in two_part_tlds_lhs:
+            # example.gov.bs or www.example.gov.bs
+            suffix_length = 2
+        return suffix_length
+
+    def to_snapshot(self, path) -> None:
+        """Writes the compiled index to a binary snapshot file
+        :param path: destination of the snapshot
+        :type path: str | Path
+        """
+        with open(path, "wb") as file:
+            marshal.dump(
+                (SNAPSHOT_FORMAT, self.version, self._tlds, self._partial), file
+            )
+
+    @classmethod
+    def from_snapshot(cls, path, version: str | None = None) -> "TldIndex | None":
+        """Loads an index written by to_snapshot without recompiling it
+        :param path: location of the snapshot
+        :type path: str | Path
+        :param version: expected version, the snapshot is rejected if it differs
+        :type version: str | None
+        :return: loaded index, None if the snapshot is missing, stale or unreadable
+        :rtype: TldIndex | None
+        """
+        try:
+            with open(path, "rb") as file:
+                snapshot = marshal.loads(file.read())
+            snapshot_format, snapshot_version, tlds, partial = snapshot
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if snapshot_format != SNAPSHOT_FORMAT:
+            return None
+        if version is not None and snapshot_version != version:
+            return None
+        index = cls.__new__(cls)
+        index.version = snapshot_version
+        index._tlds = tlds
+        index._partial = partial
+        return index
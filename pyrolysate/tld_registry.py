@@ -0,0 +1,106 @@
+# Standard library
+import os
+import threading
+
+# internal dependencies
+from pyrolysate.tld_index import TldIndex
+from pyrolysate.update_tlds import (
+    get_tld_index,
+    get_tlds_from_local,
+    load_tld_index,
+)
+from pyrolysate.utils import load_tld_file
+
+
+class TldRegistry:
+    """Current TLD index for long-running processes, swappable without a restart
+
+    Readers take whatever index the registry points to without locking. A reload
+    compiles the new index off to the side and then replaces the reference in a
+    single assignment, so a parse that already holds the old index finishes with
+    it and the next one picks up the new index.
+    """
+
+    def __init__(self, path_to_tlds_file: str = None):
+        """
+        :param path_to_tlds_file: TLD file to serve. Defaults to the project's local file
+        :type path_to_tlds_file: str
+        """
+        self._path = path_to_tlds_file
+        self._index = None
+        self._file_state = None
+        # Only serialises reloads against each other, readers never take it
+        self._reload_lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path if self._path is not None else load_tld_file()
+
+    @property
+    def index(self) -> TldIndex | None:
+        """Current TLD index, loaded on first use"""
+        index = self._index
+        if index is None:
+            return self.reload()
+        return index
+
+    @property
+    def version(self) -> str | None:
+        """Version string of the current TLD index"""
+        index = self.index
+        return None if index is None else index.version
+
+    def _stat(self, path) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> TldIndex | None:
+        """Re-reads the TLD file and swaps the new index in
+        The current index is kept if the file can't be read.
+        :return: index in use after the reload
+        :rtype: TldIndex | None
+        """
+        with self._reload_lock:
+            path = self.path
+            file_state = self._stat(path)
+            index = load_tld_index(path)
+            if index is None:
+                return self._index
+            self._file_state = file_state
+            self._index = index
+            # Other entry points must not keep serving the list read before the swap
+            get_tlds_from_local.cache_clear()
+            get_tld_index.cache_clear()
+            return index
+
+    def reload_if_changed(self) -> bool:
+        """Reloads only if the TLD file was modified since the last load
+        :return: True if a new index was swapped in
+        :rtype: bool
+        """
+        if self._index is not None and self._stat(self.path) == self._file_state:
+            return False
+        previous = self._index
+        return self.reload() is not previous
+
+    def watch(self, interval: float = 5.0) -> threading.Event:
+        """Polls the TLD file in a daemon thread and reloads it when it changes
+        :param interval: seconds between checks
+        :type interval: float
+        :return: event that stops the watcher when set
+        :rtype: threading.Event
+        """
+        stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                self.reload_if_changed()
+
+        threading.Thread(target=poll, name="pyrolysate-tld-watch", daemon=True).start()
+        return stop
+
+
+tld_registry = TldRegistry()
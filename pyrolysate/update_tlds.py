@@ -3,32 +3,104 @@ from functools import cache
 
 # Standard library
 from datetime import datetime
+from pathlib import Path
+import json
+
+# Typing, type hints, and errors
+from typing import Callable, NamedTuple
 
 # internal depedencies
+from pyrolysate.public_suffix import PublicSuffixList
+from pyrolysate.tld_index import TldIndex
 from pyrolysate.utils import load_tld_file
 
+IANA_TLD_URL = "https://data.iana.org/TLD/tlds-alpha-by-domain.txt"
 
-@cache
-def get_tlds_from_iana() -> tuple[str, list[str]] | None:
+
+class HttpResponse(NamedTuple):
+    status: int
+    headers: dict[str, str]  # header names are lowercase
+    text: str
+
+
+# Signature of the swappable HTTP layer: (url, request headers) -> response or None
+Fetch = Callable[[str, dict[str, str]], HttpResponse | None]
+
+
+class TldUpdate(NamedTuple):
+    message: str
+    status: int
+    changed: bool
+    version: str | None
+    added: list[str]
+    removed: list[str]
+
+
+def requests_fetch(url: str, headers: dict[str, str]) -> HttpResponse | None:
+    """Default HTTP layer, a GET request made with requests
+    :param url: address to fetch
+    :type url: str
+    :param headers: extra request headers, e.g. conditional request validators
+    :type headers: dict[str, str]
+    :return: status, lowercase headers and body, None if the request failed
+    :rtype: HttpResponse | None
+    """
     # HTTP requests (third-party)
     import requests
 
     try:
-        response = requests.get(
-            "https://data.iana.org/TLD/tlds-alpha-by-domain.txt", timeout=10
-        )
-        response.raise_for_status()
-        lines = response.text.split("\n")
-        return lines[0], list(map(lambda x: x.lower(), filter(None, lines[1:])))
+        response = requests.get(url, headers=headers, timeout=10)
     except requests.RequestException as e:
         print(f"Error fetching TLD list: {e}")
         return None
+    return HttpResponse(
+        response.status_code,
+        {name.lower(): value for name, value in response.headers.items()},
+        response.text,
+    )
+
+
+def _parse_iana_text(text: str) -> tuple[str, list[str]]:
+    lines = text.split("\n")
+    return lines[0], list(map(lambda x: x.lower(), filter(None, lines[1:])))
 
 
 @cache
-def get_tlds_from_local(path_to_tlds_file: str = None) -> tuple[str, list[str]] | None:
+def get_tlds_from_iana(
+    as_index: bool = False,
+) -> tuple[str, list[str] | TldIndex] | None:
+    if as_index:
+        res = get_tlds_from_iana()
+        if res is None:
+            return None
+        version, tlds = res
+        return version, TldIndex(tlds, version)
+
+    response = requests_fetch(IANA_TLD_URL, {})
+    if response is None:
+        return None
+    if response.status != 200:
+        print(f"Error fetching TLD list: HTTP {response.status}")
+        return None
+    return _parse_iana_text(response.text)
+
+
+@cache
+def get_tlds_from_local(
+    path_to_tlds_file: str = None, as_index: bool = False
+) -> tuple[str, list[str] | TldIndex] | None:
     if path_to_tlds_file is None:
         path_to_tlds_file = load_tld_file()
+    if as_index:
+        res = get_tlds_from_local(path_to_tlds_file)
+        if res is None:
+            return None
+        last_updated, tlds = res
+        return last_updated, TldIndex(tlds, last_updated)
+    return _read_tld_file(path_to_tlds_file)
+
+
+def _read_tld_file(path_to_tlds_file: str) -> tuple[str, list[str]] | None:
     try:
         with open(path_to_tlds_file, "r") as file:
             lines = file.readlines()
@@ -42,28 +114,201 @@ def get_tlds_from_local(path_to_tlds_file: str = None) -> tuple[str, list[str]]
         return None
 
 
+def get_tld_file_version(path_to_tlds_file: str) -> str | None:
+    """Reads only the version header of a TLD file
+    :param path_to_tlds_file: path to a file written by update_local_tld_file
+    :type path_to_tlds_file: str
+    :return: version and date of the TLD list, None if the header can't be read
+    :rtype: str | None
+    """
+    try:
+        with open(path_to_tlds_file, "r") as file:
+            file.readline()
+            version = file.readline().strip()
+            dated = file.readline().strip()
+    except IOError:
+        return None
+    return f"{version}, {dated}"
+
+
+def load_tld_index(path_to_tlds_file: str = None) -> TldIndex | None:
+    """Loads the compiled TLD index from disk without consulting any cache
+    The binary snapshot next to the TLD file is used when its version matches the
+    TLD file's header, otherwise the index is compiled from the TLD file itself.
+    :param path_to_tlds_file: path to a TLD file. Defaults to the project's local file
+    :type path_to_tlds_file: str
+    :return: compiled TLD index, None if neither file can be read
+    :rtype: TldIndex | None
+    """
+    if path_to_tlds_file is None:
+        path_to_tlds_file = load_tld_file()
+    version = get_tld_file_version(path_to_tlds_file)
+    if version is not None:
+        snapshot = Path(path_to_tlds_file).with_suffix(".bin")
+        index = TldIndex.from_snapshot(snapshot, version)
+        if index is not None:
+            return index
+    res = _read_tld_file(path_to_tlds_file)
+    if res is None:
+        return None
+    last_updated, tlds = res
+    return TldIndex(tlds, last_updated)
+
+
+@cache
+def get_tld_index(path_to_tlds_file: str = None) -> TldIndex | None:
+    """Loads the compiled TLD index once per process
+    :param path_to_tlds_file: path to a TLD file. Defaults to the project's local file
+    :type path_to_tlds_file: str
+    :return: compiled TLD index, None if neither file can be read
+    :rtype: TldIndex | None
+    """
+    return load_tld_index(path_to_tlds_file)
+
+
+@cache
+def get_public_suffix_list(path_to_psl_file: str) -> PublicSuffixList | None:
+    """Compiles a local copy of the Public Suffix List
+    :param path_to_psl_file: path to a public_suffix_list.dat file
+    :type path_to_psl_file: str
+    :return: compiled rules, None if the file can't be read
+    :rtype: PublicSuffixList | None
+    """
+    try:
+        with open(path_to_psl_file, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+    except IOError as e:
+        print(f"Error reading public suffix list: {e}")
+        return None
+    version = None
+    for line in lines:
+        if line.startswith("// VERSION:"):
+            version = line.split(":", 1)[1].strip()
+            break
+    return PublicSuffixList(lines, version)
+
+
+def _validators_path(file_name: str) -> Path:
+    path = Path(file_name)
+    return path.with_name(f"{path.stem}.validators.json")
+
+
+def _read_validators(file_name: str) -> dict[str, str]:
+    try:
+        with open(_validators_path(file_name), "r") as file:
+            validators = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def _write_validators(file_name: str, headers: dict[str, str]) -> None:
+    validators = {
+        name: headers[name] for name in ("etag", "last-modified") if name in headers
+    }
+    with open(_validators_path(file_name), "w") as file:
+        json.dump(validators, file)
+
+
 def update_local_tld_file(file_name: str = "tld") -> tuple[str, int]:
-    if not isinstance(file_name, str):
-        return "Failed to write file. File name must be a string.", 1
-    tlds = get_tlds_from_iana()
-    if tlds is None:
-        return "Failed to fetch tlds", 1
-    ver_dated, tldss = tlds
-    version, dated = ver_dated.split(",")
+    return update(file_name)
+
+
+def update(
+    file_name: str = "tld", fetch: Fetch | None = None, source_url: str = IANA_TLD_URL
+) -> tuple[str, int]:
+    """Brings a local TLD file up to date with IANA, see update_details
+    :param file_name: TLD file to update, ".txt" is added if missing
+    :type file_name: str
+    :param fetch: HTTP layer used for the request. Defaults to requests_fetch
+    :type fetch: Fetch | None
+    :param source_url: address of the TLD list
+    :type source_url: str
+    :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+    :rtype: tuple[str, int]
+    """
+    result = update_details(file_name, fetch, source_url)
+    return result.message, result.status
 
+
+def _ensure_snapshot(file_name: str, tlds: list[str], version: str) -> None:
+    # An up to date TLD file may still lack its snapshot, or have a stale one
+    snapshot = Path(file_name).with_suffix(".bin")
+    if TldIndex.from_snapshot(snapshot, version) is None:
+        TldIndex(tlds, version).to_snapshot(snapshot)
+
+
+def update_details(
+    file_name: str = "tld", fetch: Fetch | None = None, source_url: str = IANA_TLD_URL
+) -> TldUpdate:
+    """Brings a local TLD file up to date with IANA, doing as little work as possible
+    The request is conditional on the ETag and Last-Modified validators saved by the
+    previous update, and the file is only rewritten when the "# Version" header
+    changes. The file's binary snapshot and validators are written next to it, and
+    the snapshot is rebuilt when it is missing or stale even if the file is current.
+    :param file_name: TLD file to update, ".txt" is added if missing
+    :type file_name: str
+    :param fetch: HTTP layer used for the request. Defaults to requests_fetch
+    :type fetch: Fetch | None
+    :param source_url: address of the TLD list
+    :type source_url: str
+    :return: message, exit code and the TLDs added and removed by the update
+    :rtype: TldUpdate
+    """
+    if not isinstance(file_name, str):
+        return TldUpdate(
+            "Failed to write file. File name must be a string.", 1, False, None, [], []
+        )
     if not file_name.endswith(".txt"):
         file_name = f"{file_name}.txt"
+    if fetch is None:
+        fetch = requests_fetch
+
+    local = _read_tld_file(file_name) if Path(file_name).is_file() else None
+    headers = {}
+    if local is not None:
+        validators = _read_validators(file_name)
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last-modified" in validators:
+            headers["If-Modified-Since"] = validators["last-modified"]
+
+    response = fetch(source_url, headers)
+    if response is None or response.status not in (200, 304):
+        return TldUpdate("Failed to fetch tlds", 1, False, None, [], [])
+    if response.status == 304:
+        if local is None:
+            return TldUpdate("Failed to fetch tlds", 1, False, None, [], [])
+        _ensure_snapshot(file_name, local[1], local[0])
+        return TldUpdate("TLD file already up to date", 0, False, local[0], [], [])
+
+    ver_dated, tldss = _parse_iana_text(response.text)
+    version, dated = ver_dated.split(",")
+    if local is not None and local[0].split(",")[0] == version.strip():
+        _ensure_snapshot(file_name, local[1], local[0])
+        _write_validators(file_name, response.headers)
+        return TldUpdate("TLD file already up to date", 0, False, local[0], [], [])
+
     with open(file_name, "w") as file:
         file.write(f"File Created: {datetime.now().strftime('%d %B %Y %H:%M')}\n")
         file.write(f"{version}\n")
         file.write(f"{dated}\n\n")
         for tld in tldss:
             file.write(f"{tld}\n")
-    return "File created successfully", 0
-
+    last_updated = f"{version.strip()}, {dated.strip()}"
+    index = TldIndex(tldss, last_updated)
+    index.to_snapshot(Path(file_name).with_suffix(".bin"))
+    _write_validators(file_name, response.headers)
 
-def update(file_name: str = "tld"):
-    return update_local_tld_file(file_name)
+    old_tlds = set(local[1]) if local is not None else set()
+    return TldUpdate(
+        "File created successfully",
+        0,
+        True,
+        last_updated,
+        sorted(set(tldss) - old_tlds),
+        sorted(old_tlds - set(tldss)),
+    )
 
 
 if __name__ == "__main__":
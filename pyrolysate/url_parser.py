@@ -1,30 +1,88 @@
 # Typing, type hints, and errors
-from typing import Generator
+from typing import Generator, Iterable
+
+# Standard library utilities
+import os
+import re
+from functools import partial
 
 # internal dependencies
-from pyrolysate.common import Shared
-from pyrolysate.update_tlds import get_tlds_from_local
+from pyrolysate.common import (
+    _ZIP,
+    ParseResults,
+    Shared,
+    decode_line,
+    iter_file,
+    iter_lines,
+)
 from pyrolysate.converter_async import async_support
-from pyrolysate.utils import load_tld_file
+from pyrolysate.parallel import (
+    can_split_file,
+    parse_parallel,
+    parse_zip_parallel,
+    ranges_to_csv_file,
+    ranges_to_json_file,
+)
+from pyrolysate.prefilter import Prefilter
+from pyrolysate.parse_cache import MISSING, CacheInfo, InternTable, ParseCache
+from pyrolysate.public_suffix import PublicSuffixList
+from pyrolysate.records import ParsedUrl, RecordBatch
+from pyrolysate.tld_index import TWO_PART_TLDS_LHS, TldIndex
+from pyrolysate.tld_registry import TldRegistry, tld_registry
+
+# Everything after the scheme, split in one left to right pass:
+# host, then ":port", path, "?query" and "#fragment", each ending where the next
+# one's delimiter first appears. An empty port ("example.com:") keeps the default.
+_URL_COMPONENTS = re.compile(
+    r"([^:/?#]*)(?::([^/?#]*))?([^?#]*)(?:\?([^#]*))?(?:#(.*))?", re.DOTALL
+)
+# Host and ":port" only, for when no field after the host was asked for
+_URL_AUTHORITY = re.compile(r"([^:/?#]*)(?::([^/?#]*))?")
+_TAIL_FIELDS = frozenset(("path", "query", "fragment"))
 
 
 class Url:
-    def __init__(self):
+    def __init__(
+        self,
+        public_suffixes: PublicSuffixList | None = None,
+        registry: TldRegistry | None = None,
+        cache_size: int | None = None,
+        host_cache_size: int | None = 4096,
+        prefilter: Prefilter | None = None,
+        intern_size: int | None = 1024,
+    ):
+        """
+        :param public_suffixes: optional Public Suffix List rules used to split hosts
+            of any depth, replacing the built-in two part TLD heuristic
+        :type public_suffixes: PublicSuffixList | None
+        :param registry: source of the TLD index when no tlds are passed in.
+            Defaults to the shared registry serving the project's local TLD file
+        :type registry: TldRegistry | None
+        :param cache_size: number of parse results to keep in an LRU cache keyed by
+            url and TLD version. No caching when None
+        :type cache_size: int | None
+        :param host_cache_size: number of hosts whose subdomain, second level domain
+            and top level domain split is kept in an LRU cache. No caching when None
+        :type host_cache_size: int | None
+        :param prefilter: cheap checks that batch and streaming parses run first, so
+            lines that can't be urls are counted and skipped instead of parsed
+        :type prefilter: Prefilter | None
+        :param intern_size: number of distinct schemes, ports and top level domains
+            shared between records, so large batches hold one copy of each. No
+            interning when None
+        :type intern_size: int | None
+        """
         self.shared = Shared()
+        self.public_suffixes = public_suffixes
+        self.registry = registry if registry is not None else tld_registry
+        self._cache = ParseCache(cache_size) if cache_size is not None else None
+        self.prefilter = prefilter
+        self._host_cache = (
+            ParseCache(host_cache_size) if host_cache_size is not None else None
+        )
+        self._intern = InternTable(intern_size) if intern_size is not None else None
         self.schemes_and_ports = {"https": "443", "http": "80"}
-        self.two_part_tlds_lhs = [
-            "gov",
-            "co",
-            "com",
-            "org",
-            "net",
-            "ac",
-            "edu",
-            "net",
-            "or",
-            "ne",
-            "go",
-        ]
+        self.two_part_tlds_lhs = list(TWO_PART_TLDS_LHS)
         self.header = [
             "url",
             "scheme",
@@ -41,210 +99,518 @@ class Url:
             details[field] for field in self.header[1:]
         ]
 
+    def _screen(self, urls: Iterable) -> Iterable:
+        """Replaces lines rejected by the prefilter with None"""
+        if self.prefilter is None:
+            return urls
+        return self.prefilter.screen(urls)
+
+    def _get_tld_index(self, tlds: TldIndex | list[str] | None) -> TldIndex | None:
+        """Compiles custom tlds into an index or takes the registry's current index
+        :param tlds: custom list or index of top level domains
+        :type tlds: TldIndex | list[str] | None
+        :return: index of top level domains, None if the local TLD file can't be read
+        :rtype: TldIndex | None
+        """
+        if tlds is not None:
+            return TldIndex.from_tlds(tlds)
+        return self.registry.index
+
     @async_support
     def parse_url(
-        self, url_string: str, tlds: list[str] | None = None
+        self, url_string: str, tlds: TldIndex | list[str] | None = None
     ) -> dict[str, dict[str, str]] | None:
         """Parses url addresses into component parts
         :param url_string: A string containing a url
         :type url_string: str
-        :param tlds: custom or up-to-date list of all current top level domains
-        :type tlds: list[str] | None
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
         :return: dictionary containing url parsed into sub-parts
         :rtype: dict[str, dict[str, str]] | None
         """
-        if not isinstance(url_string, str) or len(url_string) == 0:
+        record = self.parse_url_record(url_string, tlds)
+        if record is None:
             return None
-        ip_present = False
-        url_string = url_string.lower()
-        temp_url_string = url_string
+        return record.to_dict()
 
-        url_dict = {url_string: self.empty_dict.copy()}
+    @async_support
+    def parse_url_record(
+        self,
+        url_string: str | bytes | memoryview,
+        tlds: TldIndex | list[str] | None = None,
+        fields: list[str] | None = None,
+    ) -> ParsedUrl | None:
+        """Parses url addresses into a compact record of component parts
+        :param url_string: A string containing a url, or a bytes-like line holding
+            one, which is decoded to str before parsing
+        :type url_string: str | bytes | memoryview
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param fields: fields the caller needs. Path, query and fragment are left
+            empty unless one of them is requested. Every field when None
+        :type fields: list[str] | None
+        :return: record of the url's sub-parts, with every part empty if the url
+            doesn't end in a known top level domain
+        :rtype: ParsedUrl | None
+        """
+        if not isinstance(url_string, str):
+            url_string = decode_line(url_string)
+            if url_string is None:
+                return None
+        if len(url_string) == 0:
+            return None
+        tlds = self._get_tld_index(tlds)
         if tlds is None:
-            TLD_FILE = load_tld_file()
-            res = get_tlds_from_local(TLD_FILE)
-            if res is None:
+            return None
+        tail = fields is None or not _TAIL_FIELDS.isdisjoint(fields)
+        if self._cache is None or tlds.version is None:
+            # Unversioned custom TLDs can't be told apart, so they bypass the cache
+            return self._parse_url_record(url_string, tlds, tail)
+        key = (url_string, tlds.version) if tail else (url_string, tlds.version, tail)
+        record = self._cache.get(key)
+        if record is MISSING:
+            record = self._parse_url_record(url_string, tlds, tail)
+            self._cache.put(key, record)
+        return record
+
+    def _parse_url_record(
+        self, url_string: str, tlds: TldIndex, tail: bool = True
+    ) -> ParsedUrl | None:
+        """Parses a url without consulting the cache
+        :param url_string: A string containing a url
+        :type url_string: str
+        :param tlds: index of all current top level domains
+        :type tlds: TldIndex
+        :param tail: whether to split out the path, query and fragment
+        :type tail: bool
+        :return: record of the url's sub-parts
+        :rtype: ParsedUrl | None
+        """
+        url_string = url_string.lower()
+        components = self._scan_url(url_string, tail)
+        if components is None:
+            return None
+        scheme, host, port, path, query, fragment = components
+
+        if self._host_cache is None or tlds.version is None:
+            domain_parts = self._split_host(host, tlds)
+        else:
+            # Urls that only differ in path, query or fragment share a host
+            key = (host, tlds.version)
+            domain_parts = self._host_cache.get(key)
+            if domain_parts is MISSING:
+                domain_parts = self._split_host(host, tlds)
+                self._host_cache.put(key, domain_parts)
+        if domain_parts is None:
+            return ParsedUrl(url_string)
+        subdomain, second_level_domain, top_level_domain = domain_parts
+        if self._intern is not None:
+            # Low cardinality fields, each freshly sliced from its url
+            intern = self._intern
+            scheme = intern(scheme)
+            port = intern(port)
+            top_level_domain = intern(top_level_domain)
+        return ParsedUrl(
+            url_string,
+            scheme,
+            subdomain,
+            second_level_domain,
+            top_level_domain,
+            port,
+            path,
+            query,
+            fragment,
+        )
+
+    def cache_info(self) -> CacheInfo | None:
+        """Statistics of the parse cache
+        :return: hits, misses, evictions and sizes, None if caching is off
+        :rtype: CacheInfo | None
+        """
+        return None if self._cache is None else self._cache.info()
+
+    def host_cache_info(self) -> CacheInfo | None:
+        """Statistics of the host split cache
+        :return: hits, misses, evictions and sizes, None if caching is off
+        :rtype: CacheInfo | None
+        """
+        return None if self._host_cache is None else self._host_cache.info()
+
+    def cache_clear(self) -> None:
+        """Empties the parse and host caches and resets their statistics
+        The intern table is emptied too, so it can fill with a new vocabulary.
+        """
+        if self._cache is not None:
+            self._cache.clear()
+        if self._host_cache is not None:
+            self._host_cache.clear()
+        if self._intern is not None:
+            self._intern.clear()
+
+    def _scan_url(
+        self, url_string: str, tail: bool = True
+    ) -> tuple[str, str, str, str, str, str] | None:
+        """Finds the component boundaries of a url in one left to right pass
+        Past the scheme, a single match of _URL_COMPONENTS walks the url once and
+        every component is sliced out of it exactly once.
+        :param url_string: lowercase url
+        :type url_string: str
+        :param tail: whether to scan past the host and port. When False the path,
+            query and fragment are returned empty
+        :type tail: bool
+        :return: scheme, host, port, path, query and fragment, None for an
+            unsupported scheme
+        :rtype: tuple[str, str, str, str, str, str] | None
+        """
+        scheme = ""
+        port = ""
+        start = 0
+        separator = url_string.find("://")
+        if separator != -1:
+            scheme = url_string[:separator]
+            port = self.schemes_and_ports.get(scheme)
+            if port is None:
                 return None
-            _, tlds = res
-        scheme = url_string.split("://")[0]
-        if "://" in url_string and scheme not in self.schemes_and_ports.keys():
+            start = separator + 3
+
+        if not tail:
+            host, explicit_port = _URL_AUTHORITY.match(url_string, start).groups()
+            return scheme, host, explicit_port or port, "", "", ""
+        host, explicit_port, path, query, fragment = _URL_COMPONENTS.match(
+            url_string, start
+        ).groups()
+        if explicit_port:
+            port = explicit_port
+        return (
+            scheme,
+            host,
+            port,
+            path.strip("/"),
+            query or "",
+            fragment or "",
+        )
+
+    def _split_host(self, host: str, tlds: TldIndex) -> tuple[str, str, str] | None:
+        """Splits a host into subdomain, second level domain and top level domain
+        :param host: lowercase host without scheme, port or path
+        :type host: str
+        :param tlds: index of all current top level domains
+        :type tlds: TldIndex
+        :return: subdomain, second level domain and top level domain, None if the
+            host doesn't end in a known top level domain. IPv4 hosts are returned
+            whole as the top level domain
+        :rtype: tuple[str, str, str] | None
+        """
+        labels = host.split(".")
+        if (
+            host[-1:].isdecimal()
+            and len(labels) == 4
+            and all(label.isdecimal() and int(label) <= 255 for label in labels)
+        ):
+            # 192.168.1.1
+            return "", "", host
+
+        if self.public_suffixes is not None:
+            # Hosts of any depth are split by the public suffix rules, but the
+            # rightmost label must still be a known top level domain
+            domain_parts = self.public_suffixes.split_host(host)
+            if domain_parts is None or labels[-1] not in tlds:
+                return None
+            return domain_parts
+
+        if "" in labels:
             return None
-        if scheme in self.schemes_and_ports.keys():
-            url_dict[url_string]["scheme"], temp_url_string = url_string.split("://")
-            url_dict[url_string]["port"] = self.schemes_and_ports[
-                url_dict[url_string]["scheme"]
-            ]
-
-        if ":" in temp_url_string:
-            domain_port_etc = temp_url_string.split(":")
-            port_etc = domain_port_etc[1].split("/")
-            url_dict[url_string]["port"] = port_etc[0]
-            port_etc.append("")
-            temp_url_string = domain_port_etc[0] + "/" + "/".join(port_etc[1:])
-
-        parts = temp_url_string.split("/")
-        parts = parts[0].split(".")
-        if all(part.isdigit() and 0 <= int(part) <= 255 for part in parts[:4]):
-            ip_present = True
-            url_dict[url_string]["top_level_domain"] = ".".join(parts[:4])
-
-        if ip_present is False and not any(tld in url_string for tld in tlds):
-            url_dict[url_string]["scheme"] = ""
-            url_dict[url_string]["port"] = ""
-            return url_dict
-
-        temp = temp_url_string.split(".")
-        match len(temp):
-            case 2:
-                # example.org or example.org/directory
-                tld_and_dir = temp[1].split("/")
-                if tld_and_dir[0] in tlds:
-                    url_dict[url_string]["second_level_domain"] = temp[0]
-                    url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
-            case 3:
-                tld_and_dir = temp[2].split("/")
-                if tld_and_dir[0] in tlds:
-                    if temp[1] in self.two_part_tlds_lhs:
-                        # example.gov.bs or example.gov.bs/directory
-                        url_dict[url_string]["second_level_domain"] = temp[0]
-                        url_dict[url_string]["top_level_domain"] = ".".join(
-                            [temp[1], tld_and_dir[0]]
-                        )
-                    else:
-                        # www.example.com or www.example.com/directory
-                        url_dict[url_string]["subdomain"] = temp[0]
-                        url_dict[url_string]["second_level_domain"] = temp[1]
-                        url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
-                else:
-                    # example.org/directory.txt
-                    if temp[1].split("/")[0] in tlds:
-                        url_dict[url_string]["second_level_domain"] = temp[0]
-                        temp = ".".join(temp[1:]).split("/")
-                        url_dict[url_string]["top_level_domain"] = temp[0]
-                        tld_and_dir = temp[:]
-            case 4:
-                tld_and_dir = ".".join(temp[2:]).split("/")
-                if tld_and_dir[0] in tlds and temp[1] in self.two_part_tlds_lhs:
-                    # example.gov.bs/directory.xhtml
-                    url_dict[url_string]["second_level_domain"] = temp[0]
-                    url_dict[url_string][
-                        "top_level_domain"
-                    ] = f"{temp[1]}.{tld_and_dir[0]}"
-                elif tld_and_dir[0] in tlds:
-                    # www.example.org/directory.xhtml
-                    url_dict[url_string]["subdomain"] = temp[0]
-                    url_dict[url_string]["second_level_domain"] = temp[1]
-                    url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
-                else:
-                    # www.bahamas.gov.bs/directory
-                    temp_tld = tld_and_dir[0].split(".")
-                    if temp_tld[0] in self.two_part_tlds_lhs and temp_tld[1] in tlds:
-                        url_dict[url_string]["subdomain"] = temp[0]
-                        url_dict[url_string]["second_level_domain"] = temp[1]
-                        url_dict[url_string]["top_level_domain"] = tld_and_dir[0]
-            case 5:
-                tld_and_dir = ".".join(temp[3:]).split("/")
-                if all(tld in tlds for tld in [temp[2], tld_and_dir[0]]):
-                    # www.example.gov.bs/directory.xhtml
-                    url_dict[url_string]["subdomain"] = temp[0]
-                    url_dict[url_string]["second_level_domain"] = temp[1]
-                    url_dict[url_string]["top_level_domain"] = ".".join(
-                        [temp[2], tld_and_dir[0]]
-                    )
-            case _:
-                url_dict[url_string]["scheme"] = ""
-                url_dict[url_string]["port"] = ""
-                return url_dict
-
-        if url_dict[url_string]["top_level_domain"] == "":
-            url_dict[url_string]["scheme"] = ""
-            url_dict[url_string]["port"] = ""
-            return url_dict
-
-        path_query_fragment = "/".join(tld_and_dir[1:])
-        if "?" not in path_query_fragment and "#" not in path_query_fragment:
-            path = path_query_fragment.strip("/")
-            url_dict[url_string]["path"] = path
-
-        elif "?" in path_query_fragment:
-            path_query = [value.strip("/") for value in path_query_fragment.split("?")]
-            url_dict[url_string]["path"] = path_query[0]
-            if "#" in path_query[1]:
-                fragment = path_query[1].split("#")
-                url_dict[url_string]["query"] = fragment[0]
-                if len(fragment) >= 2:
-                    url_dict[url_string]["fragment"] = "".join(fragment[1:])
-            elif len(path_query) >= 2:
-                url_dict[url_string]["query"] = "".join(path_query[1:])
-        elif "#" in path_query_fragment:
-            fragment = [value.strip("/") for value in path_query_fragment.split("#")]
-            url_dict[url_string]["path"] = fragment[0]
-            if len(fragment) >= 2:
-                url_dict[url_string]["fragment"] = "".join(fragment[1:])
-        return url_dict
+        suffix_length = tlds.suffix_length(labels, self.two_part_tlds_lhs)
+        if suffix_length == 0 or suffix_length >= len(labels):
+            return None
+        # example.org, www.example.org or any deeper subdomain
+        split = len(labels) - suffix_length
+        return (
+            ".".join(labels[: split - 1]),
+            labels[split - 1],
+            ".".join(labels[split:]),
+        )
 
     def parse_url_array(
-        self, urls: list[str], tlds: list[str] | None = None
-    ) -> dict[str, dict[str, str]] | None:
+        self, urls: list[str], tlds: TldIndex | list[str] | None = None
+    ) -> ParseResults | None:
         """Parses each url in an array
         :param urls: list of urls
         :type urls: list[str]
-        :return: parsed list of urls in a dictionary
-        :rtype: dict[str, dict[str, str]] | None
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :return: parsed list of urls in a dictionary, stamped with the TLD version
+        :rtype: ParseResults | None
         """
-        if not urls or all(item == "" for item in urls) or not isinstance(urls, list):
+        if not isinstance(urls, list) or not urls:
             return None
-        results = self._parse_url_array(urls, tlds)
-        if results is None:
+        # Resolved once so the whole batch uses one TLD version
+        tlds = self._get_tld_index(tlds)
+        if tlds is None:
             return None
+        results = self._parse_url_array(urls, tlds)
 
-        url_array = {}
+        url_array = ParseResults(tld_version=tlds.version)
         for result in results:
             if result is None:
                 continue
-            url_array.update(result)
+            url_array.update(result.to_dict())
 
         if url_array == {}:
             return None
         return url_array
 
-    def _parse_url_array(
-        self, urls: list[str], tlds: list[str] | None = None
-    ) -> Generator[dict[str, dict[str, str]], None, None] | None:
-        """Parses each url in an array
+    def parse_url_batch(
+        self,
+        urls: Iterable[str],
+        tlds: TldIndex | list[str] | None = None,
+        fields: list[str] | None = None,
+    ) -> RecordBatch | None:
+        """Parses a batch of urls, keeping every input position including duplicates
+        Each distinct url is parsed once and its record shared by all its positions.
+        :param urls: urls to parse
+        :type urls: Iterable[str]
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param fields: fields the caller needs, see parse_url_record
+        :type fields: list[str] | None
+        :return: record for each url in input order, None for urls that can't be
+            parsed, with the occurrences of each url and the TLD version used
+        :rtype: RecordBatch | None
+        """
+        self.shared._columns(self.header, fields)
+        tlds = self._get_tld_index(tlds)
+        if tlds is None:
+            return None
+        records, counts = self.shared._to_batch(
+            lambda url: self.parse_url_record(url, tlds, fields),
+            urls,
+            self.prefilter,
+        )
+        return RecordBatch(records, counts, tlds.version)
+
+    def parse_url_columnar(
+        self,
+        urls: list[str],
+        tlds: TldIndex | list[str] | None = None,
+        fields: list[str] | None = None,
+    ) -> ParseResults | None:
+        """Parses each url in an array into one list per field of Url.header
         :param urls: list of urls
         :type urls: list[str]
-        :return: parsed list of urls in a dictionary
-        :rtype: dict[str, dict[str, str]] | None
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param fields: fields to return besides "url". Every field when None
+        :type fields: list[str] | None
+        :return: columns keyed by field, each with one value per url. Urls that can't
+            be parsed keep their input in the "url" column and None in the rest
+        :rtype: ParseResults | None
         """
-        if not urls or all(item == "" for item in urls) or not isinstance(urls, list):
+        columns = self.shared._columns(self.header, fields)
+        if not isinstance(urls, list) or not urls:
             return None
+        tlds = self._get_tld_index(tlds)
+        if tlds is None:
+            return None
+        return self.shared._to_columnar(
+            self.header,
+            urls,
+            (self.parse_url_record(url, tlds, fields) for url in self._screen(urls)),
+            ParseResults(tld_version=tlds.version),
+            columns,
+        )
 
+    def _parse_url_array(
+        self,
+        urls: Iterable[str],
+        tlds: TldIndex | list[str] | None = None,
+        fields: list[str] | None = None,
+    ) -> Generator[ParsedUrl | None, None, None]:
+        """Parses each url in an array
+        :param urls: list of urls
+        :type urls: Iterable[str]
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param fields: fields the caller needs, see parse_url_record
+        :type fields: list[str] | None
+        :return: record for each url, None for urls that can't be parsed
+        :rtype: Generator[ParsedUrl | None, None, None]
+        """
+        tlds = self._get_tld_index(tlds)
         if tlds is None:
-            TLD_FILE = load_tld_file()
-            res = get_tlds_from_local(TLD_FILE)
-            if res is None:
-                return None
-            _, tlds = res
+            return
+
+        for url in self._screen(urls):
+            # None is what the parse would return, without the call
+            yield None if url is None else self.parse_url_record(url, tlds, fields)
+
+    def iter_parse(
+        self,
+        urls: Iterable[str],
+        tlds: TldIndex | list[str] | None = None,
+        fields: list[str] | None = None,
+    ) -> Generator[ParsedUrl | None, None, None]:
+        """Lazily parses urls from any iterable, holding one url at a time
+        Surrounding whitespace is stripped, so an open file can be passed as is.
+        :param urls: urls, e.g. a generator, iterator or file object
+        :type urls: Iterable[str]
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param fields: fields the caller needs, see parse_url_record
+        :type fields: list[str] | None
+        :return: record for each url, None for urls that can't be parsed
+        :rtype: Generator[ParsedUrl | None, None, None]
+        """
+        self.shared._columns(self.header, fields)
+        yield from self._parse_url_array(iter_lines(urls), tlds, fields)
+
+    def parse_url_parallel(
+        self,
+        urls: Iterable[str],
+        tlds: TldIndex | list[str] | None = None,
+        workers: int | None = None,
+        chunk_size: int = 10_000,
+        fields: list[str] | None = None,
+    ) -> Generator[ParsedUrl | None, None, None]:
+        """Parses urls in chunks across worker processes
+        Each worker builds its parser and receives the TLD index once, and results
+        come back in input order with a bounded number of chunks in flight.
+        :param urls: urls to parse
+        :type urls: Iterable[str]
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param workers: number of worker processes. Defaults to the number of CPUs
+        :type workers: int | None
+        :param chunk_size: urls sent to a worker per task
+        :type chunk_size: int
+        :param fields: fields the caller needs, see parse_url_record
+        :type fields: list[str] | None
+        :return: record for each url, None for urls that can't be parsed
+        :rtype: Generator[ParsedUrl | None, None, None]
+        """
+        tlds = self._get_tld_index(tlds)
+        if tlds is None:
+            return
+        # Rejected lines are screened here and sent on as None, which workers skip
+        yield from parse_parallel(
+            Url,
+            self._worker_options(),
+            "parse_url_record",
+            (tlds, fields),
+            self._screen(urls),
+            workers,
+            chunk_size,
+        )
+
+    def parse_url_zip(
+        self,
+        input_file_name: str,
+        tlds: TldIndex | list[str] | None = None,
+        workers: int | None = None,
+        ordered: bool = False,
+        delimiter: str = "\n",
+        chunk_size: int = 10_000,
+        fields: list[str] | None = None,
+    ) -> Generator[tuple[str, ParsedUrl | None], None, None]:
+        """Parses the .txt, .csv and .log members of a ZIP file, streaming each one
+        Members are decompressed block by block, so no member is held in memory as
+        a whole. With workers, each worker process opens the archive itself and
+        parses whole members, several at a time. A prefilter with an on_reject
+        callback keeps the parse in this process, so the callback sees every line.
+        :param input_file_name: path of the ZIP file
+        :type input_file_name: str
+        :param tlds: custom or up-to-date list or index of all current top level domains
+        :type tlds: TldIndex | list[str] | None
+        :param workers: number of worker processes. Parsed in this process when None
+        :type workers: int | None
+        :param ordered: keep archive order when parsing in workers. Otherwise
+            records are yielded as soon as a worker has parsed them
+        :type ordered: bool
+        :param delimiter: item separator
+        :type delimiter: str
+        :param chunk_size: urls a worker parses before sending them back
+        :type chunk_size: int
+        :param fields: fields the caller needs, see parse_url_record
+        :type fields: list[str] | None
+        :return: member name and record for each url, None for urls that can't be
+            parsed
+        :rtype: Generator[tuple[str, ParsedUrl | None], None, None]
+        """
+        self.shared._columns(self.header, fields)
+        tlds = self._get_tld_index(tlds)
+        if tlds is None:
+            return
+        if workers is None or (
+            self.prefilter is not None and self.prefilter.on_reject is not None
+        ):
+            for member_name, lines in _ZIP._iter_zip_members(
+                input_file_name, delimiter, 1 << 20
+            ):
+                for record in self._parse_url_array(lines, tlds, fields):
+                    yield member_name, record
+            return
+        yield from parse_zip_parallel(
+            Url,
+            self._worker_options(),
+            "parse_url_record",
+            (tlds, fields),
+            self.prefilter,
+            input_file_name,
+            delimiter,
+            workers,
+            ordered,
+            chunk_size,
+        )
+
+    def _worker_options(self) -> dict:
+        """Keyword arguments that rebuild this parser in a worker process"""
+        return {
+            "public_suffixes": self.public_suffixes,
+            "cache_size": None if self._cache is None else self._cache.maxsize,
+            "host_cache_size": (
+                None if self._host_cache is None else self._host_cache.maxsize
+            ),
+            "intern_size": None if self._intern is None else self._intern.maxsize,
+        }
+
+    def _array_parser(self, workers: int | None, fields: list[str] | None):
+        def parse(urls):
+            if not isinstance(urls, list):
+                urls = iter_lines(urls)
+            if workers is None:
+                return self._parse_url_array(urls, fields=fields)
+            return self.parse_url_parallel(urls, workers=workers, fields=fields)
 
-        for url in urls:
-            yield self.parse_url(url, tlds)
+        return parse
 
-    def to_json(self, urls: list[str] | str, prettify=True) -> str | None:
+    def to_json(
+        self, urls: list[str] | str, prettify=True, fields: list[str] | None = None
+    ) -> str | None:
         """Creates a JSON string representation of URLs.
         :param urls: A list of URLs or a single URL string.
         :type urls: list[str] | str
         :param prettify: Whether to format the JSON output with indentation for readability.
         :type prettify: bool, optional (default is True)
+        :param fields: Fields to parse and output for each URL. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A JSON string of the parsed URLs or None if the input is invalid or empty.
         :rtype: str | None
         """
         return self.shared._to_json(
-            self.parse_url, self._parse_url_array, urls, prettify
+            partial(self.parse_url_record, fields=fields),
+            self._array_parser(None, fields),
+            urls,
+            prettify,
+            self.shared._columns(self.header, fields),
         )
 
     def to_json_file(
-        self, file_name: str, urls: list[str], prettify: bool = True
+        self,
+        file_name: str,
+        urls: list[str],
+        prettify: bool = True,
+        workers: int | None = None,
+        fields: list[str] | None = None,
     ) -> tuple[str, int]:
         """Writes parsed URLs to a JSON file.
         :param file_name: The name of the file (without extension) to write the JSON data.
@@ -253,44 +619,189 @@ class Url:
         :type urls: list[str]
         :param prettify: Whether to format the JSON output with indentation for readability.
         :type prettify: bool, optional (default is True)
+        :param workers: Number of processes to parse with. Parses serially when None.
+        :type workers: int | None, optional (default is None)
+        :param fields: Fields to parse and output for each URL. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A tuple containing the file name with extension and an int. 0 for a pass, 1 for a fail.
         :rtype: tuple[str, int]
         """
         return self.shared._to_json_file(
-            self.parse_url, self._parse_url_array, file_name, urls, prettify
+            partial(self.parse_url_record, fields=fields),
+            self._array_parser(workers, fields),
+            file_name,
+            urls,
+            prettify,
+            self.shared._columns(self.header, fields),
         )
 
-    def to_csv(self, urls: list[str] | str) -> str | None:
+    def to_csv(
+        self, urls: list[str] | str, fields: list[str] | None = None
+    ) -> str | None:
         """Creates a CSV string representation of URLs.
         :param urls: A list of URLs or a single URL string.
         :type urls: list[str] | str
+        :param fields: Fields to parse and output for each URL. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A CSV string of the parsed URLs or None if the input is invalid or empty.
         :rtype: str | None
         """
         return self.shared._to_csv(
             self.header,
-            self.field_generator,
-            self.parse_url,
-            self._parse_url_array,
+            partial(self.parse_url_record, fields=fields),
+            self._array_parser(None, fields),
             urls,
+            self.shared._columns(self.header, fields),
         )
 
-    def to_csv_file(self, file_name, urls: list[str] | str) -> tuple[str, int]:
+    def to_csv_file(
+        self,
+        file_name,
+        urls: list[str] | str,
+        workers: int | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[str, int]:
         """Writes parsed URLs to a CSV file.
         :param file_name: The name of the file (without extension) to write the CSV data.
         :type file_name: str
         :param urls: A list of URLs or a single URL string to parse and write to the file.
         :type urls: list[str] | str
+        :param workers: Number of processes to parse with. Parses serially when None.
+        :type workers: int | None, optional (default is None)
+        :param fields: Fields to parse and output for each URL. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
         :return: A tuple containing the file name with extension and an int. 0 for a pass, 1 for a fail.
         :rtype: tuple[str, int]
         """
         return self.shared._to_csv_file(
             self.header,
-            self.field_generator,
-            self.parse_url,
-            self._parse_url_array,
+            partial(self.parse_url_record, fields=fields),
+            self._array_parser(workers, fields),
             file_name,
             urls,
+            self.shared._columns(self.header, fields),
+        )
+
+    def file_to_json_file(
+        self,
+        file_name: str,
+        input_file_name: str,
+        prettify: bool = True,
+        workers: int | None = None,
+        delimiter: str = "\n",
+        fields: list[str] | None = None,
+        encoding: str | None = None,
+    ) -> tuple[str, int]:
+        """Parses a file of URLs and writes them to a JSON file.
+        Plain files are split into byte ranges that worker processes read, parse
+        and serialize on their own; the parts are merged in order into the file
+        to_json_file writes for the same URLs. Compressed files, a single worker
+        and prefilters with an on_reject callback stream through to_json_file.
+        :param file_name: The name of the file (without extension) to write the JSON data.
+        :type file_name: str
+        :param input_file_name: Plain or compressed file of URLs, as for iter_file.
+        :type input_file_name: str
+        :param prettify: Whether to format the JSON output with indentation for readability.
+        :type prettify: bool, optional (default is True)
+        :param workers: Number of processes to parse with. Defaults to the number of CPUs.
+        :type workers: int | None, optional (default is None)
+        :param delimiter: Separator between URLs in the input file.
+        :type delimiter: str, optional (default is "\\n")
+        :param fields: Fields to parse and output for each URL. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
+        :param encoding: Encoding of the input file, as for iter_file.
+        :type encoding: str | None, optional (default is None)
+        :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+        :rtype: tuple[str, int]
+        """
+        columns = self.shared._columns(self.header, fields)
+        if not isinstance(input_file_name, str) or not os.path.isfile(input_file_name):
+            return "Failed to write file", 1
+        if not can_split_file(
+            input_file_name, delimiter, workers, self.prefilter, encoding
+        ):
+            return self.to_json_file(
+                file_name,
+                iter_file(input_file_name, delimiter, encoding=encoding),
+                prettify,
+                workers,
+                fields,
+            )
+        tlds = self._get_tld_index(None)
+        if tlds is None:
+            return "Failed to write file", 1
+        return ranges_to_json_file(
+            Url,
+            self._worker_options(),
+            "parse_url_record",
+            (tlds, fields),
+            self.prefilter,
+            file_name,
+            input_file_name,
+            delimiter,
+            workers,
+            prettify,
+            columns,
+            encoding,
+        )
+
+    def file_to_csv_file(
+        self,
+        file_name: str,
+        input_file_name: str,
+        workers: int | None = None,
+        delimiter: str = "\n",
+        fields: list[str] | None = None,
+        encoding: str | None = None,
+    ) -> tuple[str, int]:
+        """Parses a file of URLs and writes them to a CSV file.
+        Plain files are split into byte ranges that worker processes read, parse
+        and serialize on their own; the parts are joined in order into the file
+        to_csv_file writes for the same URLs. Compressed files, a single worker
+        and prefilters with an on_reject callback stream through to_csv_file.
+        :param file_name: The name of the file (without extension) to write the CSV data.
+        :type file_name: str
+        :param input_file_name: Plain or compressed file of URLs, as for iter_file.
+        :type input_file_name: str
+        :param workers: Number of processes to parse with. Defaults to the number of CPUs.
+        :type workers: int | None, optional (default is None)
+        :param delimiter: Separator between URLs in the input file.
+        :type delimiter: str, optional (default is "\\n")
+        :param fields: Fields to parse and output for each URL. Every field when None.
+        :type fields: list[str] | None, optional (default is None)
+        :param encoding: Encoding of the input file, as for iter_file.
+        :type encoding: str | None, optional (default is None)
+        :return: A tuple containing a message and an int. 0 for a pass, 1 for a fail.
+        :rtype: tuple[str, int]
+        """
+        columns = self.shared._columns(self.header, fields)
+        if not isinstance(input_file_name, str) or not os.path.isfile(input_file_name):
+            return "Failed to write file", 1
+        if not can_split_file(
+            input_file_name, delimiter, workers, self.prefilter, encoding
+        ):
+            return self.to_csv_file(
+                file_name,
+                iter_file(input_file_name, delimiter, encoding=encoding),
+                workers,
+                fields,
+            )
+        tlds = self._get_tld_index(None)
+        if tlds is None:
+            return "Failed to write file", 1
+        return ranges_to_csv_file(
+            Url,
+            self._worker_options(),
+            "parse_url_record",
+            (tlds, fields),
+            self.prefilter,
+            self.header,
+            file_name,
+            input_file_name,
+            delimiter,
+            workers,
+            columns,
+            encoding,
         )
 
 
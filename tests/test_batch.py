@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import unittest
+from pyrolysate import RecordBatch, TldIndex, email, iter_file, url
+
+
+class TestUrlBatch(unittest.TestCase):
+    def test_keeps_every_position(self):
+        """Test that duplicates keep their own position in the batch"""
+        urls = ["example.com", "ftp://example.com", "example.com", "example.org"]
+        batch = url.parse_url_batch(urls)
+        self.assertIsInstance(batch, RecordBatch)
+        self.assertEqual(batch.records, [url.parse_url_record(u) for u in urls])
+        self.assertEqual(
+            batch.counts, {"example.com": 2, "ftp://example.com": 1, "example.org": 1}
+        )
+        self.assertEqual(batch.duplicates, 1)
+
+    def test_unique_inputs_parsed_once(self):
+        """Test that each distinct url is parsed only once"""
+        batch = url.parse_url_batch(["https://example.com/a"] * 3)
+        self.assertIs(batch.records[0], batch.records[2])
+
+    def test_tld_version(self):
+        """Test that the batch is stamped with the TLD version used"""
+        tlds = TldIndex(["com"], version="custom")
+        self.assertEqual(
+            url.parse_url_batch(["example.com"], tlds).tld_version, "custom"
+        )
+
+    def test_accepts_iterables(self):
+        """Test that a generator can be passed as the batch"""
+        batch = url.parse_url_batch(u for u in ["example.com", "example.com"])
+        self.assertEqual(len(batch.records), 2)
+
+
+class TestEmailBatch(unittest.TestCase):
+    def test_keeps_every_position(self):
+        """Test that duplicate emails keep their own position in the batch"""
+        emails = ["user@example.com", "bad", "user@example.com"]
+        batch = email.parse_email_batch(emails)
+        self.assertEqual(batch.records, [email.parse_email_record(e) for e in emails])
+        self.assertEqual(batch.counts, {"user@example.com": 2, "bad": 1})
+        self.assertEqual(batch.duplicates, 1)
+        self.assertIsNone(batch.tld_version)
+
+
+class TestDuplicateJsonKeys(unittest.TestCase):
+    def test_url_json_keys_unique(self):
+        """Test that repeated urls are written to JSON once"""
+        result = url.to_json(["example.com", "example.org", "EXAMPLE.com"], False)
+        pairs = json.loads(result, object_pairs_hook=lambda pairs: pairs)
+        self.assertEqual([key for key, _ in pairs], ["example.com", "example.org"])
+
+    def test_email_json_keys_unique(self):
+        """Test that repeated emails are written to JSON once"""
+        result = email.to_json(["user@example.com"] * 3)
+        self.assertEqual(result.count('"user@example.com"'), 1)
+
+    def test_stream_json_keys_unique(self):
+        """Test that a generator is deduplicated like a list"""
+        urls = ["example.com", "example.org", "example.com"]
+        result = url.to_json((u for u in urls), False)
+        self.assertEqual(result, url.to_json(urls, False))
+        pairs = json.loads(result, object_pairs_hook=lambda pairs: pairs)
+        self.assertEqual([key for key, _ in pairs], ["example.com", "example.org"])
+
+    def test_file_json_keys_unique(self):
+        """Test that a file read by iter_file or opened directly is deduplicated"""
+        emails = ["user@example.com", "bad", "other@example.com"] * 3
+        with tempfile.TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, "input.txt")
+            with open(input_file, "w") as file:
+                file.write("\n".join(emails))
+            email.to_json_file(os.path.join(directory, "listed"), emails)
+            email.to_json_file(
+                os.path.join(directory, "iterated"), iter_file(input_file)
+            )
+            with open(input_file) as file:
+                email.to_json_file(os.path.join(directory, "opened"), file)
+            with open(os.path.join(directory, "listed.json")) as file:
+                expected = file.read()
+            for name in ("iterated", "opened"):
+                with open(os.path.join(directory, f"{name}.json")) as file:
+                    self.assertEqual(file.read(), expected)
+        pairs = json.loads(expected, object_pairs_hook=lambda pairs: pairs)
+        self.assertEqual(
+            [key for key, _ in pairs], ["user@example.com", "other@example.com"]
+        )
+
+    def test_csv_keeps_duplicates(self):
+        """Test that CSV output keeps a row for every input"""
+        result = url.to_csv(["example.com", "example.com"])
+        self.assertEqual(len(result.splitlines()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from pyrolysate import Prefilter, Url, email, iter_buffer_lines, url
+from pyrolysate.common import decode_line
+
+
+class TestBufferLines(unittest.TestCase):
+    def test_splits_and_trims(self):
+        """Test that lines are trimmed views and blank lines are skipped"""
+        lines = list(iter_buffer_lines(b" a.com\r\n\n\t\nb.org  \nc.net"))
+        self.assertTrue(all(isinstance(line, memoryview) for line in lines))
+        self.assertEqual(
+            [bytes(line) for line in lines], [b"a.com", b"b.org", b"c.net"]
+        )
+
+    def test_custom_delimiter(self):
+        """Test that multi-byte delimiters split lines"""
+        lines = iter_buffer_lines(bytearray(b"a.com, b.org,,c.net"), b", ")
+        self.assertEqual([bytes(line) for line in lines], [b"a.com", b"b.org,,c.net"])
+
+    def test_empty_buffer(self):
+        """Test that an empty buffer yields nothing"""
+        self.assertEqual(list(iter_buffer_lines(b"")), [])
+
+    def test_decode_line(self):
+        """Test the ascii fast path, the utf-8 fallback and non bytes input"""
+        self.assertEqual(decode_line(memoryview(b"a.com")), "a.com")
+        self.assertEqual(decode_line("ü.com".encode()), "ü.com")
+        self.assertEqual(decode_line(b"bad\xff.com"), "bad�.com")
+        self.assertIsNone(decode_line(None))
+
+
+class TestBytesParsing(unittest.TestCase):
+    def test_url_bytes_match_str(self):
+        """Test that bytes-like urls parse to the same record as str"""
+        line = "https://www.example.com:8080/path?q=1#top"
+        expected = url.parse_url_record(line)
+        for entry in [
+            line.encode(),
+            bytearray(line.encode()),
+            memoryview(line.encode()),
+        ]:
+            self.assertEqual(url.parse_url_record(entry), expected)
+
+    def test_email_bytes_match_str(self):
+        """Test that bytes-like emails parse to the same record as str"""
+        line = "first.last+tag@mail.example.com"
+        expected = email.parse_email_record(line)
+        self.assertEqual(email.parse_email_record(memoryview(line.encode())), expected)
+
+    def test_buffer_lines_match_str_lines(self):
+        """Test that parsing a buffer gives the records of its decoded lines"""
+        text = "example.com\nnot a url\nhttps://data.gov.uk/a\nexample.com\n"
+        buffer = bytearray(text.encode())
+        expected = list(url.iter_parse(text.splitlines()))
+        self.assertEqual(list(url.iter_parse(iter_buffer_lines(buffer))), expected)
+        self.assertEqual(
+            url.to_csv(iter_buffer_lines(buffer)), url.to_csv(text.splitlines())
+        )
+
+    def test_batch_of_writable_views(self):
+        """Test that views into a writable buffer are counted by their text"""
+        buffer = bytearray(b"a.com\nb.org\na.com\n")
+        batch = url.parse_url_batch(iter_buffer_lines(buffer))
+        self.assertEqual(batch.counts, {"a.com": 2, "b.org": 1})
+        self.assertEqual(batch.records[0], batch.records[2])
+
+    def test_columnar_keeps_rejected_text(self):
+        """Test that rejected byte lines show up decoded in the first column"""
+        result = email.parse_email_columnar([b"a@b.com", memoryview(b"nope")])
+        self.assertEqual(result["email"], ["a@b.com", "nope"])
+        self.assertEqual(result["local"], ["a", None])
+
+
+class TestBytesPrefilter(unittest.TestCase):
+    def test_accepts_bytes(self):
+        """Test that bytes-like lines get the same verdict as str"""
+        prefilter = Prefilter.for_urls()
+        for line in ["example.com", "GET /index.html 200", "ftp://x.com", "a.b"]:
+            expected = prefilter.accepts(line)
+            for entry in [
+                line.encode(),
+                bytearray(line.encode()),
+                memoryview(line.encode()),
+            ]:
+                self.assertEqual(prefilter.accepts(entry), expected, entry)
+
+    def test_screen_bytes(self):
+        """Test that byte garbage is rejected before it is decoded"""
+        log_url = Url(prefilter=Prefilter.for_urls())
+        records = list(
+            log_url.iter_parse(iter_buffer_lines(b"example.com\nWARN queue\n"))
+        )
+        self.assertEqual(records[0].second_level_domain, "example")
+        self.assertIsNone(records[1])
+        self.assertEqual(log_url.prefilter.rejected, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
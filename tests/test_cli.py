@@ -0,0 +1,44 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+from pyrolysate.cli import main
+
+
+def run_cli(*args):
+    """Runs the CLI with args, returning (exit code, stdout, stderr)"""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    code = 0
+    with mock.patch("sys.argv", ["pyrolysate", *args]):
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                main()
+            except SystemExit as e:
+                code = e.code
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+class TestFieldsOption(unittest.TestCase):
+    def test_fields_with_spaces(self):
+        """Test that whitespace around field names is ignored"""
+        code, output, _ = run_cli(
+            "-u", "-c", "-f", " top_level_domain , port ", "example.com"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(output.splitlines()[0], "url,top_level_domain,port")
+
+    def test_unknown_field(self):
+        """Test that an unknown field name is reported as a usage error"""
+        code, _, error = run_cli("-e", "-j", "-f", "domain,bogus", "user@example.com")
+        self.assertEqual(code, 2)
+        self.assertIn("Unknown field(s): bogus", error)
+
+    def test_fields_need_json_or_csv(self):
+        """Test that fields are rejected for plain text output"""
+        code, _, error = run_cli("-u", "-f", "top_level_domain", "example.com")
+        self.assertEqual(code, 2)
+        self.assertIn("--fields only applies to JSON or CSV output", error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from pyrolysate import TldIndex, email, url
+
+
+class TestUrlColumnar(unittest.TestCase):
+    def test_columns_follow_header(self):
+        """Test that there is one column per header field"""
+        columns = url.parse_url_columnar(["example.com"])
+        self.assertEqual(list(columns), url.header)
+
+    def test_columns_line_up_with_input(self):
+        """Test that each column holds one value per input position"""
+        urls = ["https://www.example.com/a?q=1", "ftp://example.com", "example.org"]
+        columns = url.parse_url_columnar(urls)
+        self.assertEqual(
+            columns["url"],
+            ["https://www.example.com/a?q=1", "ftp://example.com", "example.org"],
+        )
+        self.assertEqual(columns["subdomain"], ["www", None, ""])
+        self.assertEqual(columns["second_level_domain"], ["example", None, "example"])
+        self.assertEqual(columns["query"], ["q=1", None, ""])
+        for field in url.header:
+            self.assertEqual(len(columns[field]), len(urls))
+
+    def test_matches_parse_url(self):
+        """Test that columnar values match parse_url for each input"""
+        urls = ["http://www.example.gov.bs:8080/x#y", "example.invalidtld"]
+        columns = url.parse_url_columnar(urls)
+        for position, entry in enumerate(urls):
+            details = url.parse_url(entry)[entry]
+            for field, value in details.items():
+                self.assertEqual(columns[field][position], value)
+
+    def test_tld_version(self):
+        """Test that the columns are stamped with the TLD version used"""
+        tlds = TldIndex(["com"], version="custom")
+        self.assertEqual(
+            url.parse_url_columnar(["example.com"], tlds).tld_version, "custom"
+        )
+
+    def test_invalid_input(self):
+        """Test that empty or non-list input gives None"""
+        self.assertIsNone(url.parse_url_columnar([]))
+        self.assertIsNone(url.parse_url_columnar("example.com"))
+
+
+class TestEmailColumnar(unittest.TestCase):
+    def test_columns_line_up_with_input(self):
+        """Test that invalid emails keep their position with None fields"""
+        columns = email.parse_email_columnar(["user+tag@example.com", "bad"])
+        self.assertEqual(
+            columns,
+            {
+                "email": ["user+tag@example.com", "bad"],
+                "local": ["user", None],
+                "plus_address": ["tag", None],
+                "mail_server": ["example", None],
+                "domain": ["com", None],
+            },
+        )
+
+    def test_invalid_input(self):
+        """Test that empty or non-list input gives None"""
+        self.assertIsNone(email.parse_email_columnar([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
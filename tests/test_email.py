@@ -1,5 +1,5 @@
 import unittest
-from pyrolysate import email
+from pyrolysate import Email, TldIndex, TldRegistry, email, url
 
 
 class TestEmail(unittest.TestCase):
@@ -232,6 +232,28 @@ class TestEmail(unittest.TestCase):
             },
         )
 
+    def test_nested_comments(self):
+        """Nested comments are removed whole"""
+        result = email.parse_email_record("john(a(b)c)+tag@example(x).gov.bs")
+        self.assertEqual(
+            result, ("john+tag@example.gov.bs", "john", "tag", "example", "gov.bs")
+        )
+
+    def test_at_sign_in_comment(self):
+        """An @ inside a comment doesn't count as the separator"""
+        result = email.parse_email_record("john(at@home)@example.com")
+        self.assertEqual(result, ("john@example.com", "john", "", "example", "com"))
+        self.assertIsNone(email.parse_email_record("john(a@b)example.com"))
+
+    def test_unbalanced_parentheses(self):
+        """Unclosed or unopened comments are invalid"""
+        for address in ["john(work@example.com", "john)work(@example.com"]:
+            self.assertIsNone(email.parse_email_record(address), address)
+
+    def test_double_dot_in_comment(self):
+        """Consecutive periods are invalid inside comments too"""
+        self.assertIsNone(email.parse_email_record("john(a..b)@example.com"))
+
     def test_email_array_valid(self):
         """Test parsing array of valid emails"""
         emails = ["test1@example.com", "test2@domain.org"]
@@ -334,5 +356,51 @@ class TestEmail(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestValidateTld(unittest.TestCase):
+    def setUp(self):
+        self.email = Email(validate_tld=True)
+        self.tlds = TldIndex(["com", "bs", "org"], version="test")
+
+    def test_known_tlds_pass(self):
+        """Test that single and two part TLDs from the index are accepted"""
+        for address in ["user@example.com", "user@bahamas.gov.bs", " u@EXAMPLE.Org "]:
+            self.assertIsNotNone(
+                self.email.parse_email_record(address, self.tlds), address
+            )
+
+    def test_unknown_tlds_fail(self):
+        """Test that domains without a known TLD are rejected"""
+        for address in ["user@example.zz", "user@example", "user@gov.zz"]:
+            self.assertIsNone(
+                self.email.parse_email_record(address, self.tlds), address
+            )
+
+    def test_off_by_default(self):
+        """Test that any domain is accepted without validate_tld"""
+        self.assertIsNotNone(email.parse_email_record("user@example.zz"))
+
+    def test_same_domains_as_url(self):
+        """Test that Email accepts a domain exactly when Url finds its TLD"""
+        for domain in ["example.com", "bahamas.gov.bs", "example.zz", "gov.bs"]:
+            self.assertEqual(
+                self.email.parse_email_record(f"user@{domain}", self.tlds) is None,
+                url.parse_url_record(domain, self.tlds).top_level_domain == "",
+                domain,
+            )
+
+    def test_registry_index(self):
+        """Test that the registry's index is used when no tlds are passed"""
+        registry = TldRegistry()
+        validating = Email(validate_tld=True, registry=registry)
+        self.assertIsNotNone(validating.parse_email_record("user@example.com"))
+        self.assertIsNone(validating.parse_email_record("user@example.notatld"))
+
+    def test_cached_records_are_checked(self):
+        """Test that cached records are still checked against the given TLDs"""
+        cached = Email(cache_size=8, validate_tld=True)
+        self.assertIsNotNone(cached.parse_email_record("user@example.com", self.tlds))
+        self.assertIsNone(cached.parse_email_record("user@example.com", ["org"]))
+
+
 if __name__ == "__main__":
     unittest.main()
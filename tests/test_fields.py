@@ -0,0 +1,136 @@
+import json
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from pyrolysate import Url, email, url
+
+
+class TestUrlFields(unittest.TestCase):
+    def setUp(self):
+        self.urls = ["https://www.example.co.uk/a?q=1#top", "ftp://example.com"]
+        self.fields = ["top_level_domain", "second_level_domain"]
+
+    def test_csv_columns(self):
+        """Test that CSV output only has the requested columns, in that order"""
+        self.assertEqual(
+            url.to_csv(self.urls, fields=self.fields),
+            "url,top_level_domain,second_level_domain\r\n"
+            "https://www.example.co.uk/a?q=1#top,co.uk,example\r\n",
+        )
+
+    def test_json_fields(self):
+        """Test that JSON output only has the requested fields"""
+        for data in (self.urls, self.urls[0]):
+            result = json.loads(url.to_json(data, fields=self.fields))
+            self.assertEqual(
+                result,
+                {
+                    "https://www.example.co.uk/a?q=1#top": {
+                        "top_level_domain": "co.uk",
+                        "second_level_domain": "example",
+                    }
+                },
+            )
+
+    def test_path_not_scanned(self):
+        """Test that path, query and fragment are skipped when not requested"""
+        record = url.parse_url_record(self.urls[0], fields=self.fields)
+        self.assertEqual(record.port, "443")
+        self.assertEqual((record.path, record.query, record.fragment), ("", "", ""))
+        record = url.parse_url_record(self.urls[0], fields=["query"])
+        self.assertEqual(record.query, "q=1")
+
+    def test_explicit_port_without_path(self):
+        """Test that an explicit port is still found when the path is skipped"""
+        record = url.parse_url_record("example.com:8080/a", fields=["port"])
+        self.assertEqual(record.port, "8080")
+
+    def test_cache_keeps_full_records(self):
+        """Test that projected parses don't replace fully parsed cache entries"""
+        parser = Url(cache_size=8)
+        parser.parse_url_record(self.urls[0], fields=self.fields)
+        self.assertEqual(parser.parse_url_record(self.urls[0]).path, "a")
+
+    def test_columnar_fields(self):
+        """Test that columnar output only has the requested columns"""
+        columns = url.parse_url_columnar(self.urls, fields=["top_level_domain"])
+        self.assertEqual(
+            columns,
+            {
+                "url": self.urls,
+                "top_level_domain": ["co.uk", None],
+            },
+        )
+
+    def test_unknown_field(self):
+        """Test that unknown fields are rejected"""
+        with self.assertRaises(ValueError):
+            url.to_csv(self.urls, fields=["tld"])
+
+    def test_file_writers(self):
+        """Test that file writers only write the requested columns"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        path = Path(temp_dir) / "out"
+        url.to_csv_file(str(path), self.urls, fields=self.fields)
+        self.assertEqual(
+            Path(f"{path}.csv").read_text().splitlines()[0],
+            "url,top_level_domain,second_level_domain",
+        )
+        url.to_json_file(str(path), self.urls, fields=["path"])
+        self.assertEqual(
+            json.loads(Path(f"{path}.json").read_text()),
+            {"https://www.example.co.uk/a?q=1#top": {"path": "a"}},
+        )
+
+
+class TestEmailFields(unittest.TestCase):
+    def test_csv_columns(self):
+        """Test that email CSV output only has the requested columns"""
+        self.assertEqual(
+            email.to_csv(["user@example.com", "bad"], fields=["domain"]),
+            "email,domain\r\nuser@example.com,com\r\n",
+        )
+
+    def test_json_fields(self):
+        """Test that email JSON output only has the requested fields"""
+        result = json.loads(
+            email.to_json(["user+tag@example.com", "x@y.org"], fields=["plus_address"])
+        )
+        self.assertEqual(
+            result,
+            {
+                "user+tag@example.com": {"plus_address": "tag"},
+                "x@y.org": {"plus_address": ""},
+            },
+        )
+
+    def test_streaming_and_batch_fields(self):
+        """Test that the streaming and batch APIs take fields, as Url's do"""
+        emails = ["user@example.com", "bad"]
+        records = list(email.iter_parse(emails))
+        self.assertEqual(list(email.iter_parse(emails, fields=["domain"])), records)
+        self.assertEqual(
+            email.parse_email_batch(emails, fields=["domain"]).records, records
+        )
+        self.assertEqual(
+            list(email.parse_email_parallel(emails, workers=2, fields=["domain"])),
+            records,
+        )
+
+    def test_unknown_field(self):
+        """Test that unknown fields are rejected by every email API"""
+        with self.assertRaises(ValueError):
+            list(email.iter_parse(["user@example.com"], fields=["tld"]))
+        with self.assertRaises(ValueError):
+            email.parse_email_batch(["user@example.com"], fields=["tld"])
+        with self.assertRaises(ValueError):
+            list(email.parse_email_parallel(["user@example.com"], fields=["tld"]))
+        with self.assertRaises(ValueError):
+            list(email.parse_email_zip("emails.zip", fields=["tld"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,19 @@
 import unittest
+import unittest.mock
+import io
 import os
 import bz2
 import gzip
 import lzma
+import tarfile
 import zipfile
 import tempfile
 import shutil
 from pathlib import Path
 
-from pyrolysate import file_to_list
+import tracemalloc
+
+from pyrolysate import file_to_list, iter_file, iter_mapped_file, url
 
 
 class TestInputFile(unittest.TestCase):
@@ -230,6 +235,21 @@ class TestInputFile(unittest.TestCase):
         result = file_to_list(str(zip_path))
         self.assertEqual(result, expected)
 
+    def test_parse_zip_crlf_delimiter(self):
+        """Test that ZIP members keep their line endings, so CRLF splits them"""
+        zip_path = Path(self.temp_dir) / "crlf.zip"
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            zip_file.writestr("emails.txt", "\r\n".join(self.expected_result))
+            zip_file.writestr("pairs.csv", "a@b.com,\r\nc@d.com")
+        self.addCleanup(os.remove, zip_path)
+
+        path = str(zip_path)
+        self.assertEqual(file_to_list(path, "\r\n")[:3], self.expected_result)
+        self.assertEqual(list(iter_file(path, "\r\n"))[:3], self.expected_result)
+        # Line endings inside an item are left as stored
+        self.assertEqual(file_to_list(path, ",")[-2:], ["a@b.com", "c@d.com"])
+        self.assertIn("\r\n", file_to_list(path, ",")[0])
+
     def test_corrupted_zip_file_invalid_content(self):
         """Test handling of corrupted zip file with invalid content"""
         path = self.create_test_file(
@@ -290,5 +310,250 @@ class TestInputFile(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestIterFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.items = [f"user{n}@example{n % 7}.com" for n in range(500)]
+
+    def write(self, filename, content, opener=open):
+        path = str(Path(self.temp_dir) / filename)
+        with opener(path, "wt") as file:
+            file.write(content)
+        return path
+
+    def test_matches_file_to_list(self):
+        """Test that plain and compressed files give the items of file_to_list"""
+        content = "\n".join(self.items)
+        for filename, opener in [
+            ("emails.txt", open),
+            ("emails.bz2", bz2.open),
+            ("emails.gz", gzip.open),
+            ("emails.lzma", lzma.open),
+            ("emails.xz", lzma.open),
+        ]:
+            path = self.write(filename, content, opener)
+            self.assertEqual(list(iter_file(path, block_size=7)), file_to_list(path))
+
+    def test_delimiters_across_blocks(self):
+        """Test that multi-character delimiters split across blocks are found"""
+        path = self.write("emails.txt", " <sep> ".join(self.items) + "<sep>")
+        for block_size in [1, 2, 3, 5, 64, 1 << 20]:
+            self.assertEqual(
+                list(iter_file(path, "<sep>", block_size)), self.items, block_size
+            )
+
+    def test_skips_blank_items(self):
+        """Test that items left empty by stripping are skipped"""
+        path = self.write("emails.txt", "\n\n a@b.com \n   \n\nc@d.com\n\n")
+        self.assertEqual(list(iter_file(path, block_size=4)), ["a@b.com", "c@d.com"])
+
+    def test_zip_members_streamed(self):
+        """Test that ZIP text members are read in order, skipping other files"""
+        path = str(Path(self.temp_dir) / "emails.zip")
+        with zipfile.ZipFile(path, "w") as zip_file:
+            zip_file.writestr("a.txt", "\n".join(self.items[:3]))
+            zip_file.writestr("b.bin", "skipped@example.com")
+            zip_file.writestr("c.log", "\n".join(self.items[3:5]))
+            zip_file.writestr("corrupt.csv", b"\x80\x81")
+        self.assertEqual(list(iter_file(path, block_size=5)), self.items[:5])
+
+    def test_errors_end_iteration(self):
+        """Test that missing or corrupt files print an error and yield nothing"""
+        corrupt = self.write("corrupt.gz", "not gzip")
+        for path in [str(Path(self.temp_dir) / "missing.txt"), corrupt, None]:
+            with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+                self.assertEqual(list(iter_file(path)), [])
+
+    def test_memory_bounded_by_block(self):
+        """Test that peak memory follows the block size, not the file size"""
+        path = self.write("big.gz", "\n".join(self.items * 400), gzip.open)
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_file(path, block_size=1 << 14))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, len(self.items) * 400)
+        self.assertLess(peak, 1 << 20)
+
+
+class TestTarFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.items = [f"https://www.example{n}.com/log" for n in range(300)]
+
+    def write_tar(self, filename, mode, members):
+        path = str(Path(self.temp_dir) / filename)
+        with tarfile.open(path, mode) as tar_file:
+            for name, data in members:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar_file.addfile(info, io.BytesIO(data))
+        return path
+
+    def members(self):
+        return [
+            ("logs/a.log", "\n".join(self.items[:100]).encode()),
+            ("image.png", b"\x89PNG skipped.com"),
+            ("b.txt", "\n".join(self.items[100:200]).encode()),
+            ("corrupt.csv", b"\x80\x81"),
+            ("nested/c.csv", "\n".join(self.items[200:]).encode()),
+        ]
+
+    def test_compressions(self):
+        """Test that text members of plain and compressed tars are read in order"""
+        for filename, mode in [
+            ("logs.tar", "w"),
+            ("logs.tar.gz", "w:gz"),
+            ("logs.tgz", "w:gz"),
+            ("logs.tar.bz2", "w:bz2"),
+            ("logs.tbz2", "w:bz2"),
+            ("logs.tar.xz", "w:xz"),
+            ("logs.txz", "w:xz"),
+        ]:
+            path = self.write_tar(filename, mode, self.members())
+            with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+                self.assertEqual(list(iter_file(path, block_size=7)), self.items)
+                self.assertEqual(file_to_list(path), self.items)
+
+    def test_delimiter(self):
+        """Test that members are split on the given delimiter"""
+        path = self.write_tar(
+            "emails.tar.gz", "w:gz", [("a.csv", b" a@b.com ,, c@d.com,")]
+        )
+        self.assertEqual(list(iter_file(path, ",")), ["a@b.com", "c@d.com"])
+
+    def test_crlf_delimiter(self):
+        """Test that tar members keep their line endings, as ZIP members do"""
+        data = "\r\n".join(self.items[:3]).encode()
+        path = self.write_tar("logs.tar", "w", [("a.log", data)])
+        self.assertEqual(list(iter_file(path, "\r\n")), self.items[:3])
+        self.assertEqual(file_to_list(path, "\r\n"), self.items[:3])
+
+    def test_read_as_stream(self):
+        """Test that the archive is opened as a forward-only stream"""
+        path = self.write_tar("logs.tar.gz", "w:gz", self.members())
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            with unittest.mock.patch("tarfile.open", wraps=tarfile.open) as opened:
+                self.assertEqual(list(iter_file(path)), self.items)
+        opened.assert_called_once_with(path, "r|*")
+
+    def test_errors(self):
+        """Test that corrupt, truncated and missing archives print an error"""
+        corrupt = self.write_tar("empty.tar", "w", [])
+        Path(corrupt).write_bytes(b"not a tar archive")
+        whole = Path(self.write_tar("logs.tar.gz", "w:gz", self.members()))
+        truncated = Path(self.temp_dir) / "truncated.tar.gz"
+        truncated.write_bytes(whole.read_bytes()[: whole.stat().st_size // 2])
+        for path in [corrupt, str(Path(self.temp_dir) / "missing.tar")]:
+            with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+                self.assertEqual(list(iter_file(path)), [])
+                self.assertIsNone(file_to_list(path))
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            list(iter_file(str(truncated)))
+        self.assertIn("tar", stdout.getvalue())
+
+    def test_memory_bounded_by_block(self):
+        """Test that a large member is never held in memory as a whole"""
+        # Unique lines: tarfile inflates one compressed record at a time, so a
+        # highly repetitive member would measure the compression ratio instead
+        lines = [
+            f"https://www.example{n}.com/log?id={n * 7919 % 100003}"
+            for n in range(120_000)
+        ]
+        data = "\n".join(lines).encode()
+        path = self.write_tar("big.tar.gz", "w:gz", [("big.log", data)])
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_file(path, block_size=1 << 14))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, len(lines))
+        self.assertLess(peak, 1 << 20)
+
+    def test_feeds_parser(self):
+        """Test that tar lines go straight into a parser"""
+        path = self.write_tar("logs.tar", "w", [("a.log", b"example.com\ntest.org")])
+        records = list(url.iter_parse(iter_file(path)))
+        self.assertEqual([r.second_level_domain for r in records], ["example", "test"])
+
+
+class TestIterMappedFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+    def write(self, filename, content):
+        path = str(Path(self.temp_dir) / filename)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        return path
+
+    def test_matches_file_to_list(self):
+        """Test that mapped lines match the items of file_to_list"""
+        path = self.write("urls.txt", "example.com\n https://a.org/x \nb.net")
+        self.assertEqual(list(iter_mapped_file(path)), file_to_list(path))
+
+    def test_views_and_delimiters(self):
+        """Test undecoded views, CRLF endings, blank lines and custom delimiters"""
+        path = self.write("urls.log", "a.com\r\n\r\n\tb.org\r\n")
+        views = list(iter_mapped_file(path, decode=False))
+        self.assertTrue(all(isinstance(view, memoryview) for view in views))
+        self.assertEqual([bytes(view) for view in views], [b"a.com", b"b.org"])
+        path = self.write("urls.csv", "a.com, b.org,c.net")
+        self.assertEqual(list(iter_mapped_file(path, ",")), ["a.com", "b.org", "c.net"])
+
+    def test_block_boundaries(self):
+        """Test that small blocks end on whole delimiters and characters"""
+        items = [f"caf\u00e9{n}.com" for n in range(50)]
+        path = self.write("urls.txt", " <sep> ".join(items))
+        for block_size in [1, 3, 7, 1 << 20]:
+            self.assertEqual(
+                list(iter_mapped_file(path, "<sep>", block_size=block_size)), items
+            )
+
+    def test_non_ascii_lines(self):
+        """Test that non ASCII lines are decoded as UTF-8"""
+        path = self.write("urls.txt", "caf\u00e9.com\nexample.com")
+        self.assertEqual(list(iter_mapped_file(path)), ["caf\u00e9.com", "example.com"])
+
+    def test_matches_iter_file(self):
+        """Test line endings and encodings are read as iter_file reads them"""
+        path = str(Path(self.temp_dir) / "urls.txt")
+        Path(path).write_bytes(b"a.com\rb.org\r\nc.net\n\rcaf\xe9.fr\r")
+        for encoding in ["latin-1", "cp1252"]:
+            lines = list(iter_file(path, encoding=encoding))
+            self.assertEqual(lines, ["a.com", "b.org", "c.net", "caf\u00e9.fr"])
+            for block_size in [1, 1 << 20]:
+                self.assertEqual(
+                    list(
+                        iter_mapped_file(path, block_size=block_size, encoding=encoding)
+                    ),
+                    lines,
+                )
+
+    def test_pairs_with_batch_parser(self):
+        """Test that views feed the batch parser like decoded lines"""
+        path = self.write("urls.txt", "a.com\nb.org\na.com\n")
+        batch = url.parse_url_batch(iter_mapped_file(path, decode=False))
+        self.assertEqual(batch.records, url.parse_url_batch(file_to_list(path)).records)
+
+    def test_empty_and_missing(self):
+        """Test that empty and missing files yield nothing"""
+        self.assertEqual(list(iter_mapped_file(self.write("empty.txt", ""))), [])
+        missing = str(Path(self.temp_dir) / "missing.txt")
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            self.assertEqual(list(iter_mapped_file(missing)), [])
+
+    def test_early_close(self):
+        """Test that closing the generator early releases the map"""
+        lines = iter_mapped_file(self.write("urls.txt", "a.com\nb.org\n"))
+        self.assertEqual(next(lines), "a.com")
+        lines.close()
+
+
 if __name__ == "__main__":
     unittest.main()
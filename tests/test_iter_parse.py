@@ -0,0 +1,80 @@
+import unittest
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from pyrolysate import Url, email, url
+
+
+class TestIterParse(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+    def write_lines(self, name, lines):
+        path = Path(self.temp_dir) / name
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def test_url_generator(self):
+        """Test that urls are parsed lazily from a generator"""
+        urls = (f"https://example{n}.com" for n in range(3))
+        results = url.iter_parse(urls)
+        self.assertEqual(next(results).second_level_domain, "example0")
+        self.assertEqual(
+            [record.second_level_domain for record in results], ["example1", "example2"]
+        )
+
+    def test_url_file_object(self):
+        """Test that lines of an open file are parsed without their line endings"""
+        path = self.write_lines("urls.txt", ["example.com", "ftp://example.com"])
+        with open(path) as file:
+            results = list(url.iter_parse(file))
+        self.assertEqual(results, [url.parse_url_record("example.com"), None])
+
+    def test_email_iterator(self):
+        """Test that emails are parsed from an iterator"""
+        results = list(email.iter_parse(iter(["user@example.com", "bad"])))
+        self.assertEqual(results, [email.parse_email_record("user@example.com"), None])
+
+    def test_constant_memory(self):
+        """Test that memory doesn't grow with the number of urls streamed"""
+        urls = (f"https://www.example{n}.com/path?q={n}" for n in range(20_000))
+        # The host cache is bounded but would dominate a peak this small
+        results = Url(host_cache_size=None).iter_parse(urls)
+        next(results)
+        tracemalloc.start()
+        for _ in results:
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, 1_000_000)
+
+    def test_file_writers_accept_iterables(self):
+        """Test that file writers stream iterables into the same output as lists"""
+        lines = ["example.com", "https://www.example.org/a?q=1", "ftp://example.com"]
+        path = self.write_lines("urls.txt", lines)
+        from_list = Path(self.temp_dir) / "from_list"
+        from_file = Path(self.temp_dir) / "from_file"
+        url.to_json_file(str(from_list), lines)
+        with open(path) as file:
+            url.to_json_file(str(from_file), file)
+        self.assertEqual(
+            Path(f"{from_list}.json").read_text(), Path(f"{from_file}.json").read_text()
+        )
+        url.to_csv_file(str(from_list), lines)
+        url.to_csv_file(str(from_file), (line for line in lines))
+        self.assertEqual(
+            Path(f"{from_list}.csv").read_text(), Path(f"{from_file}.csv").read_text()
+        )
+
+    def test_email_writers_accept_iterables(self):
+        """Test that email writers accept generators"""
+        emails = ["user@example.com", "other+tag@example.org"]
+        self.assertEqual(email.to_csv(e for e in emails), email.to_csv(emails))
+        self.assertEqual(email.to_json(iter(emails)), email.to_json(emails))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,356 @@
+import json
+import unittest
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from pyrolysate import Prefilter, TldIndex, email, iter_buffer_lines, iter_file, url
+from pyrolysate import parallel
+
+
+class TestParallelParse(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.urls = [
+            f"https://www{n % 3}.example{n}.co.uk:80{n % 10}/p/{n}?q={n}#f"
+            for n in range(250)
+        ] + ["ftp://example.com", "example.invalidtld", ""]
+        self.emails = [f"user{n}+tag@example{n}.gov.bs" for n in range(250)] + ["bad"]
+
+    def test_url_order_preserved(self):
+        """Test that parallel results come back in input order"""
+        result = list(url.parse_url_parallel(self.urls, workers=2, chunk_size=7))
+        self.assertEqual(result, [url.parse_url_record(u) for u in self.urls])
+
+    def test_email_order_preserved(self):
+        """Test that parallel email results come back in input order"""
+        result = list(email.parse_email_parallel(self.emails, workers=2, chunk_size=7))
+        self.assertEqual(result, [email.parse_email_record(e) for e in self.emails])
+
+    def test_memoryview_lines(self):
+        """Test that memoryview lines are decoded before they are sent to workers"""
+        buffer = "\n".join(self.urls).encode()
+        result = list(url.parse_url_parallel(iter_buffer_lines(buffer), workers=2))
+        self.assertEqual(result, list(url.iter_parse(iter_buffer_lines(buffer))))
+        buffer = "\n".join(self.emails).encode()
+        result = list(email.parse_email_parallel(iter_buffer_lines(buffer), workers=2))
+        self.assertEqual(result, list(email.iter_parse(iter_buffer_lines(buffer))))
+
+    def test_memoryview_lines_to_file(self):
+        """Test that the file writers take memoryview lines with workers"""
+        buffer = "\n".join(self.urls).encode()
+        serial = Path(self.temp_dir) / "serial"
+        parallel = Path(self.temp_dir) / "parallel"
+        url.to_csv_file(str(serial), iter_buffer_lines(buffer))
+        url.to_csv_file(str(parallel), iter_buffer_lines(buffer), workers=2)
+        self.assertEqual(
+            Path(f"{serial}.csv").read_text(), Path(f"{parallel}.csv").read_text()
+        )
+
+    def test_prefiltered_memoryview_lines(self):
+        """Test that lines rejected by the prefilter reach the results as None"""
+        lines = [b"example.com", b"not a url", b"test.org"]
+        parser = url.__class__(prefilter=Prefilter.for_urls())
+        result = list(parser.parse_url_parallel(map(memoryview, lines), workers=2))
+        self.assertEqual(result[0].second_level_domain, "example")
+        self.assertIsNone(result[1])
+        self.assertEqual(result[2].top_level_domain, "org")
+
+    def test_custom_tlds_sent_to_workers(self):
+        """Test that workers parse with the index resolved by the caller"""
+        tlds = TldIndex(["org"], version="custom")
+        result = list(
+            url.parse_url_parallel(["example.org", "example.com"], tlds, workers=2)
+        )
+        self.assertEqual(result[0].top_level_domain, "org")
+        self.assertEqual(result[1].top_level_domain, "")
+
+    def test_url_files_match_serial(self):
+        """Test that parallel file output is identical to a serial run"""
+        serial = Path(self.temp_dir) / "serial"
+        parallel = Path(self.temp_dir) / "parallel"
+        for prettify in (True, False):
+            url.to_json_file(str(serial), self.urls, prettify)
+            url.to_json_file(str(parallel), self.urls, prettify, workers=2)
+            self.assertEqual(
+                Path(f"{serial}.json").read_text(), Path(f"{parallel}.json").read_text()
+            )
+        url.to_csv_file(str(serial), self.urls)
+        url.to_csv_file(str(parallel), self.urls, workers=2)
+        self.assertEqual(
+            Path(f"{serial}.csv").read_text(), Path(f"{parallel}.csv").read_text()
+        )
+
+    def test_email_files_match_serial(self):
+        """Test that parallel email file output is identical to a serial run"""
+        serial = Path(self.temp_dir) / "serial"
+        parallel = Path(self.temp_dir) / "parallel"
+        email.to_json_file(str(serial), self.emails)
+        email.to_json_file(str(parallel), self.emails, workers=2)
+        self.assertEqual(
+            Path(f"{serial}.json").read_text(), Path(f"{parallel}.json").read_text()
+        )
+        email.to_csv_file(str(serial), self.emails)
+        email.to_csv_file(str(parallel), self.emails, workers=2)
+        self.assertEqual(
+            Path(f"{serial}.csv").read_text(), Path(f"{parallel}.csv").read_text()
+        )
+
+
+class TestRangeSplit(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        # Small ranges so a test sized file is split into several parts
+        patcher = mock.patch.object(parallel, "_MIN_RANGE_SIZE", 512)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.urls = [
+            f"  https://www{n % 3}.example{n % 40}.co.uk:80{n % 10}/p/{n}?q={n}#f  "
+            for n in range(300)
+        ] + ["ftp://example.com", "example.invalidtld", "", "garbage line"] * 10
+        self.emails = [
+            f"user{n % 60}+tag@example{n}.{'gov.bs' if n % 2 else 'zz'}"
+            for n in range(300)
+        ] + ["bad"]
+
+    def write_input(self, items, delimiter="\n"):
+        path = Path(self.temp_dir) / "input.txt"
+        path.write_bytes(delimiter.join(items).encode("utf-8"))
+        return str(path)
+
+    def assertSameFile(self, serial, ranged):
+        self.assertEqual(Path(serial).read_bytes(), Path(ranged).read_bytes())
+
+    def test_split_ranges_cover_file(self):
+        """Test that ranges are contiguous and start right after a delimiter"""
+        path = self.write_input(self.urls)
+        data = Path(path).read_bytes()
+        ranges = parallel.split_ranges(path, 6, b"\n")
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(stop, start)
+            self.assertEqual(data[start - 1 : start], b"\n")
+
+    def test_split_ranges_empty_file(self):
+        """Test that an empty file has no ranges"""
+        path = self.write_input([])
+        self.assertEqual(parallel.split_ranges(path, 4, b"\n"), [])
+
+    def test_can_split_file(self):
+        """Test the inputs that fall back to a serial run"""
+        self.assertTrue(parallel.can_split_file("a.txt", "\n", 2, None))
+        self.assertFalse(parallel.can_split_file("a.txt", "\n", 1, None))
+        self.assertFalse(parallel.can_split_file("a.gz", "\n", 2, None))
+        self.assertFalse(parallel.can_split_file("a.txt", "--", 2, None))
+        self.assertFalse(parallel.can_split_file("a.txt", "\r\n", 2, None))
+        self.assertFalse(parallel.can_split_file("a.txt", "\n\n", 2, None))
+        self.assertTrue(parallel.can_split_file("a.txt", "\n", 2, None, "latin-1"))
+        self.assertFalse(parallel.can_split_file("a.txt", "\n", 2, None, "utf-16"))
+        self.assertFalse(parallel.can_split_file("a.txt", "\u2192", 2, None, "latin-1"))
+        prefilter = Prefilter.for_urls(on_reject=lambda entry: None)
+        self.assertFalse(parallel.can_split_file("a.txt", "\n", 2, prefilter))
+
+    def test_url_files_match_serial(self):
+        """Test that ranged output is identical to a serial run of the same file"""
+        for delimiter in ("\n", "<|>"):
+            path = self.write_input(self.urls, delimiter)
+            serial = str(Path(self.temp_dir) / "serial")
+            ranged = str(Path(self.temp_dir) / "ranged")
+            for fields in (None, ["top_level_domain", "path"]):
+                for prettify in (True, False):
+                    url.to_json_file(
+                        serial, iter_file(path, delimiter), prettify, fields=fields
+                    )
+                    result = url.file_to_json_file(
+                        ranged, path, prettify, 2, delimiter, fields
+                    )
+                    self.assertEqual(result, ("File successfully written", 0))
+                    self.assertSameFile(f"{serial}.json", f"{ranged}.json")
+                url.to_csv_file(serial, iter_file(path, delimiter), fields=fields)
+                url.file_to_csv_file(ranged, path, 2, delimiter, fields)
+                self.assertSameFile(f"{serial}.csv", f"{ranged}.csv")
+
+    def assertSameAsSerial(self, parser, path, encoding=None):
+        serial = str(Path(self.temp_dir) / "serial")
+        ranged = str(Path(self.temp_dir) / "ranged")
+        parser.to_json_file(serial, iter_file(path, encoding=encoding))
+        parser.file_to_json_file(ranged, path, workers=2, encoding=encoding)
+        self.assertSameFile(f"{serial}.json", f"{ranged}.json")
+        parser.to_csv_file(serial, iter_file(path, encoding=encoding))
+        parser.file_to_csv_file(ranged, path, workers=2, encoding=encoding)
+        self.assertSameFile(f"{serial}.csv", f"{ranged}.csv")
+
+    def test_lone_carriage_returns_match_serial(self):
+        """Test that a lone "\\r" ends a line in ranges as it does in text mode"""
+        path = Path(self.temp_dir) / "input.txt"
+        endings = ["\n", "\r\n", "\r"]
+        path.write_bytes(
+            "".join(line + endings[n % 3] for n, line in enumerate(self.urls)).encode(
+                "utf-8"
+            )
+        )
+        self.assertGreater(len(parallel.split_ranges(str(path), 4, b"\n")), 1)
+        lines = [line.strip() for line in self.urls if line.strip()]
+        self.assertEqual(list(iter_file(str(path))), lines)
+        self.assertSameAsSerial(url, str(path))
+
+    def test_non_utf8_file_matches_serial(self):
+        """Test that ranges are decoded with the encoding the serial run uses"""
+        path = Path(self.temp_dir) / "input.txt"
+        emails = [f"caf\u00e9{n % 70}@example{n}.fr" for n in range(300)]
+        path.write_bytes("\n".join(emails).encode("latin-1"))
+        self.assertGreater(len(parallel.split_ranges(str(path), 4, b"\n")), 1)
+        self.assertEqual(list(iter_file(str(path), encoding="latin-1")), emails)
+        self.assertSameAsSerial(email, str(path), "latin-1")
+
+    def test_json_keys_unique_across_ranges(self):
+        """Test that an input repeated in several ranges is written once"""
+        urls = [f"example{n % 50}.com/{'x' * 40}" for n in range(400)]
+        path = self.write_input(urls)
+        self.assertGreater(len(parallel.split_ranges(path, 4, b"\n")), 1)
+        serial = str(Path(self.temp_dir) / "serial")
+        ranged = str(Path(self.temp_dir) / "ranged")
+        url.to_json_file(serial, iter_file(path), False)
+        url.file_to_json_file(ranged, path, False, 2)
+        self.assertSameFile(f"{serial}.json", f"{ranged}.json")
+        pairs = json.loads(
+            Path(f"{ranged}.json").read_text(), object_pairs_hook=lambda pairs: pairs
+        )
+        self.assertEqual([key for key, _ in pairs], urls[:50])
+
+    def test_email_files_match_serial(self):
+        """Test that ranged email output is identical to a serial run"""
+        path = self.write_input(self.emails)
+        serial = str(Path(self.temp_dir) / "serial")
+        ranged = str(Path(self.temp_dir) / "ranged")
+        for parser in (email, email.__class__(validate_tld=True)):
+            parser.to_json_file(serial, iter_file(path))
+            parser.file_to_json_file(ranged, path, workers=2)
+            self.assertSameFile(f"{serial}.json", f"{ranged}.json")
+            parser.to_csv_file(serial, iter_file(path))
+            parser.file_to_csv_file(ranged, path, workers=2)
+            self.assertSameFile(f"{serial}.csv", f"{ranged}.csv")
+
+    def test_prefilter_counts_merged(self):
+        """Test that prefilter counts from every range add up to the serial ones"""
+        path = self.write_input(self.urls)
+        serial = url.__class__(prefilter=Prefilter.for_urls())
+        ranged = url.__class__(prefilter=Prefilter.for_urls())
+        serial.to_csv_file(str(Path(self.temp_dir) / "serial"), iter_file(path))
+        ranged.file_to_csv_file(str(Path(self.temp_dir) / "ranged"), path, workers=2)
+        self.assertEqual(
+            (ranged.prefilter.checked, ranged.prefilter.rejected),
+            (serial.prefilter.checked, serial.prefilter.rejected),
+        )
+        self.assertSameFile(
+            Path(self.temp_dir) / "serial.csv", Path(self.temp_dir) / "ranged.csv"
+        )
+
+    def test_missing_file(self):
+        """Test that a missing input fails without writing an output"""
+        output = str(Path(self.temp_dir) / "out")
+        result = url.file_to_csv_file(output, "does_not_exist.txt", workers=2)
+        self.assertEqual(result, ("Failed to write file", 1))
+        self.assertFalse(Path(f"{output}.csv").exists())
+
+    def test_no_part_files_left(self):
+        """Test that the temporary part files are removed after the merge"""
+        path = self.write_input(self.urls)
+        url.file_to_json_file(str(Path(self.temp_dir) / "ranged"), path, workers=2)
+        self.assertEqual(
+            sorted(p.name for p in Path(self.temp_dir).iterdir()),
+            ["input.txt", "ranged.json"],
+        )
+
+
+class TestZipMembers(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.zip_path = str(Path(self.temp_dir) / "logs.zip")
+        self.members = {
+            f"logs/day{day}.log": [
+                f"https://www.example{n}.com/{day}" for n in range(40 * (4 - day))
+            ]
+            for day in range(4)
+        }
+        self.members["emails.txt"] = ["user@example.com", "bad"]
+        with zipfile.ZipFile(self.zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name, lines in self.members.items():
+                zip_file.writestr(name, "\n".join(lines))
+            zip_file.writestr("image.png", b"\x89PNG")
+
+    def expected(self, parse):
+        return [
+            (name, parse(line))
+            for name, lines in self.members.items()
+            for line in lines
+        ]
+
+    def test_serial_records_carry_member(self):
+        """Test that records come in archive order tagged with their member"""
+        result = list(url.parse_url_zip(self.zip_path))
+        self.assertEqual(result, self.expected(url.parse_url_record))
+
+    def test_parallel_ordered(self):
+        """Test that ordered worker results match the serial archive order"""
+        result = list(
+            url.parse_url_zip(self.zip_path, workers=2, ordered=True, chunk_size=7)
+        )
+        self.assertEqual(result, self.expected(url.parse_url_record))
+
+    def test_parallel_unordered(self):
+        """Test that unordered results hold every record with its member"""
+        result = list(url.parse_url_zip(self.zip_path, workers=2, chunk_size=7))
+        expected = self.expected(url.parse_url_record)
+        self.assertCountEqual(result, expected)
+        for name in self.members:
+            # Each member's own lines still come back in order
+            self.assertEqual(
+                [record for member, record in result if member == name],
+                [record for member, record in expected if member == name],
+            )
+
+    def test_email_members(self):
+        """Test that emails are parsed per member, serially and in workers"""
+        expected = self.expected(email.parse_email_record)
+        self.assertEqual(list(email.parse_email_zip(self.zip_path)), expected)
+        self.assertEqual(
+            list(email.parse_email_zip(self.zip_path, workers=2, ordered=True)),
+            expected,
+        )
+
+    def test_prefilter_counts_merged(self):
+        """Test that worker prefilter counts add up to a serial run"""
+        serial = url.__class__(prefilter=Prefilter.for_urls())
+        ranged = url.__class__(prefilter=Prefilter.for_urls())
+        expected = list(serial.parse_url_zip(self.zip_path))
+        result = list(ranged.parse_url_zip(self.zip_path, workers=2, ordered=True))
+        self.assertEqual(result, expected)
+        self.assertEqual(
+            (ranged.prefilter.checked, ranged.prefilter.rejected),
+            (serial.prefilter.checked, serial.prefilter.rejected),
+        )
+
+    def test_close_early(self):
+        """Test that closing the generator early stops the workers"""
+        records = url.parse_url_zip(self.zip_path, workers=2, chunk_size=1)
+        self.assertIsNotNone(next(records))
+        records.close()
+
+    def test_invalid_zip(self):
+        """Test that a file that isn't a ZIP archive yields nothing"""
+        path = Path(self.temp_dir) / "not.zip"
+        path.write_text("example.com")
+        self.assertEqual(list(url.parse_url_zip(str(path))), [])
+        self.assertEqual(list(url.parse_url_zip(str(path), workers=2)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import unittest
+from pyrolysate import Email, TldIndex, Url
+from pyrolysate.parse_cache import CacheInfo, InternTable, ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ParseCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.info(), CacheInfo(3, 0, 1, 2, 2))
+        cache.get("b")
+        self.assertEqual(cache.info().misses, 1)
+
+    def test_clear(self):
+        """Test that clearing drops entries and statistics"""
+        cache = ParseCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 0, 4, 0))
+
+    def test_invalid_size(self):
+        """Test that a cache must hold at least one entry"""
+        with self.assertRaises(ValueError):
+            ParseCache(0)
+
+
+class TestUrlCache(unittest.TestCase):
+    def test_disabled_by_default(self):
+        """Test that parsers don't cache unless asked to"""
+        self.assertIsNone(Url().cache_info())
+        self.assertIsNone(Email().cache_info())
+
+    def test_repeated_url_hits(self):
+        """Test that repeated urls are served from the cache"""
+        parser = Url(cache_size=8)
+        first = parser.parse_url_record("https://www.example.com/path")
+        second = parser.parse_url_record("https://www.example.com/path")
+        self.assertIs(first, second)
+        self.assertEqual(parser.cache_info()[:3], (1, 1, 0))
+
+    def test_rejected_url_cached(self):
+        """Test that urls that can't be parsed are cached too"""
+        parser = Url(cache_size=8)
+        self.assertIsNone(parser.parse_url_record("ftp://example.com"))
+        self.assertIsNone(parser.parse_url_record("ftp://example.com"))
+        self.assertEqual(parser.cache_info().hits, 1)
+
+    def test_keyed_by_tld_version(self):
+        """Test that a different TLD version doesn't reuse cached results"""
+        parser = Url(cache_size=8)
+        old = TldIndex(["com"], version="1")
+        new = TldIndex(["org"], version="2")
+        self.assertEqual(
+            parser.parse_url_record("example.org", old).top_level_domain, ""
+        )
+        self.assertEqual(
+            parser.parse_url_record("example.org", new).top_level_domain, "org"
+        )
+        self.assertEqual(parser.cache_info().hits, 0)
+
+    def test_unversioned_tlds_bypass_cache(self):
+        """Test that custom TLD lists without a version aren't cached"""
+        parser = Url(cache_size=8)
+        parser.parse_url_record("example.com", ["com"])
+        self.assertEqual(parser.cache_info().currsize, 0)
+
+    def test_dict_results_not_shared(self):
+        """Test that changing a returned dictionary doesn't reach the cache"""
+        parser = Url(cache_size=8)
+        parser.parse_url("example.com")["example.com"]["scheme"] = "changed"
+        self.assertEqual(parser.parse_url("example.com")["example.com"]["scheme"], "")
+
+    def test_eviction_count(self):
+        """Test that evictions are counted once the cache is full"""
+        parser = Url(cache_size=2)
+        for host in ("a.com", "b.com", "c.com"):
+            parser.parse_url_record(host)
+        self.assertEqual(parser.cache_info().evictions, 1)
+        parser.cache_clear()
+        self.assertEqual(parser.cache_info().currsize, 0)
+
+
+class TestHostCache(unittest.TestCase):
+    def test_shared_host_hits(self):
+        """Test that urls on the same host reuse the host split"""
+        parser = Url()
+        first = parser.parse_url_record("https://www.example.co.uk/a?q=1")
+        second = parser.parse_url_record("http://www.example.co.uk:8080/b#top")
+        self.assertEqual(parser.host_cache_info()[:2], (1, 1))
+        self.assertEqual(first[2:5], ("www", "example", "co.uk"))
+        self.assertEqual(second[2:5], first[2:5])
+        self.assertEqual(second.path, "b")
+        self.assertEqual(second.fragment, "top")
+
+    def test_unknown_host_cached(self):
+        """Test that hosts without a known TLD are cached as rejected"""
+        parser = Url()
+        parser.parse_url_record("example.invalidtld/a")
+        record = parser.parse_url_record("https://example.invalidtld/b")
+        self.assertEqual(record, ("https://example.invalidtld/b",) + ("",) * 8)
+        self.assertEqual(parser.host_cache_info().hits, 1)
+
+    def test_keyed_by_tld_version(self):
+        """Test that a host split isn't reused across TLD versions"""
+        parser = Url()
+        parser.parse_url_record("example.org/a", TldIndex(["com"], version="1"))
+        record = parser.parse_url_record(
+            "example.org/b", TldIndex(["org"], version="2")
+        )
+        self.assertEqual(record.top_level_domain, "org")
+        self.assertEqual(parser.host_cache_info().hits, 0)
+
+    def test_disabled(self):
+        """Test that the host cache can be turned off"""
+        parser = Url(host_cache_size=None)
+        self.assertIsNone(parser.host_cache_info())
+        self.assertEqual(parser.parse_url_record("example.com").top_level_domain, "com")
+
+
+class TestEmailCache(unittest.TestCase):
+    def test_repeated_email_hits(self):
+        """Test that repeated emails are served from the cache"""
+        parser = Email(cache_size=8)
+        first = parser.parse_email_record("user@example.com")
+        self.assertIs(parser.parse_email_record("user@example.com"), first)
+        self.assertIsNone(parser.parse_email_record("bad"))
+        self.assertEqual(parser.cache_info(), CacheInfo(1, 2, 0, 8, 2))
+
+
+class TestInternTable(unittest.TestCase):
+    def test_shares_equal_strings(self):
+        """Test that equal strings come back as one shared object"""
+        table = InternTable(4)
+        first = "".join(["c", "om"])
+        second = "".join(["c", "om"])
+        self.assertIsNot(first, second)
+        self.assertIs(table(first), first)
+        self.assertIs(table(second), first)
+        self.assertEqual(len(table), 1)
+
+    def test_full_table_passes_values_through(self):
+        """Test that new strings aren't held once the table is full"""
+        table = InternTable(1)
+        table("com")
+        value = "".join(["o", "rg"])
+        self.assertIs(table(value), value)
+        self.assertEqual(len(table), 1)
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+    def test_invalid_size(self):
+        """Test that a table must hold at least one string"""
+        with self.assertRaises(ValueError):
+            InternTable(0)
+
+    def test_url_fields_shared(self):
+        """Test that urls on different hosts share their scheme, port and TLD"""
+        parser = Url(host_cache_size=None)
+        first = parser.parse_url_record("https://first.com:8080/a")
+        second = parser.parse_url_record("https://second.com:8080/b")
+        for field in ["scheme", "port", "top_level_domain"]:
+            self.assertIs(getattr(first, field), getattr(second, field), field)
+
+    def test_email_fields_shared(self):
+        """Test that emails share their mail server and domain"""
+        results = Email().parse_email_array(["a@mail.gov.bs", "b(x)@mail.gov.bs"])
+        first, second = results.values()
+        self.assertIs(first["mail_server"], second["mail_server"])
+        self.assertIs(first["domain"], second["domain"])
+
+    def test_disabled(self):
+        """Test that interning can be turned off"""
+        parser = Url(host_cache_size=None, intern_size=None)
+        first = parser.parse_url_record("first.com")
+        second = parser.parse_url_record("second.com")
+        self.assertEqual(first.top_level_domain, second.top_level_domain)
+        self.assertIsNot(first.top_level_domain, second.top_level_domain)
+
+
+if __name__ == "__main__":
+    unittest.main()
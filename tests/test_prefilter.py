@@ -0,0 +1,135 @@
+import random
+import unittest
+from pyrolysate import Email, Prefilter, Url, email, url
+
+
+class TestUrlPrefilter(unittest.TestCase):
+    def test_accepts_urls(self):
+        """Test that url shaped lines pass"""
+        prefilter = Prefilter.for_urls()
+        for line in [
+            "example.com",
+            "HTTPS://www.example.co.uk/path?q=1#top",
+            "192.168.1.1:8080/admin",
+            "example.com:8080",
+        ]:
+            self.assertTrue(prefilter.accepts(line), line)
+
+    def test_rejects_garbage(self):
+        """Test that lines which can't be urls are rejected"""
+        prefilter = Prefilter.for_urls(max_length=30)
+        for line in [
+            "",
+            "a.b",
+            "localhost",
+            "ftp://example.com",
+            "GET /index.html 200",
+            "example.com/" + "a" * 30,
+            None,
+        ]:
+            self.assertFalse(prefilter.accepts(line), line)
+
+    def test_rejected_lines_parse_to_nothing(self):
+        """Test that shape rejects would not have parsed anyway"""
+        prefilter = Prefilter.for_urls()
+        for line in ["localhost/x", "ftp://example.com", "nodot:80/a.b"]:
+            self.assertFalse(prefilter.accepts(line))
+            record = url.parse_url_record(line)
+            self.assertTrue(record is None or not any(record[1:]), line)
+
+    def test_batch_counts_and_routes(self):
+        """Test that rejected lines are counted, routed and kept as None"""
+        rejects = []
+        parser = Url(prefilter=Prefilter.for_urls(on_reject=rejects.append))
+        lines = ["example.com", "not a url", "ftp://x.com", "example.org"]
+        records = list(parser.iter_parse(lines))
+        self.assertEqual(records[0], url.parse_url_record("example.com"))
+        self.assertEqual(records[1:3], [None, None])
+        self.assertEqual(parser.prefilter.checked, 4)
+        self.assertEqual(parser.prefilter.rejected, 2)
+        self.assertEqual(rejects, ["not a url", "ftp://x.com"])
+
+    def test_batch_counts_duplicates(self):
+        """Test that duplicate rejects in a record batch are counted per line"""
+        parser = Url(prefilter=Prefilter.for_urls())
+        batch = parser.parse_url_batch(["bad line", "example.com", "bad line"])
+        self.assertEqual(batch.records[0], None)
+        self.assertEqual(batch.records[2], None)
+        self.assertEqual(parser.prefilter.rejected, 2)
+
+    def test_writers_skip_rejects(self):
+        """Test that rejected lines are left out of CSV output"""
+        parser = Url(prefilter=Prefilter.for_urls())
+        self.assertEqual(
+            parser.to_csv(["example.com", "bad line"]),
+            url.to_csv(["example.com"]),
+        )
+
+    def test_columnar_keeps_positions(self):
+        """Test that rejected lines keep their position in columnar output"""
+        parser = Url(prefilter=Prefilter.for_urls())
+        columns = parser.parse_url_columnar(["bad line", "example.com"])
+        self.assertEqual(columns["url"], ["bad line", "example.com"])
+        self.assertEqual(columns["top_level_domain"], [None, "com"])
+
+    def test_reset(self):
+        """Test that counts can be reset"""
+        prefilter = Prefilter.for_urls()
+        list(prefilter.screen(["bad line"]))
+        prefilter.reset()
+        self.assertEqual((prefilter.checked, prefilter.rejected), (0, 0))
+
+
+class TestEmailPrefilter(unittest.TestCase):
+    def test_accepts_and_rejects(self):
+        """Test the email prefilter on valid and garbage lines"""
+        prefilter = Prefilter.for_emails()
+        self.assertTrue(prefilter.accepts("user+tag@example.com"))
+        self.assertTrue(prefilter.accepts("user(comment)@example.gov.bs"))
+        for line in ["no at sign", "a@b@c.com", "@example.com", "user@", "a)b@c.com"]:
+            self.assertFalse(prefilter.accepts(line), line)
+
+    def test_accepts_what_parse_email_accepts(self):
+        """Test that comments may hold whitespace and "@" that would otherwise reject"""
+        prefilter = Prefilter.for_emails()
+        for line in [
+            "user(a comment)@example.com",
+            "user(me@home)@example.com",
+            "user @example.com",
+            "user\t@example.com",
+            "user@(at work) example.com",
+            "(comment)user@example.com",
+        ]:
+            self.assertIsNotNone(email.parse_email_record(line), line)
+            self.assertTrue(prefilter.accepts(line), line)
+            self.assertTrue(prefilter.accepts(line.encode("utf-8")), line)
+
+    def test_rejects_only_what_parse_email_rejects(self):
+        """Test that no line the prefilter rejects would have parsed"""
+        prefilter = Prefilter.for_emails()
+        rng = random.Random(0)
+        alphabet = "ab.+@() \t\x00\u00e9"
+        lines = [
+            "".join(rng.choices(alphabet, k=rng.randint(0, 12))) for _ in range(20000)
+        ]
+        # Multibyte lines are longer as bytes than once decoded
+        lines += ["\u00e9" * 980 + "@example.com", "a" * 990 + "@example.com"]
+        for line in lines:
+            for entry in (line, line.encode("utf-8")):
+                if not prefilter.accepts(entry):
+                    self.assertIsNone(email.parse_email_record(entry), repr(entry))
+
+    def test_batch_counts(self):
+        """Test that rejected emails are counted and kept as None"""
+        parser = Email(prefilter=Prefilter.for_emails())
+        records = list(parser.iter_parse(["user@example.com", "garbage (line)"]))
+        self.assertEqual(records, [email.parse_email_record("user@example.com"), None])
+        self.assertEqual(parser.prefilter.rejected, 1)
+
+    def test_parenthesis_without_at(self):
+        """Test that a comment without an @ doesn't break parsing"""
+        self.assertIsNone(email.parse_email("garbage (line)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
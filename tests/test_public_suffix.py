@@ -0,0 +1,122 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from pyrolysate import Url, PublicSuffixList, get_public_suffix_list
+
+PSL_CONTENT = """// ===BEGIN ICANN DOMAINS===
+// VERSION: 2026-05-01_00-00-00_UTC
+com
+uk
+co.uk
+gov.uk
+bs
+gov.bs
+
+// ck : https://en.wikipedia.org/wiki/.ck
+*.ck
+!www.ck
+
+// ===BEGIN PRIVATE DOMAINS===
+cloudfront.net
+"""
+
+
+class TestPublicSuffixList(unittest.TestCase):
+    def setUp(self):
+        self.psl = PublicSuffixList(PSL_CONTENT.splitlines())
+
+    def test_normal_rules(self):
+        """Test normal rules pick the longest matching suffix"""
+        self.assertEqual(self.psl.split_host("example.com"), ("", "example", "com"))
+        self.assertEqual(
+            self.psl.split_host("www.example.co.uk"), ("www", "example", "co.uk")
+        )
+        self.assertEqual(
+            self.psl.split_host("www.bahamas.gov.bs"), ("www", "bahamas", "gov.bs")
+        )
+
+    def test_wildcard_and_exception_rules(self):
+        """Test wildcard rules and the exception rules that override them"""
+        self.assertEqual(
+            self.psl.split_host("shop.example.co.ck"), ("shop", "example", "co.ck")
+        )
+        self.assertEqual(self.psl.split_host("www.ck"), ("", "www", "ck"))
+        self.assertIsNone(self.psl.split_host("co.ck"))
+
+    def test_implicit_rule(self):
+        """Test hosts matching no rule use their last label as the suffix"""
+        self.assertEqual(self.psl.split_host("example.org"), ("", "example", "org"))
+
+    def test_deep_host(self):
+        """Test hosts with many labels keep every label"""
+        self.assertEqual(
+            self.psl.split_host("a.b.c.d.e.d1234.cloudfront.net"),
+            ("a.b.c.d.e", "d1234", "cloudfront.net"),
+        )
+
+    def test_invalid_hosts(self):
+        """Test public suffixes and malformed hosts have no registrable domain"""
+        for host in ["", "com", "co.uk", "example..com", ".example.com"]:
+            self.assertIsNone(self.psl.split_host(host))
+
+    def test_load_from_file(self):
+        """Test loading the rules and version from a local file"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        path = Path(temp_dir) / "public_suffix_list.dat"
+        path.write_text(PSL_CONTENT, encoding="utf-8")
+        psl = get_public_suffix_list(str(path))
+        self.assertEqual(psl.version, "2026-05-01_00-00-00_UTC")
+        self.assertEqual(psl.split_host("data.gov.uk"), ("", "data", "gov.uk"))
+
+
+class TestUrlWithPublicSuffixList(unittest.TestCase):
+    def setUp(self):
+        self.url = Url(public_suffixes=PublicSuffixList(PSL_CONTENT.splitlines()))
+
+    def test_parse_deep_url(self):
+        """Test URLs with 6+ host labels are split instead of dropped"""
+        test_url = "https://a.b.c.d.e.d1234.cloudfront.net:8443/img/x.png?v=2#top"
+        result = self.url.parse_url(test_url)
+        self.assertEqual(
+            result,
+            {
+                test_url: {
+                    "scheme": "https",
+                    "subdomain": "a.b.c.d.e",
+                    "second_level_domain": "d1234",
+                    "top_level_domain": "cloudfront.net",
+                    "port": "8443",
+                    "path": "img/x.png",
+                    "query": "v=2",
+                    "fragment": "top",
+                }
+            },
+        )
+
+    def test_parse_url_government_domain(self):
+        """Test government domains match the built-in heuristic"""
+        result = self.url.parse_url("https://data.gov.uk/dataset")
+        fields = result["https://data.gov.uk/dataset"]
+        self.assertEqual(fields["second_level_domain"], "data")
+        self.assertEqual(fields["top_level_domain"], "gov.uk")
+        self.assertEqual(fields["path"], "dataset")
+
+    def test_parse_url_unknown_tld(self):
+        """Test the rightmost label must still be a known top level domain"""
+        result = self.url.parse_url("www.example.invalidtld")
+        self.assertEqual(result["www.example.invalidtld"]["top_level_domain"], "")
+        self.assertEqual(result["www.example.invalidtld"]["scheme"], "")
+
+    def test_parse_url_ip_address(self):
+        """Test IP addresses bypass the public suffix rules"""
+        result = self.url.parse_url("https://192.168.1.1/admin")
+        fields = result["https://192.168.1.1/admin"]
+        self.assertEqual(fields["top_level_domain"], "192.168.1.1")
+        self.assertEqual(fields["path"], "admin")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import unittest
+from pyrolysate import ParsedEmail, ParsedUrl, email, url
+
+
+class TestParsedUrl(unittest.TestCase):
+    def test_parse_url_record(self):
+        """Test that records hold the same parts as parse_url"""
+        record = url.parse_url_record("https://www.example.com:8080/path?q=1#top")
+        self.assertEqual(
+            record,
+            ParsedUrl(
+                "https://www.example.com:8080/path?q=1#top",
+                "https",
+                "www",
+                "example",
+                "com",
+                "8080",
+                "path",
+                "q=1",
+                "top",
+            ),
+        )
+        self.assertEqual(record.top_level_domain, "com")
+        self.assertEqual(
+            record.to_dict(),
+            url.parse_url("https://www.example.com:8080/path?q=1#top"),
+        )
+
+    def test_parse_url_record_unknown_tld(self):
+        """Test that unknown TLDs give a record with empty parts"""
+        record = url.parse_url_record("example.invalidtld")
+        self.assertEqual(record, ParsedUrl("example.invalidtld"))
+        self.assertEqual(record.to_dict(), url.parse_url("example.invalidtld"))
+
+    def test_parse_url_record_invalid(self):
+        """Test that invalid input gives no record"""
+        self.assertIsNone(url.parse_url_record(""))
+        self.assertIsNone(url.parse_url_record("ftp://example.com"))
+
+    def test_record_has_no_instance_dict(self):
+        """Test that records don't carry a per-instance dictionary"""
+        self.assertFalse(hasattr(url.parse_url_record("example.com"), "__dict__"))
+
+    def test_to_json_skips_invalid(self):
+        """Test that urls without a record are left out of array output"""
+        self.assertEqual(
+            json.loads(url.to_json(["ftp://example.com", "example.com"])),
+            url.parse_url("example.com"),
+        )
+        self.assertEqual(
+            url.to_csv(["ftp://example.com", "example.com"]),
+            "url,scheme,subdomain,second_level_domain,top_level_domain,port,path,query,fragment\r\n"
+            "example.com,,,example,com,,,,\r\n",
+        )
+
+
+class TestParsedEmail(unittest.TestCase):
+    def test_parse_email_record(self):
+        """Test that records hold the same parts as parse_email"""
+        record = email.parse_email_record("user+tag@example.gov.bs")
+        self.assertEqual(
+            record,
+            ParsedEmail("user+tag@example.gov.bs", "user", "tag", "example", "gov.bs"),
+        )
+        self.assertEqual(record.to_dict(), email.parse_email("user+tag@example.gov.bs"))
+
+    def test_parse_email_record_invalid(self):
+        """Test that invalid emails give no record"""
+        self.assertIsNone(email.parse_email_record("user@@example.com"))
+
+    def test_to_json_escapes_like_json_module(self):
+        """Test that record serialisation matches json.dumps escaping"""
+        result = email.to_json(['"quoted"@example.com', "ünï@example.com"])
+        self.assertIn('"\\"quoted\\"@example.com"', result)
+        self.assertIn('"\\u00fcn\\u00ef@example.com"', result)
+
+
+if __name__ == "__main__":
+    unittest.main()
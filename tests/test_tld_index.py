@@ -0,0 +1,141 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from pyrolysate import url, TldIndex
+from pyrolysate.update_tlds import (
+    get_tld_index,
+    get_tlds_from_local,
+    update,
+    HttpResponse,
+)
+from pyrolysate.utils import load_tld_file
+
+
+class TestTldIndex(unittest.TestCase):
+    def test_membership(self):
+        """Test TLD membership checks are case and whitespace insensitive"""
+        index = TldIndex(["COM", " org\n", "gov.bs", ""])
+        self.assertEqual(len(index), 3)
+        self.assertIn("com", index)
+        self.assertIn("org", index)
+        self.assertIn("gov.bs", index)
+        self.assertNotIn("bs", index)
+        self.assertNotIn("", index)
+
+    def test_from_tlds_reuses_index(self):
+        """Test from_tlds returns an existing index unchanged"""
+        index = TldIndex(["com"])
+        self.assertIs(TldIndex.from_tlds(index), index)
+        self.assertIsInstance(TldIndex.from_tlds(["com"]), TldIndex)
+
+    def test_from_tlds_memoizes_lists(self):
+        """Test lists with the same contents share an index, and edits compile again"""
+        tlds = ["com", "gov.bs"]
+        index = TldIndex.from_tlds(tlds)
+        self.assertIs(TldIndex.from_tlds(tlds), index)
+        self.assertIs(TldIndex.from_tlds(["com", "gov.bs"]), index)
+        tlds.append("org")
+        self.assertIn("org", TldIndex.from_tlds(tlds))
+
+    def test_from_tlds_sees_in_place_edits(self):
+        """Test an edit that keeps the list's length still takes effect"""
+        tlds = ["com"]
+        self.assertIn("com", TldIndex.from_tlds(tlds))
+        tlds[0] = "org"
+        index = TldIndex.from_tlds(tlds)
+        self.assertIn("org", index)
+        self.assertNotIn("com", index)
+
+    def test_longest_suffix(self):
+        """Test the label trie finds the longest matching suffix"""
+        index = TldIndex(["bs", "gov.bs", "com"])
+        self.assertEqual(index.longest_suffix(["www", "bahamas", "gov", "bs"]), 2)
+        self.assertEqual(index.longest_suffix(["example", "bs"]), 1)
+        self.assertEqual(index.longest_suffix(["example", "invalidtld"]), 0)
+        self.assertEqual(index.longest_suffix([]), 0)
+
+    def test_suffix_length_two_part(self):
+        """Test that gov.bs-style TLDs count as two labels only with a domain left"""
+        index = TldIndex(["bs", "com"])
+        self.assertEqual(index.suffix_length(["bahamas", "gov", "bs"]), 2)
+        self.assertEqual(index.suffix_length(["gov", "bs"]), 1)
+        self.assertEqual(index.suffix_length(["example", "com"]), 1)
+        self.assertEqual(index.suffix_length(["example", "gov", "bs"], ()), 1)
+        self.assertEqual(index.suffix_length(["example", "zz"]), 0)
+
+    def test_get_local_tld_index(self):
+        """Test loading the bundled TLD file as an index"""
+        last_updated, tlds = get_tlds_from_local(load_tld_file(), as_index=True)
+        self.assertIsInstance(tlds, TldIndex)
+        self.assertEqual(tlds.version, last_updated)
+        self.assertIn("com", tlds)
+        self.assertIn("io", tlds)
+
+    def test_parse_url_with_index(self):
+        """Test parse_url and parse_url_array accept a TldIndex directly"""
+        index = TldIndex(["com", "custom"], "custom version")
+        result = url.parse_url("www.example.custom/path", tlds=index)
+        fields = result["www.example.custom/path"]
+        self.assertEqual(fields["subdomain"], "www")
+        self.assertEqual(fields["second_level_domain"], "example")
+        self.assertEqual(fields["top_level_domain"], "custom")
+        self.assertEqual(fields["path"], "path")
+
+        result = url.parse_url_array(["example.com", "example.org"], tlds=index)
+        self.assertEqual(result["example.com"]["top_level_domain"], "com")
+        self.assertEqual(result["example.org"]["top_level_domain"], "")
+
+
+class TestTldSnapshot(unittest.TestCase):
+    def setUp(self):
+        """Create temporary directory and register cleanup"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+    def test_snapshot_round_trip(self):
+        """Test an index survives being written to and read from a snapshot"""
+        path = Path(self.temp_dir) / "tld.bin"
+        index = TldIndex(["com", "gov.bs"], "v1")
+        index.to_snapshot(path)
+        loaded = TldIndex.from_snapshot(path, "v1")
+        self.assertEqual(loaded.version, "v1")
+        self.assertEqual(sorted(loaded), ["com", "gov.bs"])
+        self.assertEqual(loaded.longest_suffix(["example", "gov", "bs"]), 2)
+
+    def test_snapshot_rejected(self):
+        """Test stale, missing and corrupt snapshots are ignored"""
+        path = Path(self.temp_dir) / "tld.bin"
+        TldIndex(["com"], "v1").to_snapshot(path)
+        self.assertIsNone(TldIndex.from_snapshot(path, "v2"))
+        self.assertIsNone(TldIndex.from_snapshot(Path(self.temp_dir) / "missing.bin"))
+        path.write_bytes(b"not a snapshot")
+        self.assertIsNone(TldIndex.from_snapshot(path))
+
+    def test_bundled_snapshot_matches_tld_file(self):
+        """Test the shipped snapshot is in sync with the shipped TLD file"""
+        last_updated, tlds = get_tlds_from_local(load_tld_file())
+        index = TldIndex.from_snapshot(load_tld_file().with_suffix(".bin"))
+        self.assertIsNotNone(index)
+        self.assertEqual(index.version, last_updated)
+        self.assertEqual(sorted(index), sorted(tlds))
+
+    def test_update_writes_snapshot(self):
+        """Test updating the TLD file also writes a snapshot that get_tld_index uses"""
+        header = "# Version 2026010100, Last Updated Thu Jan  1 07:07:01 2026 UTC"
+        file_name = str(Path(self.temp_dir) / "tld")
+        message, status = update(
+            file_name,
+            fetch=lambda url, headers: HttpResponse(200, {}, f"{header}\nCOM\n"),
+        )
+        self.assertEqual(status, 0)
+        self.assertTrue(Path(f"{file_name}.bin").is_file())
+
+        index = get_tld_index(f"{file_name}.txt")
+        self.assertEqual(index.version, header)
+        self.assertEqual(list(index), ["com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
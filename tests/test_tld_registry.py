@@ -0,0 +1,97 @@
+import unittest
+import os
+import tempfile
+import shutil
+import time
+from pathlib import Path
+
+from pyrolysate import Url, TldRegistry, tld_registry
+
+
+def write_tld_file(path, version, tlds):
+    """Writes a TLD file in the same layout as update_local_tld_file"""
+    with open(path, "w") as file:
+        file.write("File Created: 01 May 2026 07:23\n")
+        file.write(f"# Version {version}\n")
+        file.write(" Last Updated Fri May  1 07:07:01 2026 UTC\n\n")
+        for tld in tlds:
+            file.write(f"{tld}\n")
+
+
+class TestTldRegistry(unittest.TestCase):
+    def setUp(self):
+        """Create temporary directory and register cleanup"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.path = str(Path(self.temp_dir) / "tld.txt")
+        write_tld_file(self.path, "1", ["com"])
+        self.registry = TldRegistry(self.path)
+
+    def bump_file(self, version, tlds):
+        """Rewrites the TLD file and moves its mtime forward"""
+        write_tld_file(self.path, version, tlds)
+        stamp = time.time() + 10
+        os.utime(self.path, (stamp, stamp))
+
+    def test_lazy_load(self):
+        """Test the index is loaded on first use"""
+        self.assertIn("com", self.registry.index)
+        self.assertTrue(self.registry.version.startswith("# Version 1,"))
+
+    def test_reload_swaps_index(self):
+        """Test reload replaces the index without touching the old one"""
+        old = self.registry.index
+        self.bump_file("2", ["com", "newtld"])
+        new = self.registry.reload()
+        self.assertIsNot(old, new)
+        self.assertNotIn("newtld", old)
+        self.assertIn("newtld", self.registry.index)
+        self.assertTrue(self.registry.version.startswith("# Version 2,"))
+
+    def test_reload_if_changed(self):
+        """Test reload_if_changed only reloads modified files"""
+        self.registry.index
+        self.assertFalse(self.registry.reload_if_changed())
+        self.bump_file("2", ["org"])
+        self.assertTrue(self.registry.reload_if_changed())
+        self.assertIn("org", self.registry.index)
+
+    def test_failed_reload_keeps_index(self):
+        """Test an unreadable file keeps the current index in service"""
+        old = self.registry.index
+        os.remove(self.path)
+        self.assertIs(self.registry.reload(), old)
+
+    def test_watch(self):
+        """Test the watcher thread picks up a modified file"""
+        self.registry.index
+        stop = self.registry.watch(interval=0.01)
+        self.addCleanup(stop.set)
+        self.bump_file("2", ["org"])
+        deadline = time.time() + 5
+        while "org" not in self.registry.index and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertIn("org", self.registry.index)
+
+    def test_url_uses_registry(self):
+        """Test Url parses with the registry's current index and stamps its version"""
+        parser = Url(registry=self.registry)
+        result = parser.parse_url_array(["example.com", "example.org"])
+        self.assertEqual(result["example.org"]["top_level_domain"], "")
+        self.assertTrue(result.tld_version.startswith("# Version 1,"))
+
+        self.bump_file("2", ["com", "org"])
+        self.registry.reload()
+        result = parser.parse_url_array(["example.com", "example.org"])
+        self.assertEqual(result["example.org"]["top_level_domain"], "org")
+        self.assertTrue(result.tld_version.startswith("# Version 2,"))
+
+    def test_default_registry_version(self):
+        """Test batch results from the default parser carry the bundled version"""
+        parser = Url()
+        result = parser.parse_url_array(["example.com", "test.org"])
+        self.assertEqual(result.tld_version, tld_registry.version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+import tempfile
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from pyrolysate.tld_index import TldIndex
+from pyrolysate.update_tlds import (
+    HttpResponse,
+    get_tld_file_version,
+    get_tld_index,
+    update,
+    update_details,
+)
+
+IANA_HEADER = "# Version {}, Last Updated Fri May  1 07:07:01 2026 UTC"
+
+
+def urllib_fetch(url, headers):
+    """HTTP layer backed by urllib, which reports 304 as an HTTPError"""
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return HttpResponse(
+                response.status,
+                {name.lower(): value for name, value in response.headers.items()},
+                response.read().decode("utf-8"),
+            )
+    except urllib.error.HTTPError as err:
+        return HttpResponse(
+            err.code, {name.lower(): value for name, value in err.headers.items()}, ""
+        )
+    except urllib.error.URLError:
+        return None
+
+
+class StandInIana(BaseHTTPRequestHandler):
+    """Serves the TLD list with an ETag and answers conditional requests"""
+
+    version = "2026050100"
+    tlds = ["COM", "ORG"]
+    etag = True
+    requests = []
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests.append(dict(self.headers))
+        tag = f'"{cls.version}-{len(cls.tlds)}"'
+        if cls.etag and self.headers.get("If-None-Match") == tag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = "\n".join([IANA_HEADER.format(cls.version)] + cls.tlds) + "\n"
+        self.send_response(200)
+        if cls.etag:
+            self.send_header("ETag", tag)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConditionalUpdate(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in IANA server and create a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.file_name = str(Path(self.temp_dir) / "tld")
+
+        self.handler = type("Handler", (StandInIana,), {"requests": []})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.source_url = f"http://127.0.0.1:{server.server_port}/tlds.txt"
+
+    def run_update(self):
+        return update_details(
+            self.file_name, fetch=urllib_fetch, source_url=self.source_url
+        )
+
+    def test_first_update(self):
+        """Test a first update writes the file, snapshot and validators"""
+        result = self.run_update()
+        self.assertEqual(result.status, 0)
+        self.assertTrue(result.changed)
+        self.assertEqual(result.added, ["com", "org"])
+        self.assertEqual(result.removed, [])
+        self.assertTrue(Path(f"{self.file_name}.bin").is_file())
+        self.assertTrue(Path(f"{self.file_name}.validators.json").is_file())
+        self.assertNotIn("If-None-Match", self.handler.requests[0])
+
+    def test_not_modified(self):
+        """Test an unchanged list is answered with 304 and nothing is rewritten"""
+        self.run_update()
+        before = Path(f"{self.file_name}.txt").read_text()
+        result = self.run_update()
+        self.assertEqual(result.status, 0)
+        self.assertFalse(result.changed)
+        self.assertEqual(self.handler.requests[1]["If-None-Match"], '"2026050100-2"')
+        self.assertEqual(Path(f"{self.file_name}.txt").read_text(), before)
+
+    def test_same_version_without_validators(self):
+        """Test the file is not rewritten when the version header is unchanged"""
+        self.handler.etag = False
+        self.run_update()
+        before = Path(f"{self.file_name}.txt").read_text()
+        result = self.run_update()
+        self.assertFalse(result.changed)
+        self.assertEqual(Path(f"{self.file_name}.txt").read_text(), before)
+
+    def test_diff(self):
+        """Test a new version reports the TLDs added and removed"""
+        self.run_update()
+        self.handler.version = "2026060100"
+        self.handler.tlds = ["COM", "NEWTLD", "XYZ"]
+        result = self.run_update()
+        self.assertTrue(result.changed)
+        self.assertEqual(result.added, ["newtld", "xyz"])
+        self.assertEqual(result.removed, ["org"])
+        self.assertTrue(result.version.startswith("# Version 2026060100,"))
+        index = get_tld_index(f"{self.file_name}.txt")
+        self.assertIn("newtld", index)
+        self.assertNotIn("org", index)
+
+    def test_update_returns_message_and_status(self):
+        """Test update still unpacks into a message and an exit code"""
+        message, status = update(
+            self.file_name, fetch=urllib_fetch, source_url=self.source_url
+        )
+        self.assertEqual((message, status), ("File created successfully", 0))
+        message, status = update(
+            self.file_name, fetch=urllib_fetch, source_url=self.source_url
+        )
+        self.assertEqual((message, status), ("TLD file already up to date", 0))
+
+    def test_current_file_rebuilds_snapshot(self):
+        """Test an up to date file gets back a missing or stale snapshot"""
+        snapshot = Path(f"{self.file_name}.bin")
+        for etag in (True, False):
+            self.handler.etag = etag
+            self.run_update()
+            version = get_tld_file_version(f"{self.file_name}.txt")
+            snapshot.unlink()
+            result = self.run_update()
+            self.assertFalse(result.changed)
+            self.assertIsNotNone(TldIndex.from_snapshot(snapshot, version))
+            TldIndex(["stale"], "# Version 1, old").to_snapshot(snapshot)
+            self.run_update()
+            index = TldIndex.from_snapshot(snapshot, version)
+            self.assertIsNotNone(index)
+            self.assertIn("com", index)
+
+    def test_fetch_failure(self):
+        """Test an unreachable server leaves the local file alone"""
+        result = update_details(self.file_name, fetch=lambda url, headers: None)
+        self.assertEqual(result.status, 1)
+        self.assertFalse(Path(f"{self.file_name}.txt").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
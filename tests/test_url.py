@@ -161,6 +161,13 @@ class TestUrl(unittest.TestCase):
             },
         )
 
+    def test_parse_url_tld_outside_host(self):
+        """Test TLDs appearing only outside the host are not matched"""
+        for url_item in ["www.co.c", "example.invalidtld/page.com", "a.b/c.com"]:
+            result = url.parse_url(url_item)
+            self.assertEqual(result[url_item]["top_level_domain"], "")
+            self.assertEqual(result[url_item]["second_level_domain"], "")
+
     def test_url_array_valid(self):
         """Test parsing array of valid URLs"""
         urls = ["example.com", "www.test.org"]
@@ -237,6 +244,15 @@ class TestUrl(unittest.TestCase):
         result = url.to_json("")
         self.assertIsNone(result)
 
+    def test_parse_url_custom_tlds_edited_in_place(self):
+        """Test an in-place edit to a custom TLD list is seen by the next parse"""
+        custom_tlds = ["com"]
+        self.assertIsNotNone(url.parse_url("example.com", tlds=custom_tlds))
+        custom_tlds[0] = "custom"
+        self.assertIsNotNone(url.parse_url("example.custom", tlds=custom_tlds))
+        result = url.parse_url("example.com", tlds=custom_tlds)
+        self.assertEqual(result["example.com"]["top_level_domain"], "")
+
     def test_parse_url_with_custom_tlds(self):
         """Test parsing URL with custom TLD list"""
         custom_tlds = ["com", "net", "custom"]
@@ -491,6 +507,37 @@ class TestUrl(unittest.TestCase):
                 },
             )
 
+    def test_parse_url_component_boundaries(self):
+        """Test each component ends at the first delimiter of the next one"""
+        cases = {
+            "example.com:8080?q=1": ("example", "com", "8080", "", "q=1", ""),
+            "example.com/a.b.c": ("example", "com", "", "a.b.c", "", ""),
+            "example.com/a:b": ("example", "com", "", "a:b", "", ""),
+            "example.com/p#frag?x": ("example", "com", "", "p", "", "frag?x"),
+            "https://example.com:/p": ("example", "com", "443", "p", "", ""),
+        }
+        for url_item, expected in cases.items():
+            fields = url.parse_url(url_item)[url_item]
+            self.assertEqual(
+                (
+                    fields["second_level_domain"],
+                    fields["top_level_domain"],
+                    fields["port"],
+                    fields["path"],
+                    fields["query"],
+                    fields["fragment"],
+                ),
+                expected,
+            )
+
+    def test_parse_url_deep_subdomain(self):
+        """Test hosts with several subdomain labels keep all of them"""
+        result = url.parse_url("a.b.www.example.gov.bs/x")
+        fields = result["a.b.www.example.gov.bs/x"]
+        self.assertEqual(fields["subdomain"], "a.b.www")
+        self.assertEqual(fields["second_level_domain"], "example")
+        self.assertEqual(fields["top_level_domain"], "gov.bs")
+
     def test_get_local_tld(self):
         """Test fetching TLDs from IANA"""
         tld_file = load_tld_file()